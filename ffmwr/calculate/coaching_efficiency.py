@@ -2,225 +2,171 @@ __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
 import math
-from collections import Counter, defaultdict
-from typing import Dict, List, Set
+from collections import Counter
+from typing import Dict, FrozenSet, List, Set, Tuple
 
-from ffmwr.models.base.model import BaseLeague, BasePlayer
+from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam
+from ffmwr.models.base.positions import PositionRegistry
 from ffmwr.utilities.constants import prohibited_statuses
 from ffmwr.utilities.logger import get_logger
-from ffmwr.utilities.utils import generate_normalized_player_key
 
 logger = get_logger(__name__, propagate=False)
 
 
-class RosterSlot(object):
-    def __init__(self, position: str, max_allowed: int, assigned_count: int = 0):
-        self.position: str = position
-        self.max_allowed: int = max_allowed
-        self.assigned_count: int = assigned_count
-        self.assigned_players: List[BasePlayer] = []
-
-    def __repr__(self):
-        return (
-            f"RosterSlot("
-            f"position={self.position}, "
-            f"max_allowed={self.max_allowed}, "
-            f"assigned_count={self.assigned_count}, "
-            f"assigned_players={[(p.full_name, p.points, p.eligible_positions) for p in self.assigned_players]}"
-            f")"
-        )
-
-    def add_player(self, player: BasePlayer) -> str | None:
-        if (self.assigned_count + 1) <= self.max_allowed:
-            self.assigned_count += 1
-            self.assigned_players.append(player)
-            self.assigned_players.sort(key=lambda p: p.points, reverse=True)
-            return self.position
-        else:
-            return None
-
-    def remove_player(self, player_ndx: int = 0) -> BasePlayer:
-        self.assigned_count -= 1
-        return self.assigned_players.pop(player_ndx)
-
-    def is_full(self):
-        return self.assigned_count == self.max_allowed
-
-
 class CoachingEfficiency(object):
-    def __init__(self, league):
+    def __init__(self, league: BaseLeague):
         logger.debug("Initializing coaching efficiency.")
 
         self.inactive_statuses: List[str] = [status for status in prohibited_statuses]
 
-        self.league: BaseLeague = league
-        self.roster_slot_counts: Dict[str, int] = self.league.roster_position_counts
-        self.roster_active_slots: List[str] = self.league.roster_active_slots
-        self.roster_bench_slots: List[str] = self.league.bench_positions
-        self.flex_positions_dict: Dict[str, List[str]] = self.league.get_flex_positions_dict()
+        # the coaching efficiency only keeps the roster settings of the league, so one instance can be shared by every
+        # week of the league (and sent to other processes) without the weekly league data
+        self.roster_slot_counts: Dict[str, int] = league.roster_position_counts
+        self.roster_active_slots: List[str] = league.roster_active_slots
+        self.roster_bench_slots: List[str] = league.bench_positions
+        self.flex_positions_dict: Dict[str, List[str]] = league.get_flex_positions_dict()
         self.roster_primary_slots: Set[str] = set(self.roster_active_slots).difference(self.flex_positions_dict.keys())
         self.roster_flex_slots: Set[str] = set(self.roster_active_slots).intersection(self.flex_positions_dict.keys())
         self.coaching_efficiency_dqs: Dict[str, int] = {}
 
-    def _is_player_ineligible(self, player: BasePlayer, week, inactives):
+        # optimal lineup slot structure (positions and slot counts) of the league, shared by all team rosters
+        self.optimal_lineup_positions: List[str] = [
+            pos for pos, slots in self.roster_slot_counts.items() if pos not in self.roster_bench_slots and slots > 0
+        ]
+        self.optimal_lineup_slot_counts: List[int] = [
+            self.roster_slot_counts[pos] for pos in self.optimal_lineup_positions
+        ]
+
+        # bitmasks of the positions accepted by each optimal lineup slot position and of the bench positions (players
+        # are eligible for a slot when its position is one of their eligible positions, since the platforms already add
+        # the flex positions for which a player is eligible to their eligible positions)
+        self.position_registry: PositionRegistry = league.position_registry
+        self.optimal_lineup_slot_masks: List[int] = [
+            self.position_registry.get_position_bit(pos) for pos in self.optimal_lineup_positions
+        ]
+        self.bench_positions_mask: int = self.position_registry.get_positions_mask(self.roster_bench_slots)
+        # optimal lineup slot position eligibility bitmasks by player eligible positions bitmask
+        self.eligibility_masks: Dict[int, int] = {}
+
+    def _is_player_ineligible(self, player: BasePlayer, week: int, inactives: FrozenSet[str]) -> bool:
         if player.points != 0.0:
             return False
         else:
             return (
                 player.status in self.inactive_statuses
                 or player.bye_week == week
-                or generate_normalized_player_key(player.full_name, player.nfl_team_abbr) in inactives
+                or player.get_normalized_player_key() in inactives
             )
 
-    def _get_player_open_positions(self, player: BasePlayer, optimal_lineup: Dict[str, RosterSlot]):
-        eligible_positions = list(player.eligible_positions.intersection(set(self.roster_active_slots)))
-        optimal_lineup_open_positions = {
-            pos: roster_slot for pos, roster_slot in optimal_lineup.items() if pos in eligible_positions
-        }
+    def _get_eligibility_mask(self, player: BasePlayer) -> int:
+        """Get the bitmask of the optimal lineup slot positions a player is eligible for (bit n set for position n)."""
+        eligible_positions_mask = self.position_registry.get_positions_mask(player.eligible_positions)
+        eligibility_mask = self.eligibility_masks.get(eligible_positions_mask)
+        if eligibility_mask is None:
+            eligibility_mask = 0
+            for slot_ndx, slot_mask in enumerate(self.optimal_lineup_slot_masks):
+                if eligible_positions_mask & slot_mask:
+                    eligibility_mask |= 1 << slot_ndx
+            self.eligibility_masks[eligible_positions_mask] = eligibility_mask
+        return eligibility_mask
+
+    def _assign_player_to_optimal_slot(
+        self,
+        player: BasePlayer,
+        eligibility_mask: int,
+        optimal_lineup: List[List[Tuple[BasePlayer, int]]],
+        open_slots_mask: int,
+        visited_slots_mask: int = 0,
+    ) -> Tuple[int, int]:
+        """Assign a player to the optimal lineup if an augmenting path exists, i.e. if the player can be assigned to an
+        open slot of one of their eligible positions, or to a full slot of one of their eligible positions by moving one
+        of its assigned players (and the players that one displaces in turn) to other eligible positions.
+
+        Because a player scores the same points in any slot, assigning every player from highest-scoring to lowest in
+        this way is exact: it fills as many slots as possible with the maximum total points (a maximum weight bipartite
+        matching of players to roster slots).
+
+        Returns the updated bitmask of optimal lineup positions with open slots (or -1 if the player could not be
+        assigned) and the updated bitmask of positions visited while searching for an augmenting path.
+        """
+        # assign player to optimal lineup if any eligible position has an open slot
+        open_eligible_slots_mask = eligibility_mask & open_slots_mask
+        if open_eligible_slots_mask:
+            slot_ndx = (open_eligible_slots_mask & -open_eligible_slots_mask).bit_length() - 1
+            optimal_lineup[slot_ndx].append((player, eligibility_mask))
+            if len(optimal_lineup[slot_ndx]) == self.optimal_lineup_slot_counts[slot_ndx]:
+                open_slots_mask &= ~(1 << slot_ndx)
+            return open_slots_mask, visited_slots_mask
+
+        # otherwise try to open a slot in an eligible position by moving one of its assigned players to another position
+        unvisited_eligible_slots_mask = eligibility_mask & ~visited_slots_mask
+        while unvisited_eligible_slots_mask:
+            slot_bit = unvisited_eligible_slots_mask & -unvisited_eligible_slots_mask
+            unvisited_eligible_slots_mask &= ~slot_bit
+            visited_slots_mask |= slot_bit
+
+            slot_ndx = slot_bit.bit_length() - 1
+            for player_ndx, (assigned_player, assigned_player_eligibility_mask) in enumerate(optimal_lineup[slot_ndx]):
+                updated_open_slots_mask, visited_slots_mask = self._assign_player_to_optimal_slot(
+                    assigned_player,
+                    assigned_player_eligibility_mask,
+                    optimal_lineup,
+                    open_slots_mask,
+                    visited_slots_mask,
+                )
+                if updated_open_slots_mask != -1:
+                    # replace the moved player with the player being assigned
+                    optimal_lineup[slot_ndx][player_ndx] = (player, eligibility_mask)
+                    return updated_open_slots_mask, visited_slots_mask
+
+        # handle when no augmenting path exists or a team roster contains a player without any eligible league roster
+        # positions
+        return -1, visited_slots_mask
+
+    def get_optimal_lineup(
+        self, team_roster: List[BasePlayer], points_attribute: str = "points"
+    ) -> Dict[str, List[BasePlayer]]:
+        """Get the players of the optimal lineup of a team roster by position, from highest-scoring to lowest, where
+        players are scored by the given points attribute (actual points by default, or projected points).
+        """
+
+        def get_player_points(player: BasePlayer) -> float:
+            # players without projected points are scored as zero
+            return getattr(player, points_attribute) or 0.0
 
-        # retrieve list of player eligible positions that still have open slots
-        open_positions = [
-            pos for pos, roster_slot in optimal_lineup_open_positions.items() if not roster_slot.is_full()
-        ]
+        # create empty team optimal lineup
+        optimal_lineup: List[List[Tuple[BasePlayer, int]]] = [[] for _ in self.optimal_lineup_positions]
+        open_slots_mask = (1 << len(self.optimal_lineup_positions)) - 1
 
-        return open_positions
-
-        # TODO: support reassigning players more than one position away
-        # assigned_eligible_positions = {
-        #     k for k, v in optimal_lineup_eligible_positions.items() if (v.get("slots") - v.get("count")) == 0
-        # }
-        #
-        # if open_positions:
-        #     return open_positions
-        # else:
-        #     if assigned_eligible_positions.issubset(assigned_positions):
-        #         return []
-        #     else:
-        #         assigned_positions.update(assigned_eligible_positions)
-        #
-        #         next_player_tier_unassigned_positions = []
-        #         for pos in assigned_eligible_positions:
-        #             for p in optimal_lineup.get(pos).get("players"):
-        #                 next_player_tier_unassigned_positions += self._get_player_open_positions(
-        #                     p, optimal_lineup, pos, assigned_positions
-        #                 )
-        #         return next_player_tier_unassigned_positions
-
-    @staticmethod
-    def _create_open_slot_if_possible(
-        unassigned_player: BasePlayer,
-        players_with_open_slots: Dict[str, List[Dict[str, BasePlayer | List[str]]]],
-        optimal_lineup: Dict[str, RosterSlot],
-    ):
-        for pos, assigned_players_info in players_with_open_slots.items():
-            for assigned_player in assigned_players_info:
-                open_positions = assigned_player["open_positions"]
-                if len(open_positions) > 0:
-                    player: BasePlayer
-                    for player_ndx, player in enumerate(optimal_lineup.get(pos).assigned_players):
-                        # check if any players in position match the potentially replaceable player
-                        if assigned_player["assigned_player"].player_id == player.player_id:
-                            # remove the replaceable player from their current optimal lineup position
-                            movable_player = optimal_lineup.get(pos).remove_player(player_ndx)
-                            # replace the replaceable player with the unassigned player
-                            optimal_lineup.get(pos).add_player(unassigned_player)
-                            # add the removed replaceable player to a different open optimal lineup position
-                            optimal_lineup.get(open_positions[0]).add_player(movable_player)
-
-                            return pos
-        return None
-
-    def _assign_player_to_optimal_slot(self, player: BasePlayer, optimal_lineup: Dict[str, RosterSlot]):
-        # get player eligible positions based on league roster
-        eligible_positions = list(player.eligible_positions.intersection(set(self.roster_active_slots)))
-
-        # separate primary positions from flex positions in order to fill primary positions first
-        eligible_primary_positions = list(
-            player.eligible_positions.intersection(eligible_positions).intersection(self.roster_primary_slots)
-        )
-        eligible_flex_positions = list(
-            player.eligible_positions.intersection(eligible_positions).intersection(self.roster_flex_slots)
+        # sort roster by points from highest to lowest
+        team_roster_by_points: List[BasePlayer] = sorted(
+            [p for p in team_roster if p.selected_position != "IR"], key=get_player_points, reverse=True
         )
 
-        assigned_pos = None
-        point_diffs: Dict[str, float] = {}
-        players_with_eligible_open_slots: Dict[str, List[Dict[str, BasePlayer | List[str]]]] = defaultdict(list)
-        for eligible_pos in eligible_primary_positions + eligible_flex_positions:
-            if not optimal_lineup.get(eligible_pos).is_full():
-                # assign player to optimal lineup if eligible position has open slot
-                assigned_pos = optimal_lineup.get(eligible_pos).add_player(player)
+        # assign each player from highest-scoring to lowest to maximize points
+        for player in team_roster_by_points:
+            if not open_slots_mask:
                 break
-            else:
-                # collect point differences between player and all players they could potentially replace
-                point_diffs[eligible_pos] = player.points - optimal_lineup.get(eligible_pos).assigned_players[-1].points
-                for assigned_player in optimal_lineup.get(eligible_pos).assigned_players:
-                    players_with_eligible_open_slots[eligible_pos].append(
-                        {
-                            "assigned_player": assigned_player,
-                            "open_positions": self._get_player_open_positions(assigned_player, optimal_lineup),
-                        }
-                    )
-
-        if assigned_pos:
-            return assigned_pos
-        else:
-            # if no open positions get the highest point difference between player and potentially replaceable players
-            try:
-                max_point_diff = max(point_diffs.values())
-            except ValueError:
-                # handle when a team roster contains a player without any eligible league roster positions
-                return None
-            if max_point_diff <= 0:
-                # if no positive point difference check if any potentially replaceable players
-                return self._create_open_slot_if_possible(player, players_with_eligible_open_slots, optimal_lineup)
-
-            # collect all positions that share the max point difference with the player
-            max_point_diff_positions = [pos for pos, point_diff in point_diffs.items() if point_diff == max_point_diff]
-            if len(max_point_diff_positions) == 1:
-                max_point_diff_position = max_point_diff_positions[0]
-            else:
-                # favor selection of primary position over flex position max point different position
-                max_point_diff_primary_positions = list(
-                    set(max_point_diff_positions).intersection(eligible_primary_positions)
-                )
-                if len(max_point_diff_primary_positions) > 0:
-                    max_point_diff_position = max_point_diff_primary_positions[0]
-                else:
-                    max_point_diff_position = max_point_diff_positions[0]
-
-            # remove replaceable player from their slot and replace them with eligible player
-            replaced_player = optimal_lineup.get(max_point_diff_position).remove_player()
-            optimal_lineup.get(max_point_diff_position).add_player(player)
+            updated_open_slots_mask, _ = self._assign_player_to_optimal_slot(
+                player, self._get_eligibility_mask(player), optimal_lineup, open_slots_mask
+            )
+            if updated_open_slots_mask != -1:
+                open_slots_mask = updated_open_slots_mask
 
-        # assign replaced player to new optimal lineup position
-        return self._assign_player_to_optimal_slot(replaced_player, optimal_lineup)
+        return {
+            pos: sorted([player for player, _ in optimal_lineup[slot_ndx]], key=get_player_points, reverse=True)
+            for slot_ndx, pos in enumerate(self.optimal_lineup_positions)
+        }
 
     def execute_coaching_efficiency(
         self, team_name, team_roster, team_points, positions_filled_active, week, inactive_players, dq_eligible=False
     ):
         logger.debug(f'Calculating week {week} coaching efficiency for team "{team_name}".')
 
-        # create empty team optimal lineup
-        optimal_lineup: Dict[str, RosterSlot] = {}
-        for pos, slots in self.roster_slot_counts.items():
-            if pos not in self.roster_bench_slots and slots > 0:
-                # pos_info = {"slots": slots, "count": 0, "players": []}
-                # optimal_lineup[pos] = pos_info
-                optimal_lineup[pos] = RosterSlot(pos, max_allowed=slots)
-
-        # sort roster by points from highest to lowest
-        team_roster_by_points: List[BasePlayer] = sorted(
-            [p for p in team_roster if p.selected_position != "IR"], key=lambda p: p.points, reverse=True
-        )
-
-        # assign each player from highest-scoring to lowest to maximize points
-        for player in team_roster_by_points:
-            self._assign_player_to_optimal_slot(player, optimal_lineup)
+        optimal_lineup = self.get_optimal_lineup(team_roster)
 
         # calculate optimal score
-        optimal_score = round(
-            sum([p.points for roster_slot in optimal_lineup.values() for p in roster_slot.assigned_players]), 2
-        )
+        optimal_score = round(sum([p.points for players in optimal_lineup.values() for p in players]), 2)
 
         # calculate coaching efficiency
         try:
@@ -235,12 +181,12 @@ class CoachingEfficiency(object):
             f"     OPTIMAL POINTS: {optimal_score}\n"
             f"COACHING EFFICIENCY: {coaching_efficiency}\n"
         )
-        for pos, roster_slot in optimal_lineup.items():
+        for pos, players in optimal_lineup.items():
             logger.debug(
                 f"\n"
                 f"Position: {pos}\n"
-                f"  {roster_slot.assigned_count}/{roster_slot.max_allowed}: "
-                f"{[(p.full_name, p.points, p.eligible_positions) for p in roster_slot.assigned_players]}\n"
+                f"  {len(players)}/{self.roster_slot_counts.get(pos)}: "
+                f"{[(p.full_name, p.points, p.eligible_positions) for p in players]}\n"
                 f"-----"
             )
 
@@ -272,3 +218,70 @@ class CoachingEfficiency(object):
                 coaching_efficiency = "DQ"
 
         return coaching_efficiency, optimal_score
+
+    def execute_weekly_coaching_efficiency(
+        self, teams: List[BaseTeam], week: int, inactive_players: FrozenSet[str], dq_eligible: bool = False
+    ) -> Dict[str, Tuple[float | str, float]]:
+        """Calculate the coaching efficiency and optimal points of all teams for a week. The coaching efficiency
+        disqualifications of the week replace those of any previously calculated week.
+
+        Returns the coaching efficiency (or "DQ") and optimal points of each team by team id.
+        """
+        self.coaching_efficiency_dqs = {}
+
+        coaching_efficiency_results = {}
+        team: BaseTeam
+        for team in teams:
+            coaching_efficiency_results[team.team_id] = self.execute_coaching_efficiency(
+                team.name,
+                team.roster,
+                team.points,
+                [
+                    p.selected_position
+                    for p in team.roster
+                    if not self.position_registry.get_position_bit(p.selected_position) & self.bench_positions_mask
+                ],
+                int(week),
+                inactive_players,
+                dq_eligible=dq_eligible,
+            )
+        return coaching_efficiency_results
+
+    def get_lineup_decision_quality(self, team_roster: List[BasePlayer]) -> Tuple[float, float, float]:
+        """Get the projected points of the starting lineup of a team roster, and the projected and actual points of its
+        projected optimal lineup (the optimal lineup by the player projected points reported by the league platform).
+        """
+        lineup_projected_points = sum(
+            [
+                p.projected_points or 0.0
+                for p in team_roster
+                if not self.position_registry.get_position_bit(p.selected_position) & self.bench_positions_mask
+            ]
+        )
+
+        projected_optimal_lineup_players = [
+            p for players in self.get_optimal_lineup(team_roster, "projected_points").values() for p in players
+        ]
+        projected_optimal_projected_points = sum([p.projected_points or 0.0 for p in projected_optimal_lineup_players])
+        projected_optimal_points = sum([p.points for p in projected_optimal_lineup_players])
+
+        return (
+            round(lineup_projected_points, 2),
+            round(projected_optimal_projected_points, 2),
+            round(projected_optimal_points, 2),
+        )
+
+    def execute_season_decision_quality(
+        self, teams_by_week: Dict[int, Dict[str, BaseTeam]]
+    ) -> Dict[int, Dict[str, Tuple[float, float, float]]]:
+        """Calculate the lineup decision quality of all teams (by team id) for every given week of the season.
+
+        Returns the projected points of the starting lineup, and the projected and actual points of the projected
+        optimal lineup of each team by team id for each week.
+        """
+        logger.debug(f"Calculating lineup decision quality for weeks {list(teams_by_week.keys())}.")
+
+        return {
+            week: {team_id: self.get_lineup_decision_quality(team.roster) for team_id, team in teams.items()}
+            for week, teams in teams_by_week.items()
+        }
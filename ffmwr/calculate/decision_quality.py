@@ -0,0 +1,114 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ffmwr.calculate.ranking import rank_metric
+from ffmwr.calculate.tables import MetricTableRow, MetricValue
+from ffmwr.models.base.model import BaseTeam
+from ffmwr.utilities.logger import get_logger
+
+logger = get_logger(__name__, propagate=False)
+
+
+class DecisionQuality(object):
+    """Season lineup decision quality of each team, which judges managers on player projected points instead of on
+    the actual points scored. Player projected points are the ones the league platform reports when the league data is
+    retrieved, which are not guaranteed to be the projections at lineup lock.
+
+    Decision quality is the percentage of the projected points of the projected optimal lineups that the starting
+    lineups of a team were projected to score, and is compared to the actual points scored by the starting lineups,
+    by the projected optimal lineups, and by the (actual) optimal lineups.
+
+    All arrays are weeks x teams arrays (or team arrays) indexed by the position of each team id in the team ids list.
+    """
+
+    def __init__(
+        self,
+        team_ids: List[str],
+        season_decision_quality: Dict[int, Dict[str, Tuple[float, float, float]]],
+        weekly_summaries: Dict[int, Dict[str, Any]],
+    ):
+        logger.debug("Calculating season lineup decision quality.")
+
+        self.team_ids: List[str] = [str(team_id) for team_id in team_ids]
+        self.team_indices: Dict[str, int] = {team_id: team_ndx for team_ndx, team_id in enumerate(self.team_ids)}
+        self.weeks: List[int] = sorted(set(season_decision_quality.keys()).intersection(weekly_summaries.keys()))
+
+        shape = (len(self.weeks), len(self.team_ids))
+        self.lineup_projected_points: np.ndarray = np.full(shape, np.nan)
+        self.projected_optimal_projected_points: np.ndarray = np.full(shape, np.nan)
+        self.projected_optimal_points: np.ndarray = np.full(shape, np.nan)
+        self.points: np.ndarray = np.full(shape, np.nan)
+        self.optimal_points: np.ndarray = np.full(shape, np.nan)
+
+        for week_ndx, week in enumerate(self.weeks):
+            for team_id, team_decision_quality in season_decision_quality[week].items():
+                if (team_ndx := self.team_indices.get(str(team_id))) is not None:
+                    (
+                        self.lineup_projected_points[week_ndx, team_ndx],
+                        self.projected_optimal_projected_points[week_ndx, team_ndx],
+                        self.projected_optimal_points[week_ndx, team_ndx],
+                    ) = team_decision_quality
+
+            for team_data in weekly_summaries[week]["teams"]:
+                if (team_ndx := self.team_indices.get(str(team_data[0]))) is not None:
+                    self.points[week_ndx, team_ndx] = float(team_data[3])
+                    self.optimal_points[week_ndx, team_ndx] = float(team_data[6])
+
+        # only count weeks in which a team has both projections and results
+        has_projections = (self.projected_optimal_projected_points > 0) & ~np.isnan(self.points)
+        self.season_lineup_projected_points: np.ndarray = np.sum(
+            self.lineup_projected_points, axis=0, where=has_projections
+        )
+        self.season_projected_optimal_projected_points: np.ndarray = np.sum(
+            self.projected_optimal_projected_points, axis=0, where=has_projections
+        )
+        self.season_projected_optimal_points: np.ndarray = np.sum(
+            self.projected_optimal_points, axis=0, where=has_projections
+        )
+        self.season_points: np.ndarray = np.sum(self.points, axis=0, where=has_projections)
+        self.season_optimal_points: np.ndarray = np.sum(self.optimal_points, axis=0, where=has_projections)
+
+        self.decision_quality: np.ndarray = np.divide(
+            self.season_lineup_projected_points * 100,
+            self.season_projected_optimal_projected_points,
+            out=np.zeros(len(self.team_ids)),
+            where=self.season_projected_optimal_projected_points > 0,
+        )
+
+    @property
+    def has_projections(self) -> bool:
+        """Check if the league platform provided player projected points for any week of the season."""
+        return bool(np.any(self.season_projected_optimal_projected_points > 0))
+
+    def get_decision_quality_data(self, teams_results: Dict[str, BaseTeam]) -> List[MetricTableRow]:
+        """Get the decision quality table data, ranked by decision quality and then by season points."""
+        logger.debug("Creating league decision quality data.")
+
+        ranked_team_indices = rank_metric(
+            self.decision_quality.tolist(), tiebreakers=[self.season_points.tolist()]
+        ).rank(list(range(len(self.team_ids))))
+
+        decision_quality_results_data = []
+        for place, team_ndx in enumerate(ranked_team_indices, start=1):
+            team_id = self.team_ids[team_ndx]
+            team = teams_results[team_id]
+            decision_quality_results_data.append(
+                MetricTableRow(
+                    team_id,
+                    [
+                        place,
+                        team.name,
+                        team.manager_str,
+                        MetricValue(round(float(self.decision_quality[team_ndx]), 2), "{:.2f}%"),
+                        MetricValue(round(float(self.season_projected_optimal_points[team_ndx]), 2)),
+                        MetricValue(round(float(self.season_points[team_ndx]), 2)),
+                        MetricValue(round(float(self.season_optimal_points[team_ndx]), 2)),
+                    ],
+                )
+            )
+
+        return decision_quality_results_data
@@ -3,12 +3,14 @@ __email__ = "uberfastman@uberfastman.dev"
 
 import itertools
 from collections import OrderedDict, defaultdict
-from statistics import mean
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from ffmwr.calculate.ranking import MetricRanking, rank_metric
+from ffmwr.calculate.tables import MetricTableRow, MetricValue
 from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseRecord, BaseTeam
+from ffmwr.models.base.season import SeasonRecordTotals
 from ffmwr.utilities.logger import get_logger
 
 logger = get_logger(__name__, propagate=False)
@@ -296,11 +298,14 @@ class CalculateMetrics(object):
         for team in score_results:
             ranked_team_name = team.name
             ranked_team_manager = team.manager_str
-            ranked_weekly_score = f"{team.points:.2f}"
-            ranked_weekly_bench_score = f"{team.bench_points:.2f}"
+            ranked_weekly_score = MetricValue(round(float(team.points), 2))
+            ranked_weekly_bench_score = MetricValue(round(float(team.bench_points), 2))
 
             score_results_data.append(
-                [place, ranked_team_name, ranked_team_manager, ranked_weekly_score, ranked_weekly_bench_score]
+                MetricTableRow(
+                    team.team_id,
+                    [place, ranked_team_name, ranked_team_manager, ranked_weekly_score, ranked_weekly_bench_score],
+                )
             )
 
             place += 1
@@ -321,10 +326,10 @@ class CalculateMetrics(object):
             if ranked_coaching_efficiency == "DQ":
                 self.coaching_efficiency_dq_count += 1
             else:
-                ranked_coaching_efficiency = f"{ranked_coaching_efficiency:.2f}%"
+                ranked_coaching_efficiency = MetricValue(round(float(ranked_coaching_efficiency), 2), "{:.2f}%")
 
             coaching_efficiency_results_data.append(
-                [place, ranked_team_name, ranked_team_manager, ranked_coaching_efficiency]
+                MetricTableRow(team.team_id, [place, ranked_team_name, ranked_team_manager, ranked_coaching_efficiency])
             )
 
             place += 1
@@ -341,10 +346,14 @@ class CalculateMetrics(object):
         for team in luck_results:
             ranked_team_name = team.name
             ranked_team_manager = team.manager_str
-            ranked_luck = f"{team.luck:.2f}%"
+            ranked_luck = MetricValue(round(float(team.luck), 2), "{:.2f}%")
             weekly_overall_record = team.weekly_overall_record.get_record_str()
 
-            luck_results_data.append([place, ranked_team_name, ranked_team_manager, ranked_luck, weekly_overall_record])
+            luck_results_data.append(
+                MetricTableRow(
+                    team.team_id, [place, ranked_team_name, ranked_team_manager, ranked_luck, weekly_overall_record]
+                )
+            )
 
             place += 1
         return luck_results_data
@@ -359,10 +368,12 @@ class CalculateMetrics(object):
         for team in score_results:
             ranked_team_name = team.name
             ranked_team_manager = team.manager_str
-            ranked_weekly_optimal_score = f"{team.optimal_points:.2f}"
+            ranked_weekly_optimal_score = MetricValue(round(float(team.optimal_points), 2))
 
             optimal_score_results_data.append(
-                [place, ranked_team_name, ranked_team_manager, ranked_weekly_optimal_score]
+                MetricTableRow(
+                    team.team_id, [place, ranked_team_name, ranked_team_manager, ranked_weekly_optimal_score]
+                )
             )
 
             place += 1
@@ -379,12 +390,15 @@ class CalculateMetrics(object):
         for team in bad_boy_results:
             ranked_team_name = team.name
             ranked_team_manager = team.manager_str
-            ranked_bad_boy_points = str(team.bad_boy_points)
+            ranked_bad_boy_points = MetricValue(team.bad_boy_points, "{:.0f}")
             ranked_offense = team.worst_offense
-            ranked_count = str(team.num_offenders)
+            ranked_count = MetricValue(team.num_offenders, "{:.0f}")
 
             bad_boy_results_data.append(
-                [place, ranked_team_name, ranked_team_manager, ranked_bad_boy_points, ranked_offense, ranked_count]
+                MetricTableRow(
+                    team.team_id,
+                    [place, ranked_team_name, ranked_team_manager, ranked_bad_boy_points, ranked_offense, ranked_count],
+                )
             )
 
             place += 1
@@ -400,9 +414,11 @@ class CalculateMetrics(object):
         for team in beef_results:
             ranked_team_name = team.name
             ranked_team_manager = team.manager_str
-            ranked_beef_points = f"{team.tabbu:.3f}"
+            ranked_beef_points = MetricValue(round(float(team.tabbu), 3), "{:.3f}")
 
-            beef_results_data.append([place, ranked_team_name, ranked_team_manager, ranked_beef_points])
+            beef_results_data.append(
+                MetricTableRow(team.team_id, [place, ranked_team_name, ranked_team_manager, ranked_beef_points])
+            )
             place += 1
         return beef_results_data
 
@@ -416,120 +432,100 @@ class CalculateMetrics(object):
         for team in high_roller_results:
             ranked_team_name = team.name
             ranked_team_manager = team.manager_str
-            ranked_total_fines = str(team.fines_total)
+            ranked_total_fines = MetricValue(team.fines_total, "{:,.2f}")
             ranked_violation = team.worst_violation
-            ranked_violation_fine = str(team.worst_violation_fine)
+            ranked_violation_fine = MetricValue(team.worst_violation_fine, "{:,.2f}")
 
             high_roller_results_data.append(
-                [
-                    place,
-                    ranked_team_name,
-                    ranked_team_manager,
-                    ranked_total_fines,
-                    ranked_violation,
-                    ranked_violation_fine,
-                ]
+                MetricTableRow(
+                    team.team_id,
+                    [
+                        place,
+                        ranked_team_name,
+                        ranked_team_manager,
+                        ranked_total_fines,
+                        ranked_violation,
+                        ranked_violation_fine,
+                    ],
+                )
             )
 
             place += 1
         return high_roller_results_data
 
-    def get_ties_count(self, results_data: List[List[Any]], tie_type: str, break_ties: bool) -> int:
-        if tie_type == "power_ranking":
-            groups = [list(group) for key, group in itertools.groupby(results_data, lambda x: x[0])]
-            num_ties = self.count_ties(groups)
-        else:
-            groups = [list(group) for key, group in itertools.groupby(results_data, lambda x: x[3])]
-            num_ties = self.count_ties(groups)
+    @staticmethod
+    def get_table_ranking(results_data: List[List[Any]], tie_column: int) -> MetricRanking:
+        """Rank the rows of an already ordered metric table by the values of the given column to detect ties."""
+        return rank_metric(tie_values=[row[tie_column] for row in results_data], untied_values=("DQ",))
+
+    def get_ties_count(
+        self,
+        results_data: List[List[Any]],
+        tie_type: str,
+        break_ties: bool,
+        ranking: Optional[MetricRanking] = None,
+    ) -> int:
+        if not ranking:
+            ranking = self.get_table_ranking(results_data, 0 if tie_type == "power_ranking" else 3)
+        num_ties = ranking.num_ties
 
         # if there are ties, record them and break them if possible
         if num_ties > 0:
-            ties_count = 0
-            team_index = 0
             place = 1
-            while ties_count != num_ties:
-                for group in groups:
-                    group_has_ties = len(group) > 1 and "DQ" not in group[0]
-                    if group_has_ties:
-                        ties_count += sum(range(len(group)))
-
-                    for team in group:
-                        if tie_type == "power_ranking":
-                            results_data[team_index] = [
-                                str(team[0]) + ("*" if group_has_ties else ""),
-                                team[1],
-                                team[2],
-                            ]
-                        elif tie_type == "score" and break_ties:
-                            results_data[team_index] = [str(place), team[1], team[2], team[3]]
-                            if group.index(team) != (len(group) - 1):
-                                place += 1
-                        elif tie_type == "bad_boy":
-                            results_data[team_index] = [
-                                str(place) + ("*" if group_has_ties else ""),
-                                team[1],
-                                team[2],
-                                team[3],
-                                team[4],
-                                team[5],
-                            ]
-                        elif tie_type == "high_roller":
-                            results_data[team_index] = [
-                                str(place) + ("*" if group_has_ties else ""),
-                                team[1],
-                                team[2],
-                                team[3],
-                                team[4],
-                                team[5],
-                            ]
-                        else:
-                            results_data[team_index] = [
-                                str(place) + ("*" if group_has_ties else ""),
-                                team[1],
-                                team[2],
-                                team[3],
-                            ]
-
-                        if tie_type == "score":
-                            results_data[team_index].append(team[4])
-
-                        team_index += 1
-                    place += 1
-
-        if tie_type == "bad_boy":
-            groups = [list(group) for key, group in itertools.groupby(results_data, lambda x: x[3])]
-            num_ties = 0
-            for group in groups:
-                if len(group) > 1 and int(group[0][3]) > 0:
-                    num_ties += sum(range(len(group)))
-
-        if tie_type == "high_roller":
-            groups = [list(group) for key, group in itertools.groupby(results_data, lambda x: x[3])]
-            num_ties = 0
-            for group in groups:
-                if len(group) > 1 and float(group[0][3]) > 0:
-                    num_ties += sum(range(len(group)))
+            for group, group_has_ties in zip(ranking.tie_groups, ranking.group_has_ties):
+                for group_position, team_index in enumerate(group):
+                    # relabel the rows in place so they keep the ids of their teams
+                    team = list(results_data[team_index])
+                    if tie_type == "power_ranking":
+                        results_data[team_index][:] = [str(team[0]) + ("*" if group_has_ties else ""), team[1], team[2]]
+                    elif tie_type == "score" and break_ties:
+                        results_data[team_index][:] = [str(place), team[1], team[2], team[3]]
+                        if group_position != (len(group) - 1):
+                            place += 1
+                    elif tie_type == "bad_boy" or tie_type == "high_roller":
+                        results_data[team_index][:] = [
+                            str(place) + ("*" if group_has_ties else ""),
+                            team[1],
+                            team[2],
+                            team[3],
+                            team[4],
+                            team[5],
+                        ]
+                    else:
+                        results_data[team_index][:] = [
+                            str(place) + ("*" if group_has_ties else ""),
+                            team[1],
+                            team[2],
+                            team[3],
+                        ]
 
-        return num_ties
+                    if tie_type == "score":
+                        results_data[team_index].append(team[4])
 
-    @staticmethod
-    def count_ties(groups: List[List[Any]]) -> int:
-        num_ties = 0
-        for group in groups:
-            if len(group) > 1 and "DQ" not in group[0]:
-                num_ties += sum(range(len(group)))
+                place += 1
+
+        # teams without bad boy points or high roller fines are not counted as ties
+        if tie_type == "bad_boy" or tie_type == "high_roller":
+            num_ties = sum(
+                len(group) * (len(group) - 1) // 2
+                for group in self.get_table_ranking(results_data, 3).tie_groups
+                if len(group) > 1 and results_data[group[0]][3] > 0
+            )
 
         return num_ties
 
     @staticmethod
     def resolve_score_ties(data_for_scores: List[List[Any]], break_ties: bool) -> List[List[Any]]:
-        groups = [list(group) for key, group in itertools.groupby(data_for_scores, lambda x: x[3])]
+        ranking = rank_metric(
+            tie_values=[team[3] for team in data_for_scores], tiebreakers=[[team[-1] for team in data_for_scores]]
+        )
 
         resolved_score_results_data = []
         place = 1
-        for group in groups:
-            for team in sorted(group, key=lambda x: x[-1], reverse=True):
-                if groups.index(group) != 0:
+        for group_ndx, group in enumerate(ranking.tie_groups):
+            for team_index in group:
+                team = data_for_scores[team_index]
+                if group_ndx != 0:
                     team[0] = place
                 else:
                     if break_ties:
@@ -544,7 +540,6 @@ class CalculateMetrics(object):
         data_for_coaching_efficiency: List[List[Any]],
         ties_for_coaching_efficiency: int,
         league: BaseLeague,
-        teams_results: Dict[str, BaseTeam],
         week: int,
         week_for_report: int,
         break_ties: bool,
@@ -555,49 +550,24 @@ class CalculateMetrics(object):
         coaching_efficiency_results_data_with_tiebreakers = []
         bench_positions = league.bench_positions
 
-        season_average_points_by_player_dict = defaultdict(list)
         if break_ties and ties_for_coaching_efficiency > 0 and week == int(week_for_report):
+            season_player_store = league.season_player_store or league.build_season_player_store()
+            # last week points and season average points of every player from the season points index
+            player_season_points_index = season_player_store.get_player_season_points_index(int(week))
             for ce_result in data_for_coaching_efficiency:
                 if ce_result[0] == "1*":
-                    players = []
-                    for team_result in teams_results.values():
-                        if team_result.name == ce_result[1]:
-                            players = teams_results.get(team_result.team_id).roster
+                    team_result = league.teams_by_week.get(str(week), {}).get(str(ce_result.team_id))
+                    players = team_result.roster if team_result else []
 
                     num_players_exceeded_season_avg_points = 0
                     total_percentage_points_players_exceeded_season_avg_points = 0
                     player: BasePlayer
                     for player in players:
                         if player.selected_position not in bench_positions:
-                            week_counter = 1
-                            while week_counter <= int(week):
-                                # players_by_week = league.players_by_week[str(week_counter)]
-                                # if str(player.player_id) in players_by_week.keys():
-                                #     weekly_player_points = players_by_week[str(player.player_id)].points
-                                # else:
-                                #     weekly_player_points = league.get_player_data_by_week(
-                                #         str(player.player_id), week_counter)
-                                #
-                                # season_average_points_by_player_dict[player.player_id].append(weekly_player_points)
-
-                                players_by_week = league.players_by_week[str(week_counter)]
-                                if str(player.player_id) in players_by_week.keys():
-                                    season_average_points_by_player_dict[player.player_id].append(
-                                        players_by_week[str(player.player_id)].points
-                                    )
-
-                                week_counter += 1
-
-                            player_last_week_points = season_average_points_by_player_dict[player.player_id][-1]
-
-                            # handle the beginning of the season when a player has only played one or no games
-                            player_season_weekly_points = season_average_points_by_player_dict[player.player_id]
-                            if len(player_season_weekly_points) == 0:
-                                player_season_avg_points = 0
-                            elif len(player_season_weekly_points) == 1:
-                                player_season_avg_points = player_season_weekly_points[0]
-                            else:
-                                player_season_avg_points = mean(player_season_weekly_points[:-1])
+                            # handle players that have not played any games
+                            player_last_week_points, player_season_avg_points = player_season_points_index.get(
+                                str(player.player_id), (0, 0)
+                            )
 
                             if player_last_week_points > player_season_avg_points:
                                 num_players_exceeded_season_avg_points += 1
@@ -620,18 +590,22 @@ class CalculateMetrics(object):
                     ce_result.extend(["N/A", "N/A"])
                     coaching_efficiency_results_data_with_tiebreakers.append(ce_result)
 
-            groups = [
-                list(group)
-                for key, group in itertools.groupby(coaching_efficiency_results_data_with_tiebreakers, lambda x: x[3])
-            ]
-        else:
-            groups = [list(group) for key, group in itertools.groupby(data_for_coaching_efficiency, lambda x: x[3])]
+            data_for_coaching_efficiency = coaching_efficiency_results_data_with_tiebreakers
+
+        ranking = rank_metric(
+            tie_values=[team[3] for team in data_for_coaching_efficiency],
+            tiebreakers=[
+                [team[-2] if team[-2] != "DQ" else 0 for team in data_for_coaching_efficiency],
+                [team[-1] for team in data_for_coaching_efficiency],
+            ],
+        )
 
         resolved_coaching_efficiency_results_data = []
         place = 1
-        for group in groups:
-            for team in sorted(group, key=lambda x: (x[-2] if x[-2] != "DQ" else 0, x[-1]), reverse=True):
-                if groups.index(group) == 0:
+        for group_ndx, group in enumerate(ranking.tie_groups):
+            for team_index in group:
+                team = data_for_coaching_efficiency[team_index]
+                if group_ndx == 0:
                     if break_ties:
                         team[0] = place
                 resolved_coaching_efficiency_results_data.append(team)
@@ -643,25 +617,6 @@ class CalculateMetrics(object):
         #         "ties.")
         #     return data_for_coaching_efficiency
 
-    @staticmethod
-    def resolve_season_average_ties(data_for_season_averages: List[List[Any]], with_percent: bool) -> List[List[Any]]:
-        groups = [list(group) for key, group in itertools.groupby(data_for_season_averages, lambda x: x[2])]
-
-        resolved_season_average_results_data = []
-        place = 1
-        for group in groups:
-            for team in sorted(group, key=lambda x: x[-1], reverse=True):
-                team[0] = place
-                if with_percent:
-                    team[2] = f"{team[2]}% ({place})"
-                else:
-                    team[2] = f"{team[2]} ({place})"
-
-                resolved_season_average_results_data.append(team)
-            place += 1
-
-        return resolved_season_average_results_data
-
     # noinspection PyUnusedLocal
     @staticmethod
     def test_ties(teams_results):
@@ -743,58 +698,60 @@ class CalculateMetrics(object):
 
         standings = league.standings if league.standings else league.current_standings
 
-        records = defaultdict(BaseRecord)
+        if week == league.start_week:
+            record_totals = SeasonRecordTotals([team.team_id for team in standings])
+        elif previous_record_totals := league.record_totals_by_week.get(str(week - 1)):
+            record_totals = previous_record_totals.copy()
+        else:
+            record_totals = SeasonRecordTotals.from_records(league.records_by_week[str(week - 1)])
+
+        has_result = record_totals.add_week_results(custom_weekly_matchups)
+        league.record_totals_by_week[str(week)] = record_totals
+
+        # only create record objects for output from the updated totals
+        wins = record_totals.wins.tolist()
+        ties = record_totals.ties.tolist()
+        losses = record_totals.losses.tolist()
+        points_for = record_totals.points_for.tolist()
+        points_against = record_totals.points_against.tolist()
+        streak_type_codes = record_totals.streak_type_codes.tolist()
+        streak_lengths = record_totals.streak_lengths.tolist()
+        division_wins = record_totals.division_wins.tolist()
+        division_ties = record_totals.division_ties.tolist()
+        division_losses = record_totals.division_losses.tolist()
+        division_points_for = record_totals.division_points_for.tolist()
+        division_points_against = record_totals.division_points_against.tolist()
+        division_streak_type_codes = record_totals.division_streak_type_codes.tolist()
+        division_streak_lengths = record_totals.division_streak_lengths.tolist()
+
+        records = {}
         team: BaseTeam
         for team in standings:
-            if week == league.start_week:
-                record = BaseRecord(week, team_id=team.team_id, team_name=team.name, division=team.division)
-            else:
-                previous_week_record: BaseRecord = league.records_by_week[str(week - 1)][team.team_id]
-                record = BaseRecord(
-                    week,
-                    wins=previous_week_record.get_wins(),
-                    ties=previous_week_record.get_ties(),
-                    losses=previous_week_record.get_losses(),
-                    points_for=previous_week_record.get_points_for(),
-                    points_against=previous_week_record.get_points_against(),
-                    streak_type=previous_week_record.get_streak_type(),
-                    streak_len=previous_week_record.get_streak_length(),
-                    team_id=team.team_id,
-                    team_name=team.name,
-                    division=team.division,
-                    division_wins=previous_week_record.get_division_wins(),
-                    division_ties=previous_week_record.get_division_ties(),
-                    division_losses=previous_week_record.get_division_losses(),
-                    division_points_for=previous_week_record.get_division_points_for(),
-                    division_points_against=previous_week_record.get_division_points_against(),
-                    division_streak_type=previous_week_record.get_division_streak_type(),
-                    division_streak_len=previous_week_record.get_division_streak_length(),
-                )
+            ndx = record_totals.team_index[str(team.team_id)]
+            record = BaseRecord(
+                week,
+                wins=wins[ndx],
+                ties=ties[ndx],
+                losses=losses[ndx],
+                points_for=points_for[ndx],
+                points_against=points_against[ndx],
+                streak_type=SeasonRecordTotals.streak_types[streak_type_codes[ndx]],
+                streak_len=streak_lengths[ndx],
+                team_id=team.team_id,
+                team_name=team.name,
+                division=team.division,
+                division_wins=division_wins[ndx],
+                division_ties=division_ties[ndx],
+                division_losses=division_losses[ndx],
+                division_points_for=division_points_for[ndx],
+                division_points_against=division_points_against[ndx],
+                division_streak_type=SeasonRecordTotals.streak_types[division_streak_type_codes[ndx]],
+                # teams without a division streak have no division streak length
+                division_streak_len=division_streak_lengths[ndx] if division_streak_type_codes[ndx] else None,
+            )
 
-            # league.matchups_by_week[str(week)]
-
-            for matchup in custom_weekly_matchups:
-                for team_id, matchup_result in matchup.items():
-                    if str(team_id) == str(team.team_id):
-                        outcome = matchup_result["result"]
-                        if outcome == "W":
-                            record.add_win()
-                            if matchup_result["division"]:
-                                record.add_division_win()
-                        elif outcome == "L":
-                            record.add_loss()
-                            if matchup_result["division"]:
-                                record.add_division_loss()
-                        else:
-                            record.add_tie()
-                            if matchup_result["division"]:
-                                record.add_division_tie()
-                        record.add_points_for(matchup_result["points_for"])
-                        record.add_points_against(matchup_result["points_against"])
-                        if matchup_result["division"]:
-                            record.add_division_points_for(matchup_result["points_for"])
-                            record.add_division_points_against(matchup_result["points_against"])
-                        records[team.team_id] = record
+            if has_result[ndx]:
+                records[team.team_id] = record
 
             team.record = record
 
@@ -812,122 +769,141 @@ class CalculateMetrics(object):
         return records
 
     @staticmethod
-    def calculate_luck(
-        week: int, league: BaseLeague, custom_weekly_matchups: List[Dict[str, Dict[str, Any]]]
-    ) -> Dict[str, Dict[str, BaseRecord]]:
-        logger.debug(f'Calculating luck for week "{week}".')
+    def _get_all_play_records(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count the wins, losses, and ties of every team against every other team along the last axis of an array of
+        team scores (a single week of scores or a weeks by teams matrix of scores).
+        """
+        team_scores = scores[..., :, np.newaxis]
+        opponent_scores = scores[..., np.newaxis, :]
 
-        luck_results = defaultdict(defaultdict)
+        wins = np.sum(team_scores > opponent_scores, axis=-1)
+        losses = np.sum(team_scores < opponent_scores, axis=-1)
+        # exclude the comparison of each team against itself
+        ties = np.sum(team_scores == opponent_scores, axis=-1) - 1
 
-        teams = league.teams_by_week.get(str(week))
+        return wins, losses, ties
+
+    @staticmethod
+    def _get_luck_results(
+        team_ids: List[str],
+        wins: np.ndarray,
+        losses: np.ndarray,
+        ties: np.ndarray,
+        custom_weekly_matchups: List[Dict[str, Dict[str, Any]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        luck_results = defaultdict(defaultdict)
 
         matchups = {
             str(team_id): value["result"] for pair in custom_weekly_matchups for team_id, value in list(pair.items())
         }
 
-        team_1: BaseTeam
-        for team_1 in teams.values():
-            luck_record = BaseRecord()
+        # number of teams excluding current team
+        num_teams = float(len(team_ids)) - 1
 
-            for team_2 in teams.values():
-                if team_1.team_id == team_2.team_id:
-                    continue
-                score_1 = team_1.points
-                score_2 = team_2.points
-
-                if float(score_1) > float(score_2):
-                    luck_record.add_win()
-                elif float(score_1) < float(score_2):
-                    luck_record.add_loss()
-                else:
-                    luck_record.add_tie()
-
-            luck_results[team_1.team_id]["luck_record"] = luck_record
+        for team_id, team_wins, team_losses, team_ties in zip(team_ids, wins.tolist(), losses.tolist(), ties.tolist()):
+            luck_results[team_id]["luck_record"] = BaseRecord(wins=team_wins, ties=team_ties, losses=team_losses)
 
             # calc luck %
             # TODO: assuming no ties...  how are tiebreakers handled?
             luck = 0.0
-            # number of teams excluding current team
-            num_teams = float(len(teams)) - 1
-
-            if luck_record.get_wins() != 0 and luck_record.get_losses() != 0:
-                matchup_result = matchups[str(team_1.team_id)]
+            if team_wins != 0 and team_losses != 0:
+                matchup_result = matchups[str(team_id)]
                 if matchup_result == "W" or matchup_result == "T":
-                    luck = (luck_record.get_losses() + luck_record.get_ties()) / num_teams
+                    luck = (team_losses + team_ties) / num_teams
                 else:
-                    luck = 0 - (luck_record.get_wins() + luck_record.get_ties()) / num_teams
+                    luck = 0 - (team_wins + team_ties) / num_teams
 
             # noinspection PyTypeChecker
-            luck_results[team_1.team_id]["luck"] = luck * 100
+            luck_results[team_id]["luck"] = luck * 100
 
         return luck_results
 
     @staticmethod
-    def get_ranks_for_metric(
-        data_for_metric: List[List[Any]], power_ranked_teams: Dict[str, Dict[str, Any]], metric_ranking_key: str
-    ):
-        rank = 1
-        for team in data_for_metric:
-            for team_rankings in power_ranked_teams.values():
-                if team[1] == team_rankings["name"]:
-                    team_rankings[metric_ranking_key] = rank
-            rank += 1
-
-    def calculate_power_rankings(
-        self,
-        teams_results: Dict[str, BaseTeam],
-        data_for_scores: List[List[Any]],
-        data_for_coaching_efficiency: List[List[Any]],
-        data_for_luck: List[List[Any]],
+    def calculate_luck(
+        week: int, league: BaseLeague, custom_weekly_matchups: List[Dict[str, Dict[str, Any]]]
     ) -> Dict[str, Dict[str, Any]]:
-        """avg of (weekly score rank + weekly coaching efficiency rank + weekly luck rank)"""
-        logger.debug("Calculating power rankings.")
+        logger.debug(f'Calculating luck for week "{week}".')
 
-        power_ranked_teams = {
-            team_result.team_id: {"name": team_result.name, "manager_str": team_result.manager_str}
-            for team_result in teams_results.values()
-        }
+        teams = league.teams_by_week.get(str(week))
 
-        self.get_ranks_for_metric(data_for_scores, power_ranked_teams, "score_ranking")
-        self.get_ranks_for_metric(data_for_coaching_efficiency, power_ranked_teams, "coaching_efficiency_ranking")
-        self.get_ranks_for_metric(data_for_luck, power_ranked_teams, "luck_ranking")
+        team_ids = [team.team_id for team in teams.values()]
+        wins, losses, ties = CalculateMetrics._get_all_play_records(
+            np.array([float(team.points) for team in teams.values()])
+        )
 
-        for team_rankings in power_ranked_teams.values():
-            # noinspection PyTypeChecker
-            team_rankings["power_ranking"] = (
-                team_rankings["score_ranking"]
-                + team_rankings["coaching_efficiency_ranking"]
-                + team_rankings["luck_ranking"]
-            ) // 3.0
-        return power_ranked_teams
+        return CalculateMetrics._get_luck_results(team_ids, wins, losses, ties, custom_weekly_matchups)
 
     @staticmethod
-    def calculate_z_scores(weekly_teams_results: List[Dict[str, BaseTeam]]) -> Dict[str, float]:
-        logger.debug("Calculating z-scores.")
-
-        results = {}
-
-        # can only determine z_score
-        can_calculate = len(weekly_teams_results) > 2
-
-        # iterates through team ids of first week since team ids remain unchanged
-        for team_id in weekly_teams_results[0].keys():
-            z_score = None
+    def calculate_season_luck(
+        league: BaseLeague, custom_weekly_matchups_by_week: Dict[int, List[Dict[str, Dict[str, Any]]]]
+    ) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        """Calculate the luck of all given weeks at once from a weeks by teams matrix of scores. Weeks that do not have
+        the same teams as the first week are calculated individually.
+        """
+        logger.debug(f"Calculating luck for weeks {', '.join(str(week) for week in custom_weekly_matchups_by_week)}.")
+
+        weeks = list(custom_weekly_matchups_by_week.keys())
+        if not weeks:
+            return {}
+
+        team_ids = [team.team_id for team in league.teams_by_week.get(str(weeks[0])).values()]
+
+        season_weeks = []
+        season_scores = []
+        season_luck_results = {}
+        for week in weeks:
+            teams_by_id = {team.team_id: team for team in league.teams_by_week.get(str(week)).values()}
+            if teams_by_id.keys() == set(team_ids):
+                season_weeks.append(week)
+                season_scores.append([float(teams_by_id[team_id].points) for team_id in team_ids])
+            else:
+                season_luck_results[week] = CalculateMetrics.calculate_luck(
+                    week, league, custom_weekly_matchups_by_week[week]
+                )
 
-            if can_calculate:
-                scores = [week[team_id].points for week in weekly_teams_results]
+        if season_weeks:
+            wins, losses, ties = CalculateMetrics._get_all_play_records(np.array(season_scores))
+            for ndx, week in enumerate(season_weeks):
+                season_luck_results[week] = CalculateMetrics._get_luck_results(
+                    team_ids, wins[ndx], losses[ndx], ties[ndx], custom_weekly_matchups_by_week[week]
+                )
 
-                scores_excluding_current = scores[:-1]
-                current_score = scores[-1]
+        return {week: season_luck_results[week] for week in weeks}
 
-                standard_deviation = np.std(scores_excluding_current)
-                mean_score = np.mean(scores_excluding_current)
-                z_score = (
-                    (float(current_score) - float(mean_score)) / float(standard_deviation)
-                    if standard_deviation != 0
-                    else 0
-                )
+    @staticmethod
+    def calculate_season_z_scores(
+        weekly_teams_results: List[Dict[str, BaseTeam]],
+    ) -> List[Dict[str, Optional[float]]]:
+        """Calculate the z-scores of every week in a single pass, comparing the score of each team to the mean and
+        standard deviation of its scores in all previous weeks, which are kept as running (Welford) accumulators.
+        """
+        logger.debug("Calculating season z-scores.")
 
-            results[team_id] = z_score
+        if not weekly_teams_results:
+            return []
 
-        return results
+        # iterates through team ids of first week since team ids remain unchanged
+        team_ids = list(weekly_teams_results[0].keys())
+
+        mean_scores = np.zeros(len(team_ids))
+        sums_of_squared_deviations = np.zeros(len(team_ids))
+
+        season_z_scores = []
+        for num_previous_weeks, week in enumerate(weekly_teams_results):
+            scores = np.array([float(week[team_id].points) for team_id in team_ids])
+
+            z_scores = {team_id: None for team_id in team_ids}
+            # can only determine z_score when there are at least two previous weeks
+            if num_previous_weeks >= 2:
+                standard_deviations = np.sqrt(sums_of_squared_deviations / num_previous_weeks)
+                for team_id, score, mean_score, standard_deviation in zip(
+                    team_ids, scores.tolist(), mean_scores.tolist(), standard_deviations.tolist()
+                ):
+                    z_scores[team_id] = (score - mean_score) / standard_deviation if standard_deviation != 0 else 0
+            season_z_scores.append(z_scores)
+
+            deltas = scores - mean_scores
+            mean_scores += deltas / (num_previous_weeks + 1)
+            sums_of_squared_deviations += deltas * (scores - mean_scores)
+
+        return season_z_scores
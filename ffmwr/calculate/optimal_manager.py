@@ -0,0 +1,117 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ffmwr.calculate.ranking import rank_metric
+from ffmwr.calculate.tables import MetricTableRow, MetricValue
+from ffmwr.models.base.model import BaseLeague, BaseTeam
+from ffmwr.utilities.logger import get_logger
+
+logger = get_logger(__name__, propagate=False)
+
+
+class OptimalManagerBacktest(object):
+    """Season backtest of the record each team would have had if its manager started the optimal lineup every week,
+    which replays every matchup of every completed week with each team's optimal points against its opponent's actual
+    points. The actual record of each team is its season record from the league results.
+
+    All arrays are weeks x teams arrays (or team arrays) indexed by the position of each team id in the team ids list,
+    and are calculated from the optimal points already in the weekly summaries of the report.
+    """
+
+    def __init__(
+        self,
+        team_ids: List[str],
+        weekly_summaries: Dict[int, Dict[str, Any]],
+        league: BaseLeague,
+    ):
+        logger.debug("Calculating optimal manager backtest.")
+
+        self.team_ids: List[str] = [str(team_id) for team_id in team_ids]
+        self.team_indices: Dict[str, int] = {team_id: team_ndx for team_ndx, team_id in enumerate(self.team_ids)}
+        self.weeks: List[int] = sorted(weekly_summaries.keys())
+
+        shape = (len(self.weeks), len(self.team_ids))
+        self.points: np.ndarray = np.full(shape, np.nan)
+        self.optimal_points: np.ndarray = np.full(shape, np.nan)
+        # index of the opponent of each team in each week, with -1 for weeks in which a team has no matchup
+        self.opponent_indices: np.ndarray = np.full(shape, -1, dtype=int)
+
+        for week_ndx, week in enumerate(self.weeks):
+            for team_data in weekly_summaries[week]["teams"]:
+                if (team_ndx := self.team_indices.get(str(team_data[0]))) is not None:
+                    self.points[week_ndx, team_ndx] = float(team_data[3])
+                    self.optimal_points[week_ndx, team_ndx] = float(team_data[6])
+
+            for team_id, team_ndx in self.team_indices.items():
+                opponent = league.get_opponent_by_team_id(team_id, week)
+                if opponent and (opponent_ndx := self.team_indices.get(str(opponent.team_id))) is not None:
+                    self.opponent_indices[week_ndx, team_ndx] = opponent_ndx
+
+        opponent_points = np.take_along_axis(self.points, np.maximum(self.opponent_indices, 0), axis=1)
+        has_matchup = (self.opponent_indices >= 0) & ~np.isnan(opponent_points) & ~np.isnan(self.optimal_points)
+
+        self.optimal_wins, self.optimal_losses, self.optimal_ties = self._get_optimal_records(
+            self.optimal_points, opponent_points, has_matchup
+        )
+
+        # points left on the bench are the optimal points a team did not score in every completed week
+        self.points_left_on_bench: np.ndarray = np.nansum(self.optimal_points - self.points, axis=0)
+
+    @staticmethod
+    def _get_optimal_records(
+        optimal_points: np.ndarray, opponent_points: np.ndarray, has_matchup: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the wins, losses, and ties of every team from their weekly optimal points against their opponents'
+        actual points.
+        """
+        # compare points at their displayed precision, to which optimal points are also rounded
+        points = np.round(optimal_points, 2)
+        opponent_points = np.round(opponent_points, 2)
+
+        wins = np.sum(has_matchup & (points > opponent_points), axis=0)
+        losses = np.sum(has_matchup & (points < opponent_points), axis=0)
+        ties = np.sum(has_matchup & (points == opponent_points), axis=0)
+        return wins, losses, ties
+
+    @staticmethod
+    def _format_record(wins: int, losses: int, ties: int) -> str:
+        if ties > 0:
+            return f"{wins}-{losses}-{ties}"
+        else:
+            return f"{wins}-{losses}"
+
+    def get_optimal_manager_data(self, teams_results: Dict[str, BaseTeam]) -> List[MetricTableRow]:
+        """Get the optimal manager table data, ranked by optimal lineup record and then by the fewest points left on
+        the bench, with the actual record of each team from its season record in the team results.
+        """
+        logger.debug("Creating league optimal manager data.")
+
+        ranked_team_indices = rank_metric(
+            (self.optimal_wins + self.optimal_ties / 2.0).tolist(), tiebreakers=[(-self.points_left_on_bench).tolist()]
+        ).rank(list(range(len(self.team_ids))))
+
+        optimal_manager_results_data = []
+        for place, team_ndx in enumerate(ranked_team_indices, start=1):
+            team_id = self.team_ids[team_ndx]
+            team = teams_results[team_id]
+            optimal_wins = int(self.optimal_wins[team_ndx])
+            optimal_manager_results_data.append(
+                MetricTableRow(
+                    team_id,
+                    [
+                        place,
+                        team.name,
+                        team.manager_str,
+                        self._format_record(team.record.get_wins(), team.record.get_losses(), team.record.get_ties()),
+                        self._format_record(optimal_wins, self.optimal_losses[team_ndx], self.optimal_ties[team_ndx]),
+                        MetricValue(optimal_wins - team.record.get_wins(), "{:+.0f}"),
+                        MetricValue(round(float(self.points_left_on_bench[team_ndx]), 2)),
+                    ],
+                )
+            )
+
+        return optimal_manager_results_data
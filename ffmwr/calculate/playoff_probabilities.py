@@ -16,6 +16,7 @@ from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple
 
 import numpy as np
 
+from ffmwr.utilities.files import file_lock
 from ffmwr.utilities.logger import get_logger
 from ffmwr.utilities.settings import AppSettings, get_app_settings_from_env_file
 from ffmwr.utilities.utils import FFMWRPythonObjectJson
@@ -375,7 +376,8 @@ class PlayoffProbabilities(FFMWRPythonObjectJson):
                     )
 
                     if self.save_data:
-                        self.save_to_json_file(playoff_probs_data_file)
+                        with file_lock(playoff_probs_data_file):
+                            self.save_to_json_file(playoff_probs_data_file)
 
                 else:
                     logger.info("Using saved Monte Carlo playoff simulations for playoff probabilities.")
@@ -1,10 +1,12 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
-import copy
 from typing import Any, Dict, List
 
+import numpy as np
+
 from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam
+from ffmwr.models.base.positions import PositionRegistry
 from ffmwr.utilities.logger import get_logger
 
 logger = get_logger(__name__, propagate=False)
@@ -18,77 +20,132 @@ class PointsByPosition(object):
         self.roster_slot_counts: Dict[str, int] = {k: v for k, v in league.roster_position_counts.items() if v != 0}
         self.bench_positions: List[str] = league.bench_positions
         self.flex_positions_dict: Dict[str, List[str]] = league.get_flex_positions_dict()
-        self.flex_types: List[str] = list(self.flex_positions_dict.keys())
 
-    @staticmethod
-    def calculate_points_by_position_season_averages(
-        season_average_points_by_position_dict: Dict[str, List[List[float]]],
-    ) -> Dict[str, List[List[float]]]:
-        logger.debug("Calculating points by position season averages.")
+        self.position_registry: PositionRegistry = league.position_registry
+        self.bench_positions_mask: int = self.position_registry.get_positions_mask(self.bench_positions)
 
-        for team in season_average_points_by_position_dict:
-            points_by_position = season_average_points_by_position_dict.get(team)
-            season_average_points_by_position = {}
-            for week in points_by_position:
-                for position in week:
-                    position_points = season_average_points_by_position.get(position[0])
-                    if position_points:
-                        season_average_points_by_position[position[0]] = position_points + position[1]
-                    else:
-                        season_average_points_by_position[position[0]] = position[1]
-            season_average_points_by_position_list = []
-            for position in list(season_average_points_by_position.keys()):
-                season_average_points_by_position_list.append(
-                    [position, season_average_points_by_position.get(position) / len(points_by_position)]
-                )
-            season_average_points_by_position_list = sorted(season_average_points_by_position_list, key=lambda x: x[0])
-            season_average_points_by_position_dict[team] = season_average_points_by_position_list
+        # flex slots with roster slots for any of their positions, whose points count toward those positions
+        self.flex_types: List[str] = []
+        # positions (in alphabetical order) for which points are calculated and the bitmasks of the primary positions
+        # of the players whose points count toward each of them
+        self.positions: List[str] = self._get_positions()
+        self.position_masks: List[int] = [
+            self.position_registry.get_slot_mask(position, self.flex_positions_dict) for position in self.positions
+        ]
+
+    def _get_positions(self) -> List[str]:
+        roster_slots_mask = self.position_registry.get_positions_mask(self.roster_slot_counts.keys())
 
-        return season_average_points_by_position_dict
+        positions = set()
+        for slot in self.roster_slot_counts.keys():
+            if self.position_registry.get_position_bit(slot) & self.bench_positions_mask:
+                continue
 
-    def _get_points_for_position(self, players: List[BasePlayer], position: str) -> float:
-        total_points_by_position = 0
-        player: BasePlayer
-        for player in players:
-            if (
-                position == player.primary_position
-                or (player.primary_position in self.flex_positions_dict.get(position, []))
-            ) and player.selected_position not in self.bench_positions:
-                total_points_by_position += float(player.points)
+            if slot in self.flex_positions_dict:
+                flex_slot_positions = self.flex_positions_dict.get(slot)
+                if self.position_registry.get_positions_mask(flex_slot_positions) & roster_slots_mask:
+                    # count flex slot points toward the positions of the flex, including positions without roster slots
+                    self.flex_types.append(slot)
+                    positions.update(flex_slot_positions)
+                    continue
 
-        return total_points_by_position
+            # flex slots without roster slots for any of their positions count as their own position
+            positions.add(slot)
 
-    def _execute_points_by_position(self, team_name: str, roster: List[BasePlayer]) -> List[List[Any]]:
-        logger.debug(f'Calculating points by position for team "{team_name}".')
+        return sorted(positions)
 
-        player_points_by_position = []
-        starting_players = [p for p in roster if p.selected_position not in self.bench_positions]
-        for slot in list(self.roster_slot_counts.keys()):
-            if slot not in self.bench_positions and slot not in self.flex_types:
-                player_points_by_position.append([slot, self._get_points_for_position(starting_players, slot)])
+    @staticmethod
+    def calculate_points_by_position_season_averages(
+        season_average_points_by_position_dict: Dict[str, List[List[List[Any]]]],
+    ) -> Dict[str, List[List[float]]]:
+        """Calculate the season average points by position of every team from their weekly points by position, with
+        positions missing from a week of a team counting as zero points for that week.
+        """
+        logger.debug("Calculating points by position season averages.")
+
+        team_ids = list(season_average_points_by_position_dict.keys())
+        positions = sorted(
+            {
+                position
+                for team_weeks in season_average_points_by_position_dict.values()
+                for week in team_weeks
+                for position, _ in week
+            }
+        )
+        position_index = {position: ndx for ndx, position in enumerate(positions)}
+        num_weeks = np.array(
+            [len(team_weeks) for team_weeks in season_average_points_by_position_dict.values()], dtype=int
+        )
+
+        # teams x weeks x positions array of weekly points, with weeks missing for a team masked with NaN
+        weekly_points_by_position = np.full((len(team_ids), num_weeks.max(initial=0), len(positions)), np.nan)
+        team_has_position = np.zeros((len(team_ids), len(positions)), dtype=bool)
+        for team_ndx, team_weeks in enumerate(season_average_points_by_position_dict.values()):
+            weekly_points_by_position[team_ndx, : len(team_weeks)] = 0.0
+            for week_ndx, week in enumerate(team_weeks):
+                for position, points in week:
+                    weekly_points_by_position[team_ndx, week_ndx, position_index[position]] += points
+                    team_has_position[team_ndx, position_index[position]] = True
+
+        season_average_points_by_position = (
+            np.nansum(weekly_points_by_position, axis=1) / np.maximum(num_weeks, 1)[:, np.newaxis]
+        )
+
+        return {
+            team_id: [
+                [position, season_average_points]
+                for position, season_average_points, has_position in zip(
+                    positions, season_average_points_by_position[team_ndx].tolist(), team_has_position[team_ndx]
+                )
+                if has_position
+            ]
+            for team_ndx, team_id in enumerate(team_ids)
+        }
 
-        player_points_by_position = sorted(player_points_by_position, key=lambda x: x[0])
-        return player_points_by_position
+    def _is_starter(self, player: BasePlayer) -> bool:
+        return not self.position_registry.get_position_bit(player.selected_position) & self.bench_positions_mask
 
     def get_weekly_points_by_position(self, teams_results: Dict[str, BaseTeam]) -> List[List[Any]]:
         logger.debug("Retrieving weekly points by position.")
 
-        team_roster_slot_counts = copy.deepcopy(self.roster_slot_counts)
-        team_roster_slots = list(team_roster_slot_counts.keys())
-
-        weekly_points_by_position_data = []
-        team_result: BaseTeam
-        for team_result in teams_results.values():
-            for slot in list(team_roster_slot_counts.keys()):
-                if slot in self.flex_types:
-                    if not set(self.flex_positions_dict.get(slot)).intersection(set(team_roster_slots)):
-                        self.flex_types.remove(slot)
-                    else:
-                        for flex_slot in self.flex_positions_dict.get(slot):
-                            if flex_slot not in team_roster_slot_counts:
-                                self.roster_slot_counts[flex_slot] = 1
-
-            player_points_by_position = self._execute_points_by_position(team_result.name, team_result.roster)
-            weekly_points_by_position_data.append([team_result.team_id, player_points_by_position])
-
-        return weekly_points_by_position_data
+        teams: List[BaseTeam] = list(teams_results.values())
+
+        # collect the team, primary position code, and points of the starting players of all teams
+        primary_position_codes: Dict[str, int] = {}
+        team_indices = []
+        player_position_codes = []
+        player_points = []
+        for team_ndx, team_result in enumerate(teams):
+            logger.debug(f'Calculating points by position for team "{team_result.name}".')
+            for player in team_result.roster:
+                if self._is_starter(player):
+                    team_indices.append(team_ndx)
+                    player_position_codes.append(
+                        primary_position_codes.setdefault(player.primary_position, len(primary_position_codes))
+                    )
+                    player_points.append(float(player.points))
+
+        # primary position codes x positions matrix of the positions toward which each primary position counts
+        primary_position_counts_toward = np.array(
+            [
+                [bool(self.position_registry.get_position_bit(primary_position) & mask) for mask in self.position_masks]
+                for primary_position in primary_position_codes.keys()
+            ],
+            dtype=bool,
+        ).reshape(len(primary_position_codes), len(self.positions))
+
+        # sum the points of every starting player into each position they count toward as a teams x positions matrix
+        player_ndx, position_ndx = np.nonzero(
+            primary_position_counts_toward[np.array(player_position_codes, dtype=int)]
+        )
+        weekly_points_by_position = np.zeros((len(teams), len(self.positions)))
+        np.add.at(
+            weekly_points_by_position,
+            (np.array(team_indices, dtype=int)[player_ndx], position_ndx),
+            np.array(player_points, dtype=float)[player_ndx],
+        )
+
+        return [
+            [team_result.team_id, [list(position_points) for position_points in zip(self.positions, team_points)]]
+            for team_result, team_points in zip(teams, weekly_points_by_position.tolist())
+        ]
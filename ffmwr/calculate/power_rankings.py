@@ -0,0 +1,50 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from typing import List
+
+import numpy as np
+
+from ffmwr.calculate.tables import MetricTableRow
+from ffmwr.utilities.logger import get_logger
+
+logger = get_logger(__name__, propagate=False)
+
+
+class PowerRankings(object):
+    """Power rankings of the teams of a week, which are the average of each team's weekly score, coaching efficiency,
+    and luck ranks (rounded down).
+
+    All rank arrays are indexed by the position of each team id in the team ids list.
+    """
+
+    def __init__(
+        self,
+        team_ids: List[str],
+        data_for_scores: List[MetricTableRow],
+        data_for_coaching_efficiency: List[MetricTableRow],
+        data_for_luck: List[MetricTableRow],
+    ):
+        logger.debug("Calculating power rankings.")
+
+        self.team_ids: List[str] = team_ids
+        self.team_indices = {team_id: team_ndx for team_ndx, team_id in enumerate(team_ids)}
+
+        self.score_ranks: np.ndarray = self.get_metric_ranks(data_for_scores)
+        self.coaching_efficiency_ranks: np.ndarray = self.get_metric_ranks(data_for_coaching_efficiency)
+        self.luck_ranks: np.ndarray = self.get_metric_ranks(data_for_luck)
+
+        self.power_rankings: np.ndarray = (self.score_ranks + self.coaching_efficiency_ranks + self.luck_ranks) // 3.0
+        # team indices from the best (lowest) power ranking to the worst, keeping team order for tied power rankings
+        self.order: np.ndarray = np.argsort(self.power_rankings, kind="stable")
+
+    def get_metric_ranks(self, data_for_metric: List[MetricTableRow]) -> np.ndarray:
+        """Get the rank of every team from its position in an ordered (and tie-resolved) metric table."""
+        metric_ranks = np.zeros(len(self.team_ids), dtype=int)
+        metric_ranks[[self.team_indices[row.team_id] for row in data_for_metric]] = np.arange(
+            1, len(data_for_metric) + 1
+        )
+        return metric_ranks
+
+    def get_power_ranking(self, team_id: str) -> float:
+        return self.power_rankings[self.team_indices[team_id]].item()
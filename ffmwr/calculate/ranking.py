@@ -0,0 +1,77 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from typing import Any, Collection, List, Optional, Sequence
+
+
+class MetricRanking(object):
+    """Ranking of the entries of a metric, with the entries grouped into tie groups of equal tie values in ranked order.
+
+    All entries are referenced by their index in the ranked metric vector.
+    """
+
+    def __init__(self, tie_groups: List[List[int]], counted_tie_groups: List[bool]):
+        self.tie_groups: List[List[int]] = tie_groups
+        # tie groups of untied values (such as disqualifications) are not counted as ties
+        self.group_has_ties: List[bool] = [
+            len(group) > 1 and counted for group, counted in zip(tie_groups, counted_tie_groups)
+        ]
+
+        self.order: List[int] = [ndx for group in tie_groups for ndx in group]
+        self.dense_ranks: List[int] = [rank for rank, group in enumerate(tie_groups, start=1) for _ in group]
+
+        self.num_ties: int = sum(
+            len(group) * (len(group) - 1) // 2
+            for group, group_has_ties in zip(tie_groups, self.group_has_ties)
+            if group_has_ties
+        )
+        self.num_first_place: int = len(tie_groups[0]) if tie_groups else 0
+
+    def rank(self, entries: Sequence[Any]) -> List[Any]:
+        """Order the given entries (aligned with the ranked metric vector) by rank."""
+        return [entries[ndx] for ndx in self.order]
+
+
+def rank_metric(
+    values: Optional[Sequence[Any]] = None,
+    tie_values: Optional[Sequence[Any]] = None,
+    tiebreakers: Optional[Sequence[Sequence[Any]]] = None,
+    reverse: bool = True,
+    untied_values: Collection[Any] = (),
+) -> MetricRanking:
+    """Rank a metric vector and detect ties in a single pass over the ranked entries.
+
+    Args:
+        values (Sequence[Any], optional): metric values to rank by (entries keep their input order when omitted)
+        tie_values (Sequence[Any], optional): values used to detect ties between consecutively ranked entries, such as
+            the displayed (rounded) metric values (defaults to the metric values)
+        tiebreakers (Sequence[Sequence[Any]], optional): tiebreak vectors used to order the entries within each tie
+            group, in order of precedence and always from highest to lowest
+        reverse (bool, optional): rank from the highest metric value to the lowest
+        untied_values (Collection[Any], optional): tie values for which equal entries are not counted as ties
+
+    Returns:
+        MetricRanking: the ranked order, tie groups, dense ranks, number of ties, and number of first place entries
+    """
+    if values is not None:
+        order = sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+    else:
+        order = list(range(len(tie_values)))
+
+    if tie_values is None:
+        tie_values = values
+
+    tie_groups = []
+    for ndx in order:
+        if tie_groups and tie_values[ndx] == tie_values[tie_groups[-1][0]]:
+            tie_groups[-1].append(ndx)
+        else:
+            tie_groups.append([ndx])
+
+    if tiebreakers:
+        tie_groups = [
+            sorted(group, key=lambda x: tuple(tiebreaker[x] for tiebreaker in tiebreakers), reverse=True)
+            for group in tie_groups
+        ]
+
+    return MetricRanking(tie_groups, [tie_values[group[0]] not in untied_values for group in tie_groups])
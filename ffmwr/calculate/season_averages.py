@@ -5,7 +5,8 @@ from typing import Any, List
 
 import numpy as np
 
-from ffmwr.calculate.metrics import CalculateMetrics
+from ffmwr.calculate.ranking import rank_metric
+from ffmwr.calculate.tables import MetricValue
 from ffmwr.report.data import ReportData
 from ffmwr.utilities.logger import get_logger
 
@@ -13,10 +14,10 @@ logger = get_logger(__name__, propagate=False)
 
 
 class SeasonAverageCalculator(object):
-    def __init__(self, team_names: List[str], report_data: ReportData, break_ties: bool):
+    def __init__(self, team_ids: List[str], report_data: ReportData, break_ties: bool):
         logger.debug("Initializing season averages.")
 
-        self.team_names: List[str] = team_names
+        self.team_ids: List[str] = team_ids
         self.report_data: ReportData = report_data
         self.break_ties: bool = break_ties
 
@@ -30,49 +31,42 @@ class SeasonAverageCalculator(object):
     ) -> List[List[Any]]:
         logger.debug(f'Calculating season average from "{key}".')
 
-        season_average_list = []
-        team_index = 0
-        for team in data:
-            team_name = self.team_names[team_index]
-
-            valid_values = [value[1] for value in team if (value[1] is not None and value[1] != "DQ")]
-            average = np.mean(valid_values)
-            season_average_value = f"{average:.2f}"
-
-            season_average_list.append([team_name, season_average_value])
-            team_index += 1
-        ordered_average_values = sorted(season_average_list, key=lambda x: float(x[1]), reverse=reverse)
-        index = 0
-        for team in ordered_average_values:
-            ordered_average_values[ordered_average_values.index(team)] = [index, team[0], team[1]]
-            index += 1
-
-        ordered_average_values = CalculateMetrics(None, None, None).resolve_season_average_ties(
-            ordered_average_values, with_percent
-        )
+        # (teams x weeks) array of weekly values with missing weeks, disqualifications, and empty values masked out
+        num_weeks = max((len(team) for team in data), default=0)
+        weekly_values = np.zeros((len(data), num_weeks))
+        weekly_values_mask = np.ones((len(data), num_weeks), dtype=bool)
+        for team_ndx, team in enumerate(data):
+            for week_ndx, week_value in enumerate(team):
+                if week_value[1] is not None and week_value[1] != "DQ":
+                    weekly_values[team_ndx, week_ndx] = week_value[1]
+                    weekly_values_mask[team_ndx, week_ndx] = False
+
+        averages = np.ma.masked_array(weekly_values, mask=weekly_values_mask).mean(axis=1)
+        season_average_values = [
+            MetricValue(round(float(average), 2), "{:.2f}%" if with_percent else "{:.2f}")
+            for average in np.ma.filled(averages, np.nan)
+        ]
+
+        # rank the season averages with tied averages sharing the same place
+        ranking = rank_metric(season_average_values, reverse=reverse)
+        season_averages_by_team_id = {
+            self.team_ids[team_ndx]: season_average_values[team_ndx].with_place(place)
+            for team_ndx, place in zip(ranking.order, ranking.dense_ranks)
+        }
 
         ordered_season_average_list = []
         for ordered_team in getattr(self.report_data, key):
-            for team in ordered_average_values:
-                if ordered_team[1] == team[1]:
-                    if with_percent:
-                        ordered_team[3] = (
-                            f"{float(str(ordered_team[3]).replace('%', '')):.2f}%" if ordered_team[3] != "DQ" else "DQ"
-                        )
-                        value = str(team[2])
-                    elif key == "data_for_scores":
-                        ordered_team[3] = f"{float(str(ordered_team[3])):.2f}"
-                        value = str(team[2])
-                    else:
-                        value = f"{str(team[2])}"
-
-                    if key == "data_for_scores":
-                        ordered_team.insert(-1, value)
-                    elif key == "data_for_coaching_efficiency" and self.break_ties and first_ties:
-                        ordered_team.insert(-2, value)
-                    else:
-                        ordered_team.append(value)
-
-                    ordered_season_average_list.append(ordered_team)
+            if ordered_team.team_id not in season_averages_by_team_id:
+                continue
+            value = season_averages_by_team_id[ordered_team.team_id]
+
+            if key == "data_for_scores":
+                ordered_team.insert(-1, value)
+            elif key == "data_for_coaching_efficiency" and self.break_ties and first_ties:
+                ordered_team.insert(-2, value)
+            else:
+                ordered_team.append(value)
+
+            ordered_season_average_list.append(ordered_team)
 
         return ordered_season_average_list
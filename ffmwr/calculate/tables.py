@@ -0,0 +1,51 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from typing import Any, List, Optional
+
+
+class MetricValue(float):
+    """Numeric metric table value that carries its display format so it is only formatted when the table is rendered.
+
+    Metric values are compared, sorted, and tie-checked numerically, so they are rounded to their displayed precision
+    when they are created.
+    """
+
+    def __new__(cls, value: float, display_format: str = "{:.2f}", place: Optional[int] = None):
+        metric_value = super().__new__(cls, value)
+        metric_value.display_format = display_format
+        # place of the value in its own ranking (such as season averages), displayed alongside the value
+        metric_value.place = place
+        return metric_value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({float(self)!r}, {self.display_format!r}, {self.place!r})"
+
+    def __str__(self) -> str:
+        display_value = self.display_format.format(float(self))
+        if self.place is not None:
+            display_value = f"{display_value} ({self.place})"
+        return display_value
+
+    def __format__(self, format_spec: str) -> str:
+        if not format_spec:
+            return str(self)
+        return format(float(self), format_spec)
+
+    def with_place(self, place: int) -> "MetricValue":
+        return MetricValue(self, self.display_format, place)
+
+
+class MetricTableRow(list):
+    """Metric table row that keeps the id of the team it belongs to, so rows can be matched back to their teams after
+    the table has been sorted, tie-broken, or filtered (team names are not guaranteed to be unique).
+    """
+
+    def __init__(self, team_id: str, values: List[Any]):
+        super().__init__(values)
+        self.team_id: str = team_id
+
+
+def format_metric_table_row(row: List[Any]) -> List[Any]:
+    """Format the typed metric values of a metric table row for display."""
+    return [str(cell) if isinstance(cell, MetricValue) else cell for cell in row]
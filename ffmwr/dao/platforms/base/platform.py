@@ -3,7 +3,6 @@ __email__ = "uberfastman@uberfastman.dev"
 
 import json
 import logging
-import os
 import sys
 from abc import ABC, abstractmethod
 from datetime import datetime
@@ -14,6 +13,7 @@ import requests
 from requests.exceptions import HTTPError
 
 from ffmwr.models.base.model import BaseLeague
+from ffmwr.utilities.files import file_lock
 from ffmwr.utilities.logger import get_logger
 from ffmwr.utilities.settings import AppSettings
 from ffmwr.utilities.utils import format_platform_display
@@ -77,8 +77,7 @@ class BasePlatform(ABC):
         )
 
         # create full directory path if any directories in it do not already exist
-        if not Path(self.league.data_dir).exists():
-            os.makedirs(self.league.data_dir)
+        Path(self.league.data_dir).mkdir(parents=True, exist_ok=True)
 
         self.position_mapping: Dict[str, Dict[str, Any]] = self._get_platform_position_mapping()
         self.league.offensive_positions = [
@@ -189,7 +188,13 @@ class BasePlatform(ABC):
 
         if self.league.save_data:
             logger.debug(f"Saving {self.platform_display} data to {self.league.league_data_file_path}")
-            self.league.save_to_json_file(self.league.league_data_file_path)
+            with file_lock(self.league.league_data_file_path):
+                self.league.save_to_json_file(self.league.league_data_file_path)
+
+        # build position bitmasks, columnar season player data, and team/matchup lookup indices for report calculations
+        self.league.build_position_registry(self.position_mapping)
+        self.league.build_season_player_store()
+        self.league.build_lookup_indices()
 
         delta = datetime.now() - begin
         logger.info(
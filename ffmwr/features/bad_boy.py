@@ -1,12 +1,14 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
-import itertools
 import json
 import re
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import requests
 from bs4 import BeautifulSoup
@@ -14,12 +16,37 @@ from requests.exceptions import ConnectTimeout
 
 from ffmwr.features.base.feature import BaseFeature
 from ffmwr.utilities.constants import nfl_team_abbreviations
+from ffmwr.utilities.files import file_lock, write_json_file_atomically
 from ffmwr.utilities.logger import get_logger
+from ffmwr.utilities.normalization import generate_normalized_player_key
 from ffmwr.utilities.settings import AppSettings, get_app_settings_from_env_file
-from ffmwr.utilities.utils import generate_normalized_player_key
 
 logger = get_logger(__name__, propagate=False)
 
+# the USA Today NFL arrests database only retrieves 20 entries per request
+usa_today_nfl_arrests_page_size: int = 20
+# maximum number of concurrent requests to the USA Today NFL arrests database
+usa_today_nfl_arrests_max_concurrent_requests: int = 8
+# maximum number of attempts to retrieve each page of the USA Today NFL arrests database
+usa_today_nfl_arrests_max_request_attempts: int = 3
+
+
+class AjaxNonce(object):
+    """AJAX nonce shared by concurrent requests, which is refreshed only once when multiple requests using the same
+    nonce fail.
+    """
+
+    def __init__(self, get_nonce: Callable[[], str]):
+        self._get_nonce: Callable[[], str] = get_nonce
+        self._lock: Lock = Lock()
+        self.value: str = get_nonce()
+
+    def refresh(self, expired_value: str) -> str:
+        with self._lock:
+            if self.value == expired_value:
+                self.value = self._get_nonce()
+            return self.value
+
 
 class BadBoyFeature(BaseFeature):
     def __init__(
@@ -74,6 +101,10 @@ class BadBoyFeature(BaseFeature):
 
         self.resource_files_dir = root_dir / "resources" / "files"
 
+        # local database of all arrest records by NFL team, which is shared by the feature data of all weeks and synced
+        # incrementally with the USA Today NFL arrests database
+        self.arrests_data_file_path: Path = data_dir / "feature_data" / "bad_boy_arrests.json"
+
         # Load the scoring based on crime categories
         with open(self.resource_files_dir / "crime_categories.json", mode="r", encoding="utf-8") as crimes:
             self.crime_rankings = json.load(crimes)
@@ -101,11 +132,31 @@ class BadBoyFeature(BaseFeature):
         cdata = re.search("var sitedata = (.*);", soup.find(string=re.compile("CDATA"))).group(1)
         return json.loads(cdata)["ajax_nonce"]
 
-    # noinspection DuplicatedCode
-    def _get_feature_data(self) -> None:
-        logger.debug("Retrieving bad boy feature data from the web.")
+    def _parse_arrest(self, arrest: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "full_name": f"{arrest['First_name']} {arrest['Last_name']}",
+            "team_abbr": (
+                "FA" if (arrest["Team"] == "Free agent" or arrest["Team"] == "Free Agent") else arrest["Team"]
+            ),
+            "date": arrest["Date"],
+            "position": arrest["Position"],
+            "position_type": self.position_types[arrest["Position"]],
+            "case": arrest["Case_1"].upper(),
+            "crime": arrest["Category"].upper(),
+            "description": arrest["Description"],
+            "outcome": arrest["Outcome"],
+        }
 
-        ajax_nonce = self._get_ajax_nonce()
+    def _get_arrests_page(
+        self, team: str, page: int, ajax_nonce: AjaxNonce
+    ) -> Optional[Tuple[List[Dict[str, Any]], int]]:
+        """Retrieve a page of the arrests of an NFL team (sorted by date from newest to oldest) from the USA Today NFL
+        arrests database, refreshing the AJAX nonce and trying again when the request times out.
+
+        Returns the arrest records on the page and the total number of arrests of the NFL team, or None if the page
+        could not be retrieved.
+        """
+        logger.debug(f"Retrieving bad boy feature data page {page} for NFL team: {team}.")
 
         usa_today_nfl_arrest_url = "https://databases.usatoday.com/wp-admin/admin-ajax.php"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
@@ -122,175 +173,293 @@ class BadBoyFeature(BaseFeature):
             'searches={"Last_name":"hill","Team":"SEA","First_name":"leroy"}'
         )
         """
-        arrests = []
-        for ndx, team in enumerate(nfl_team_abbreviations):
-            # the usatoday arrests data uses JAC to abbreviate Jacksonville Jaguars
-            if team == "JAX":
-                team = "JAC"
-
-            logger.debug(f"Retrieving bad boy feature data for NFL team: {team}.")
+        for attempt in range(1, usa_today_nfl_arrests_max_request_attempts + 1):
+            ajax_nonce_value = ajax_nonce.value
+            body = (
+                f"action=cspFetchTable"
+                f"&security={ajax_nonce_value}"
+                f"&pageID=10"
+                f"&sortBy=Date"
+                f"&sortOrder=desc"
+                f"&page={page}"
+                f'&searches={{"Team":"{team}"}}'
+            )
 
             try:
-                page_num = 1
-                body = (
-                    f"action=cspFetchTable"
-                    f"&security={ajax_nonce}"
-                    f"&pageID=10"
-                    f"&sortBy=Date"
-                    f"&sortOrder=desc"
-                    f"&page={page_num}"
-                    f'&searches={{"Team":"{team}"}}'
-                )
-
                 res_json = requests.post(usa_today_nfl_arrest_url, data=body, headers=headers).json()
-
-                arrests_data = res_json["data"]["Result"]
-
-                for arrest in arrests_data:
-                    arrests.append(
-                        {
-                            "full_name": f"{arrest['First_name']} {arrest['Last_name']}",
-                            "team_abbr": (
-                                "FA"
-                                if (arrest["Team"] == "Free agent" or arrest["Team"] == "Free Agent")
-                                else arrest["Team"]
-                            ),
-                            "date": arrest["Date"],
-                            "position": arrest["Position"],
-                            "position_type": self.position_types[arrest["Position"]],
-                            "case": arrest["Case_1"].upper(),
-                            "crime": arrest["Category"].upper(),
-                            "description": arrest["Description"],
-                            "outcome": arrest["Outcome"],
-                        }
-                    )
-
-                total_results = res_json["data"]["totalResults"]
-
-                # the USA Today NFL arrests database only retrieves 20 entries per request
-                if total_results > 20:
-                    # add extra page to include last page of results if they exist
-                    num_pages = (total_results // 20) + (1 if total_results % 20 > 0 else 0)
-
-                    for page in range(2, num_pages + 1):
-                        page_num += 1
-                        body = (
-                            f"action=cspFetchTable"
-                            f"&security={ajax_nonce}"
-                            f"&pageID=10"
-                            f"&sortBy=Date"
-                            f"&sortOrder=desc"
-                            f"&page={page_num}"
-                            f'&searches={{"Team":"{team}"}}'
-                        )
-
-                        r = requests.post(usa_today_nfl_arrest_url, data=body, headers=headers)
-                        resp_json = r.json()
-
-                        arrests_data = resp_json["data"]["Result"]
-
-                        for arrest in arrests_data:
-                            arrests.append(
-                                {
-                                    "full_name": f"{arrest['First_name']} {arrest['Last_name']}",
-                                    "team_abbr": (
-                                        "FA"
-                                        if (arrest["Team"] == "Free agent" or arrest["Team"] == "Free Agent")
-                                        else arrest["Team"]
-                                    ),
-                                    "date": arrest["Date"],
-                                    "position": arrest["Position"],
-                                    "position_type": self.position_types[arrest["Position"]],
-                                    "case": arrest["Case_1"].upper(),
-                                    "crime": arrest["Category"].upper(),
-                                    "description": arrest["Description"],
-                                    "outcome": arrest["Outcome"],
-                                }
-                            )
-
             except ConnectTimeout as e:
                 logger.debug(f"Connection timed out for {self.feature_type_title} feature: {e}")
-                logger.debug(f"Refreshing AJAX nonce and trying again for NFL team {team}.")
-                # refresh the AJAX nonce
-                ajax_nonce = self._get_ajax_nonce()
-                # insert the team for which the AJAX queries timed out back into the list before the next loop
-                nfl_team_abbreviations.insert(ndx + 1, team)
-
-        arrests_by_team = {
-            key: list(group)
-            for key, group in itertools.groupby(sorted(arrests, key=lambda x: x["team_abbr"]), lambda x: x["team_abbr"])
+                logger.debug(f"Refreshing AJAX nonce and trying again for NFL team {team} (attempt {attempt}).")
+                ajax_nonce.refresh(ajax_nonce_value)
+                continue
+
+            return res_json["data"]["Result"], res_json["data"]["totalResults"]
+
+        logger.warning(
+            f"Unable to retrieve {self.feature_type_title} data page {page} for NFL team {team} after "
+            f"{usa_today_nfl_arrests_max_request_attempts} attempts."
+        )
+        return None
+
+    @staticmethod
+    def _get_num_pages(total_results: int) -> int:
+        # include the last page of results if it is partial
+        return (total_results + usa_today_nfl_arrests_page_size - 1) // usa_today_nfl_arrests_page_size
+
+    @staticmethod
+    def _get_arrest_key(arrest: Dict[str, Any]) -> str:
+        return json.dumps(arrest, ensure_ascii=False, sort_keys=True)
+
+    def _sync_team_arrests(
+        self,
+        team: str,
+        first_page: Optional[Tuple[List[Dict[str, Any]], int]],
+        known_team_arrests: List[Dict[str, Any]],
+        ajax_nonce: AjaxNonce,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Add the new arrests of an NFL team to its known arrests from the local arrests database by retrieving pages
+        of its arrests (sorted by date from newest to oldest) until reaching an already known arrest.
+
+        Returns the synced arrests of the NFL team, or None if they do not match the total number of arrests of the NFL
+        team (such as when arrests were edited or removed) or could not be retrieved, in which case all arrests of the
+        NFL team must be retrieved.
+        """
+        if not first_page:
+            return None
+
+        team_arrests, total_results = first_page
+        known_team_arrest_keys = {self._get_arrest_key(arrest) for arrest in known_team_arrests}
+
+        new_team_arrests = []
+        page = 1
+        while True:
+            reached_known_arrests = False
+            for arrest in team_arrests:
+                if self._get_arrest_key(arrest) in known_team_arrest_keys:
+                    reached_known_arrests = True
+                    break
+                new_team_arrests.append(arrest)
+
+            if reached_known_arrests or page >= self._get_num_pages(total_results):
+                break
+
+            page += 1
+            if not (next_page := self._get_arrests_page(team, page, ajax_nonce)):
+                return None
+            team_arrests, _ = next_page
+
+        synced_team_arrests = new_team_arrests + known_team_arrests
+        if len(synced_team_arrests) != total_results:
+            logger.debug(
+                f"Synced {len(synced_team_arrests)} arrests for NFL team {team} do not match the {total_results} "
+                f"arrests in the USA Today NFL arrests database. Retrieving all arrests for NFL team {team}."
+            )
+            return None
+
+        logger.debug(f"Synced {len(new_team_arrests)} new arrests for NFL team {team}.")
+        return synced_team_arrests
+
+    def _load_arrests_data(self) -> Dict[str, Any]:
+        """Load the arrest records of all NFL teams, and the feature data aggregated from them, from the local arrests
+        database.
+        """
+        if not self.arrests_data_file_path.is_file():
+            return {}
+
+        try:
+            with open(self.arrests_data_file_path, "r", encoding="utf-8") as arrests_data_in:
+                return json.load(arrests_data_in)
+        except json.JSONDecodeError:
+            logger.warning(
+                f"Local arrests database {self.arrests_data_file_path} is corrupted. Retrieving all arrests from the "
+                f"USA Today NFL arrests database."
+            )
+            return {}
+
+    def _add_team_arrests(self, team_abbr: str, team_arrests: List[Dict[str, Any]]) -> None:
+        """Add arrests of an NFL team (sorted by date from newest to oldest), which are all newer than the arrests of
+        the NFL team already in the feature data, to the feature data of its players and of its team D/ST.
+        """
+        if not team_arrests:
+            return
+
+        nfl_team: Dict = self.feature_data.setdefault(
+            team_abbr,
+            {
+                "position": "D/ST",
+                "players": {},
+                "offenders": [],
+                "offenders_count": 0,
+                "worst_offense": None,
+                "worst_offense_points": 0,
+                "bad_boy_points_total": 0,
+            },
+        )
+
+        # add arrests from oldest to newest, so players keep the data of their oldest arrest and the team D/ST keeps its
+        # newest worst offense
+        for arrest in reversed(team_arrests):
+            player_arrest = self._parse_arrest(arrest)
+            player_full_name = player_arrest.get("full_name")
+            player_position = player_arrest.get("position")
+            player_position_type = player_arrest.get("position_type")
+            offense_category = str.upper(player_arrest.get("crime"))
+
+            normalized_player_key = generate_normalized_player_key(player_full_name, team_abbr)
+
+            # Add each crime to output categories for generation of crime_categories.new.json file, which can be used to
+            # replace the existing crime_categories.json file. Each new crime categories will default to a score of 0,
+            # and must have its score manually assigned within the json file.
+            self.unique_crime_categories_for_output[offense_category] = self.crime_rankings.get(offense_category, 0)
+
+            # add raw player data json to raw_player_data for reference
+            self.raw_feature_data.setdefault(normalized_player_key, player_arrest)
+
+            if offense_category in self.crime_rankings.keys():
+                offense_points = self.crime_rankings.get(offense_category)
+            else:
+                offense_points = 0
+                logger.warning(f'Crime ranking not found: "{offense_category}". Assigning score of 0.')
+
+            nfl_player = {
+                **self._get_feature_data_template(
+                    player_full_name, team_abbr, player_position, self.position_types[player_position]
+                ),
+                "offenses": [{offense_category: offense_points}],
+                "worst_offense": None,
+                "worst_offense_points": 0,
+                "bad_boy_points_total": offense_points,
+            }
+
+            if offense_points > nfl_player["worst_offense_points"]:
+                # noinspection PyTypeChecker
+                nfl_player["worst_offense"] = offense_category
+                nfl_player["worst_offense_points"] = offense_points
+
+            self.feature_data.setdefault(normalized_player_key, nfl_player)
+
+            # update team DEF entry
+            if player_position_type == "D":
+                nfl_team["players"].setdefault(normalized_player_key, nfl_player)
+                nfl_team["bad_boy_points_total"] += offense_points
+                nfl_team["offenders"] = list(set(nfl_team["offenders"] + [player_full_name]))
+                nfl_team["offenders_count"] = len(nfl_team["offenders"])
+
+                if offense_points > 0 and offense_points >= nfl_team["worst_offense_points"]:
+                    nfl_team["worst_offense"] = offense_category
+                    nfl_team["worst_offense_points"] = offense_points
+
+    def _remove_teams_feature_data(self, team_abbrs: Set[str]) -> None:
+        """Remove the feature data of the players and team D/STs of NFL teams from the feature data."""
+        self.feature_data = {
+            key: data
+            for key, data in self.feature_data.items()
+            if key not in team_abbrs and data.get("team_abbr") not in team_abbrs
+        }
+        self.raw_feature_data = {
+            key: data for key, data in self.raw_feature_data.items() if data.get("team_abbr") not in team_abbrs
         }
 
-        for team_abbr in nfl_team_abbreviations:
-            if team_arrests := arrests_by_team.get(team_abbr):
-                nfl_team: Dict = {
-                    "position": "D/ST",
-                    "players": {},
-                    "offenders": [],
-                    "offenders_count": 0,
-                    "worst_offense": None,
-                    "worst_offense_points": 0,
-                    "bad_boy_points_total": 0,
-                }
+    def _get_feature_data(self) -> None:
+        logger.debug("Retrieving bad boy feature data from the web.")
 
-                for player_arrest in team_arrests:
-                    player_full_name = player_arrest.get("full_name")
-                    player_position = player_arrest.get("position")
-                    player_position_type = player_arrest.get("position_type")
-                    offense_category = str.upper(player_arrest.get("crime"))
-
-                    normalized_player_key = generate_normalized_player_key(player_full_name, team_abbr)
-
-                    # Add each crime to output categories for generation of crime_categories.new.json file, which can
-                    # be used to replace the existing crime_categories.json file. Each new crime categories will default
-                    # to a score of 0, and must have its score manually assigned within the json file.
-                    self.unique_crime_categories_for_output[offense_category] = self.crime_rankings.get(
-                        offense_category, 0
-                    )
-
-                    # add raw player data json to raw_player_data for reference
-                    self.raw_feature_data[normalized_player_key] = player_arrest
-
-                    if offense_category in self.crime_rankings.keys():
-                        offense_points = self.crime_rankings.get(offense_category)
-                    else:
-                        offense_points = 0
-                        logger.warning(f'Crime ranking not found: "{offense_category}". Assigning score of 0.')
-
-                    nfl_player = {
-                        **self._get_feature_data_template(
-                            player_full_name, team_abbr, player_position, self.position_types[player_position]
-                        ),
-                        "offenses": [],
-                        "worst_offense": None,
-                        "worst_offense_points": 0,
-                        "bad_boy_points_total": 0,
-                    }
-
-                    # update player entry
-                    nfl_player["offenses"].append({offense_category: offense_points})
-                    nfl_player["bad_boy_points_total"] += offense_points
-
-                    if offense_points > nfl_player["worst_offense_points"]:
-                        # noinspection PyTypeChecker
-                        nfl_player["worst_offense"] = offense_category
-                        nfl_player["worst_offense_points"] = offense_points
-
-                    self.feature_data[normalized_player_key] = nfl_player
-
-                    # update team DEF entry
-                    if player_position_type == "D":
-                        nfl_team["players"][normalized_player_key] = self.feature_data[normalized_player_key]
-                        nfl_team["bad_boy_points_total"] += offense_points
-                        nfl_team["offenders"].append(player_full_name)
-                        nfl_team["offenders"] = list(set(nfl_team["offenders"]))
-                        nfl_team["offenders_count"] = len(nfl_team["offenders"])
-
-                        if offense_points > nfl_team["worst_offense_points"]:
-                            nfl_team["worst_offense"] = offense_category
-                            nfl_team["worst_offense_points"] = offense_points
-
-                self.feature_data[team_abbr] = nfl_team
+        ajax_nonce = AjaxNonce(self._get_ajax_nonce)
+
+        # the usatoday arrests data uses JAC to abbreviate Jacksonville Jaguars
+        teams = ["JAC" if team == "JAX" else team for team in nfl_team_abbreviations]
+
+        # lock the local arrests database, which is shared by the feature data of all weeks (it is only read if it
+        # exists, and is only locked and updated when saving data)
+        with file_lock(self.arrests_data_file_path) if self.save_data else nullcontext():
+            arrests_data = self._load_arrests_data()
+            known_arrests_by_team: Dict[str, List[Dict[str, Any]]] = arrests_data.get("arrests", {})
+
+            # the feature data aggregated from the known arrests is only updated with the new arrests if it was
+            # aggregated with the current crime rankings, and is otherwise aggregated again from all arrests
+            known_feature_data_is_current = arrests_data.get("crime_rankings") == self.crime_rankings
+            if known_feature_data_is_current:
+                self.feature_data = arrests_data.get("feature_data", {})
+                self.raw_feature_data = arrests_data.get("raw_feature_data", {})
+                self.unique_crime_categories_for_output = arrests_data.get("crime_categories", {})
+
+            with ThreadPoolExecutor(max_workers=usa_today_nfl_arrests_max_concurrent_requests) as executor:
+                # retrieve the first page of arrests of all NFL teams, which includes the total number of arrests
+                first_pages = list(executor.map(lambda team: self._get_arrests_page(team, 1, ajax_nonce), teams))
+
+                # sync the new arrests of NFL teams with known arrests in the local arrests database
+                first_pages_by_team = dict(zip(teams, first_pages))
+                known_teams = [team for team in teams if known_arrests_by_team.get(team)]
+                synced_arrests = executor.map(
+                    lambda team: self._sync_team_arrests(
+                        team, first_pages_by_team[team], known_arrests_by_team[team], ajax_nonce
+                    ),
+                    known_teams,
+                )
+                arrest_records_by_team: Dict[str, Optional[List[Dict[str, Any]]]] = {team: None for team in teams}
+                arrest_records_by_team.update(zip(known_teams, synced_arrests))
+                synced_teams = {team for team in known_teams if arrest_records_by_team[team] is not None}
+
+                # retrieve all remaining pages of arrests of all NFL teams that could not be synced
+                remaining_team_pages = [
+                    (team, page)
+                    for team, first_page in zip(teams, first_pages)
+                    if first_page and arrest_records_by_team[team] is None
+                    for page in range(2, self._get_num_pages(first_page[1]) + 1)
+                ]
+                remaining_pages = executor.map(
+                    lambda team_page: self._get_arrests_page(*team_page, ajax_nonce), remaining_team_pages
+                )
+
+                arrests_pages_by_team: Dict[str, List[Optional[Tuple[List[Dict[str, Any]], int]]]] = {
+                    team: [first_page]
+                    for team, first_page in zip(teams, first_pages)
+                    if first_page and arrest_records_by_team[team] is None
+                }
+                for (team, _), team_arrests_page in zip(remaining_team_pages, remaining_pages):
+                    arrests_pages_by_team[team].append(team_arrests_page)
+
+            retrieved_teams = set()
+            for team, team_arrests_pages in arrests_pages_by_team.items():
+                # keep the known arrests of NFL teams for which not all pages of arrests could be retrieved (partially
+                # retrieved arrests of other NFL teams do not match their total number of arrests and are retrieved
+                # again by the next sync)
+                if all(team_arrests_pages) or not known_arrests_by_team.get(team):
+                    retrieved_teams.add(team)
+                    arrest_records_by_team[team] = [
+                        arrest
+                        for team_arrests_page in team_arrests_pages
+                        if team_arrests_page
+                        for arrest in team_arrests_page[0]
+                    ]
+
+            for team in teams:
+                if arrest_records_by_team[team] is None:
+                    # fall back to the known arrests of NFL teams for which arrests could not be retrieved
+                    arrest_records_by_team[team] = known_arrests_by_team.get(team, [])
+
+            # aggregate all arrests of NFL teams for which all arrests were retrieved, and only add the new arrests of
+            # NFL teams synced with their known arrests to their known feature data
+            aggregated_teams = retrieved_teams if known_feature_data_is_current else set(teams)
+            self._remove_teams_feature_data(aggregated_teams)
+            for team_abbr in nfl_team_abbreviations:
+                if team_arrests := arrest_records_by_team.get(team_abbr):
+                    if team_abbr in aggregated_teams:
+                        self._add_team_arrests(team_abbr, team_arrests)
+                    elif team_abbr in synced_teams:
+                        num_new_team_arrests = len(team_arrests) - len(known_arrests_by_team[team_abbr])
+                        self._add_team_arrests(team_abbr, team_arrests[:num_new_team_arrests])
+
+            if self.save_data:
+                write_json_file_atomically(
+                    self.arrests_data_file_path,
+                    {
+                        "crime_rankings": self.crime_rankings,
+                        "arrests": arrest_records_by_team,
+                        "feature_data": self.feature_data,
+                        "raw_feature_data": self.raw_feature_data,
+                        "crime_categories": self.unique_crime_categories_for_output,
+                    },
+                )
 
     def get_player_bad_boy_crime(
         self, player_first_name: str, player_last_name: str, player_team_abbr: str, player_position: str
@@ -315,9 +484,9 @@ class BadBoyFeature(BaseFeature):
 
     def generate_crime_categories_json(self):
         unique_crimes = OrderedDict(sorted(self.unique_crime_categories_for_output.items(), key=lambda k_v: k_v[0]))
-        with open(self.resource_files_dir / "crime_categories.new.json", mode="w", encoding="utf-8") as crimes:
-            # noinspection PyTypeChecker
-            json.dump(unique_crimes, crimes, ensure_ascii=False, indent=2)
+        crime_categories_file_path = self.resource_files_dir / "crime_categories.new.json"
+        with file_lock(crime_categories_file_path):
+            write_json_file_atomically(crime_categories_file_path, unique_crimes)
 
 
 if __name__ == "__main__":
@@ -8,8 +8,10 @@ from pathlib import Path
 from typing import Any, Dict, Type
 
 from ffmwr.utilities.constants import nfl_team_abbreviation_conversions, nfl_team_abbreviations
+from ffmwr.utilities.files import file_lock
 from ffmwr.utilities.logger import get_logger
-from ffmwr.utilities.utils import FFMWRPythonObjectJson, generate_normalized_player_key
+from ffmwr.utilities.normalization import generate_normalized_player_key
+from ffmwr.utilities.utils import FFMWRPythonObjectJson
 
 logger = get_logger(__name__, propagate=False)
 
@@ -54,13 +56,20 @@ class BaseFeature(ABC, FFMWRPythonObjectJson):
         data_retrieved_from_web = False
         if not self.offline:
             if not self.feature_data_file_path.is_file() or self.refresh:
-                logger.info(f"Retrieving {self.feature_type_title} data from {self.feature_web_base_url}...")
-                # fetch feature data from the web
-                self._get_feature_data()
-                data_retrieved_from_web = True
-
-                if self.save_data:
-                    self._save_feature_data()
+                # lock the feature data file so concurrent report processes sharing the data directory do not download
+                # and save the same feature data at the same time
+                with file_lock(self.feature_data_file_path):
+                    if self._feature_data_saved_since(start):
+                        # reuse feature data saved by another report process while waiting for the lock
+                        self._load_feature_data()
+                    else:
+                        logger.info(f"Retrieving {self.feature_type_title} data from {self.feature_web_base_url}...")
+                        # fetch feature data from the web
+                        self._get_feature_data()
+                        data_retrieved_from_web = True
+
+                        if self.save_data:
+                            self._save_feature_data()
             else:
                 # load saved feature data (must have previously run application with -j flag)
                 self._load_feature_data()
@@ -86,6 +95,11 @@ class BaseFeature(ABC, FFMWRPythonObjectJson):
     def __repr__(self):
         return json.dumps(self.feature_data, indent=2, ensure_ascii=False)
 
+    def _feature_data_saved_since(self, start: datetime) -> bool:
+        if not self.feature_data_file_path.is_file():
+            return False
+        return not self.refresh or datetime.fromtimestamp(self.feature_data_file_path.stat().st_mtime) >= start
+
     def _load_feature_data(self) -> None:
         logger.info(f"Loading saved {self.feature_type_title} data...")
 
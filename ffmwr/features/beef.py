@@ -1,7 +1,6 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
-import json
 from collections import OrderedDict
 from pathlib import Path
 from typing import Dict
@@ -10,9 +9,10 @@ import requests
 
 from ffmwr.features.base.feature import BaseFeature
 from ffmwr.utilities.constants import nfl_team_abbreviation_conversions, nfl_team_abbreviations
+from ffmwr.utilities.files import file_lock, write_json_file_atomically
 from ffmwr.utilities.logger import get_logger
+from ffmwr.utilities.normalization import generate_normalized_player_keys
 from ffmwr.utilities.settings import AppSettings, get_app_settings_from_env_file
-from ffmwr.utilities.utils import generate_normalized_player_key
 
 logger = get_logger(__name__, propagate=False)
 
@@ -91,22 +91,35 @@ class BeefFeature(BaseFeature):
         logger.debug("Retrieving beef feature data from the web.")
 
         nfl_player_data = requests.get(self.feature_web_base_url).json()
-        for player_sleeper_key, player_data_json in nfl_player_data.items():
-            player_full_name = player_data_json.get("full_name", "")
-            player_team_abbr = player_data_json.get("team")
-            player_position = player_data_json.get("position")
-            player_position_type = self.position_types.get(player_position)
 
+        nfl_players = []
+        for player_data_json in nfl_player_data.values():
+            player_team_abbr = player_data_json.get("team")
             if player_team_abbr not in nfl_team_abbreviations:
                 if player_team_abbr in nfl_team_abbreviation_conversions.keys():
                     player_team_abbr = nfl_team_abbreviation_conversions[player_team_abbr]
                 else:
                     player_team_abbr = "?"
+            nfl_players.append((player_data_json, player_team_abbr))
+
+        # normalize the player keys of the entire NFL player catalog in one pass (team defenses are keyed by position)
+        normalized_player_keys = iter(
+            generate_normalized_player_keys(
+                (player_data_json.get("full_name", ""), player_team_abbr)
+                for player_data_json, player_team_abbr in nfl_players
+                if player_data_json.get("position") != "DEF"
+            )
+        )
+
+        for player_data_json, player_team_abbr in nfl_players:
+            player_full_name = player_data_json.get("full_name", "")
+            player_position = player_data_json.get("position")
+            player_position_type = self.position_types.get(player_position)
 
             if player_position == "DEF":
                 normalized_player_key = player_position
             else:
-                normalized_player_key = generate_normalized_player_key(player_full_name, player_team_abbr)
+                normalized_player_key = next(normalized_player_keys)
 
             # add raw player data json to raw_player_data for reference
             self.raw_feature_data[normalized_player_key] = player_data_json
@@ -158,9 +171,9 @@ class BeefFeature(BaseFeature):
 
     def generate_player_info_json(self):
         ordered_player_data = OrderedDict(sorted(self.raw_feature_data.items(), key=lambda k_v: k_v[0]))
-        with open(self.data_dir / f"{self.feature_type_str}_raw.json", mode="w", encoding="utf-8") as player_data:
-            # noinspection PyTypeChecker
-            json.dump(ordered_player_data, player_data, ensure_ascii=False, indent=2)
+        player_data_file_path = self.data_dir / f"{self.feature_type_str}_raw.json"
+        with file_lock(player_data_file_path):
+            write_json_file_atomically(player_data_file_path, ordered_player_data)
 
 
 if __name__ == "__main__":
@@ -4,15 +4,19 @@ __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
 from collections import defaultdict
+from copy import copy
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ffmwr.calculate.playoff_probabilities import PlayoffProbabilities
 from ffmwr.features.bad_boy import BadBoyFeature
 from ffmwr.features.beef import BeefFeature
 from ffmwr.features.high_roller import HighRollerFeature
+from ffmwr.models.base.positions import PositionRegistry
+from ffmwr.models.base.season import SeasonPlayerStore, SeasonRecordTotals
+from ffmwr.utilities.normalization import generate_normalized_player_key
 from ffmwr.utilities.settings import AppSettings
-from ffmwr.utilities.utils import FFMWRPythonObjectJson, generate_normalized_player_key
+from ffmwr.utilities.utils import FFMWRPythonObjectJson
 
 
 class BaseLeague(FFMWRPythonObjectJson):
@@ -84,6 +88,25 @@ class BaseLeague(FFMWRPythonObjectJson):
         self.median_standings: List[BaseTeam] = []
         self.current_median_standings: List[BaseTeam] = []
 
+        # position bitmask registry built from the platform position mapping after league data is fetched
+        self.position_registry: PositionRegistry = PositionRegistry()
+        self.excluded_attributes.append("position_registry")
+        # normalized player keys cached on league players
+        self.excluded_attributes.append("normalized_player_key_cache")
+
+        # columnar season player data built from players_by_week after league data is fetched
+        self.season_player_store: Optional[SeasonPlayerStore] = None
+        self.excluded_attributes.append("season_player_store")
+
+        # cumulative record totals by week built when calculating records
+        self.record_totals_by_week: Dict[str, SeasonRecordTotals] = {}
+        self.excluded_attributes.append("record_totals_by_week")
+
+        # lookup indices built from teams_by_week and matchups_by_week after league data is fetched
+        self.team_ids_by_name: Dict[str, str] = {}
+        self.opponents_by_team_id_by_week: Dict[str, Dict[str, BaseTeam]] = {}
+        self.excluded_attributes.extend(["team_ids_by_name", "opponents_by_team_id_by_week"])
+
         # TODO: find better pattern for player points retrieval instead of passing around a class method object
         # self.player_data_by_week_function: Optional[Callable] = None
         # self.player_data_by_week_key: Optional[str] = None
@@ -92,6 +115,68 @@ class BaseLeague(FFMWRPythonObjectJson):
     # def get_player_data_by_week(self, player_id: str, week: int = None) -> Any:
     #     return getattr(self.player_data_by_week_function(player_id, week), self.player_data_by_week_key)
 
+    def build_position_registry(self, position_mapping: Dict[str, Dict[str, Any]]) -> PositionRegistry:
+        self.position_registry = PositionRegistry.from_position_mapping(position_mapping)
+        return self.position_registry
+
+    def build_season_player_store(self) -> SeasonPlayerStore:
+        self.season_player_store = SeasonPlayerStore.from_league(self)
+        return self.season_player_store
+
+    def build_lookup_indices(self) -> None:
+        self.team_ids_by_name = {}
+        # iterate weeks in order so team names from later weeks (including the week for the report) take precedence
+        for week in sorted(self.teams_by_week.keys(), key=int):
+            for team_id, team in self.teams_by_week[week].items():
+                self.team_ids_by_name[team.name] = str(team_id)
+
+        self.opponents_by_team_id_by_week = {}
+        for week, matchups in self.matchups_by_week.items():
+            weekly_teams = self.teams_by_week.get(week, {})
+            opponents_by_team_id = {}
+            matchup: BaseMatchup
+            for matchup in matchups:
+                for ndx, team in enumerate(matchup.teams):
+                    opponent: BaseTeam = matchup.teams[1 - ndx]
+                    opponents_by_team_id[str(team.team_id)] = weekly_teams.get(str(opponent.team_id), opponent)
+            self.opponents_by_team_id_by_week[week] = opponents_by_team_id
+
+    def get_week_league(self, week: int) -> BaseLeague:
+        """Get a shallow copy of the league with only the weekly data needed to calculate the report data of the given
+        week (its teams, players, records, and matchups, and the matchups remaining after the week for the report when
+        it is the week for the report, since they are only used to simulate playoff probabilities for that week), so it
+        can be sent to another process without the data of every other week of the season.
+        """
+        week_league = copy(self)
+        week_league.teams_by_week = {str(week): self.teams_by_week[str(week)]}
+        week_league.players_by_week = {str(week): self.players_by_week.get(str(week), {})}
+        week_league.records_by_week = {str(week): self.records_by_week[str(week)]}
+        week_league.matchups_by_week = {
+            matchup_week: matchups
+            for matchup_week, matchups in self.matchups_by_week.items()
+            if int(matchup_week) == int(week)
+            or (int(week) == self.week_for_report and int(matchup_week) > self.week_for_report)
+        }
+        week_league.record_totals_by_week = {}
+        week_league.season_player_store = None
+        week_league.team_ids_by_name = {}
+        week_league.opponents_by_team_id_by_week = {}
+        return week_league
+
+    def get_team_by_name(self, team_name: str, week: int) -> Optional[BaseTeam]:
+        if not self.team_ids_by_name:
+            self.build_lookup_indices()
+
+        if (team_id := self.team_ids_by_name.get(team_name)) is not None:
+            return self.teams_by_week.get(str(week), {}).get(team_id)
+        return None
+
+    def get_opponent_by_team_id(self, team_id: str, week: int) -> Optional[BaseTeam]:
+        if not self.opponents_by_team_id_by_week:
+            self.build_lookup_indices()
+
+        return self.opponents_by_team_id_by_week.get(str(week), {}).get(str(team_id))
+
     def get_custom_weekly_matchups(self, week_for_report: int) -> List[Dict[str, Dict[str, Any]]]:
         """
         get weekly matchup data
@@ -147,11 +232,8 @@ class BaseLeague(FFMWRPythonObjectJson):
 
             teams = {}
             team: BaseTeam
-            for team in matchup.teams:
-                if matchup.teams.index(team) == 0:
-                    opponent: BaseTeam = matchup.teams[1]
-                else:
-                    opponent: BaseTeam = matchup.teams[0]
+            for ndx, team in enumerate(matchup.teams):
+                opponent: BaseTeam = matchup.teams[1 - ndx]
 
                 teams[str(team.team_id)] = {
                     "result": "T" if is_tied else "W" if team.team_id == winning_team else "L",
@@ -165,6 +247,14 @@ class BaseLeague(FFMWRPythonObjectJson):
             matchup_list.append(teams)
         return matchup_list
 
+    def update_standings(self, week: int) -> None:
+        """Order the teams for the given week by their record rank (and then by points for) as the league standings."""
+        week_records = self.records_by_week[str(week)]
+        self.standings = sorted(
+            self.teams_by_week.get(str(week)).values(),
+            key=lambda x: (week_records[x.team_id].rank, -week_records[x.team_id].get_points_for()),
+        )
+
     def get_flex_positions_dict(self) -> Dict[str, List[str]]:
         return {
             "FLEX_RB_WR": self.flex_positions_rb_wr,
@@ -641,8 +731,17 @@ class BasePlayer(FFMWRPythonObjectJson):
         self.high_roller_worst_violation_fine: float = 0.0
         self.high_roller_num_violators: int = 0
 
+        # normalized player key cached with the (full name, NFL team abbreviation) pair from which it was generated
+        self.normalized_player_key_cache: Optional[Tuple[Tuple[str, str], str]] = None
+
     def get_normalized_player_key(self) -> str:
-        return generate_normalized_player_key(self.full_name, self.nfl_team_abbr)
+        player_name_and_team = (self.full_name, self.nfl_team_abbr)
+        if self.normalized_player_key_cache is None or self.normalized_player_key_cache[0] != player_name_and_team:
+            self.normalized_player_key_cache = (
+                player_name_and_team,
+                generate_normalized_player_key(*player_name_and_team),
+            )
+        return self.normalized_player_key_cache[1]
 
 
 class BaseStat(FFMWRPythonObjectJson):
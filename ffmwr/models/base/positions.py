@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from typing import Any, Dict, Iterable, List
+
+
+class PositionRegistry(object):
+    """Registry of fantasy football positions that assigns each position a bit, so sets of positions (such as player
+    eligible positions or the positions accepted by a roster slot) can be stored as integer bitmasks and compared with
+    bitwise operations.
+
+    Positions that are not already registered (such as platform positions missing from the position mapping) are
+    assigned the next available bit when they are first encountered.
+    """
+
+    def __init__(self, positions: Iterable[str] = ()):
+        self.position_bits: Dict[str, int] = {}
+        for position in positions:
+            self.get_position_bit(position)
+
+    @classmethod
+    def from_position_mapping(cls, position_mapping: Dict[str, Dict[str, Any]]) -> PositionRegistry:
+        """Create a position registry from the base positions (and flex positions) of a platform position mapping."""
+        positions: List[str] = []
+        for pos_attributes in position_mapping.values():
+            positions.append(pos_attributes.get("base"))
+            positions.extend(pos_attributes.get("positions", []))
+        return cls(positions)
+
+    def get_position_bit(self, position: str) -> int:
+        position_bit = self.position_bits.get(position)
+        if position_bit is None:
+            position_bit = 1 << len(self.position_bits)
+            self.position_bits[position] = position_bit
+        return position_bit
+
+    def get_positions_mask(self, positions: Iterable[str]) -> int:
+        positions_mask = 0
+        for position in positions:
+            positions_mask |= self.get_position_bit(position)
+        return positions_mask
+
+    def get_slot_mask(self, slot_position: str, flex_positions_dict: Dict[str, List[str]]) -> int:
+        """Get the bitmask of the positions accepted by a roster slot, which are the slot position itself and, for flex
+        slots, the positions of the flex.
+        """
+        return self.get_position_bit(slot_position) | self.get_positions_mask(
+            flex_positions_dict.get(slot_position, [])
+        )
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from copy import copy
+from statistics import mean
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ffmwr.models.base.model import BaseLeague, BaseRecord
+
+
+class SeasonPlayerStore(object):
+    """Columnar store of per-player weekly data for a league season, indexed by (player, week).
+
+    Numeric columns use NaN for player weeks in which the player was not on a fantasy roster, and categorical columns
+    (selected position and fantasy team) are stored as integer codes into their respective label lists, with -1 for
+    player weeks in which the player was not on a fantasy roster.
+    """
+
+    def __init__(self, player_ids: List[str], weeks: List[int], positions: List[str], team_ids: List[str]):
+        self.player_ids: List[str] = player_ids
+        self.player_index: Dict[str, int] = {player_id: ndx for ndx, player_id in enumerate(player_ids)}
+        self.weeks: List[int] = weeks
+        self.week_index: Dict[int, int] = {week: ndx for ndx, week in enumerate(weeks)}
+        self.positions: List[str] = positions
+        self.position_index: Dict[str, int] = {position: ndx for ndx, position in enumerate(positions)}
+        self.team_ids: List[str] = team_ids
+        self.team_index: Dict[str, int] = {team_id: ndx for ndx, team_id in enumerate(team_ids)}
+
+        shape = (len(player_ids), len(weeks))
+        self.points: np.ndarray = np.full(shape, np.nan, dtype=np.float64)
+        self.projected_points: np.ndarray = np.full(shape, np.nan, dtype=np.float64)
+        self.selected_positions: np.ndarray = np.full(shape, -1, dtype=np.int16)
+        self.teams: np.ndarray = np.full(shape, -1, dtype=np.int16)
+
+        # player season points indices by week (see get_player_season_points_index)
+        self.player_season_points_index_by_week: Dict[int, Dict[str, Tuple[float, float]]] = {}
+
+    @classmethod
+    def from_league(cls, league: BaseLeague) -> SeasonPlayerStore:
+        weeks = sorted(int(week) for week in league.players_by_week.keys())
+
+        player_ids = {}
+        positions = {}
+        team_ids = {}
+        player_teams_by_week = {}
+        for week in weeks:
+            player_teams = {}
+            for team_id, team in league.teams_by_week.get(str(week), {}).items():
+                team_ids.setdefault(str(team_id), None)
+                for player in team.roster:
+                    player_teams[str(player.player_id)] = str(team_id)
+            player_teams_by_week[week] = player_teams
+
+            for player in league.players_by_week[str(week)].values():
+                player_ids.setdefault(str(player.player_id), None)
+                positions.setdefault(player.selected_position, None)
+
+        store = cls(list(player_ids.keys()), weeks, list(positions.keys()), list(team_ids.keys()))
+
+        for week_ndx, week in enumerate(weeks):
+            player_teams = player_teams_by_week[week]
+            for player in league.players_by_week[str(week)].values():
+                player_ndx = store.player_index[str(player.player_id)]
+                store.points[player_ndx, week_ndx] = player.points
+                if player.projected_points is not None:
+                    store.projected_points[player_ndx, week_ndx] = player.projected_points
+                store.selected_positions[player_ndx, week_ndx] = store.position_index[player.selected_position]
+                if (team_id := player_teams.get(str(player.player_id))) is not None:
+                    store.teams[player_ndx, week_ndx] = store.team_index[team_id]
+
+        return store
+
+    @property
+    def rostered(self) -> np.ndarray:
+        """Boolean (player, week) mask of player weeks in which the player was on a fantasy roster."""
+        return self.selected_positions >= 0
+
+    def _get_week_slice(self, start_week: Optional[int], end_week: Optional[int]) -> slice:
+        start = 0 if start_week is None else int(np.searchsorted(self.weeks, start_week, side="left"))
+        end = len(self.weeks) if end_week is None else int(np.searchsorted(self.weeks, end_week, side="right"))
+        return slice(start, end)
+
+    def get_player_weekly_points(
+        self, player_id: str, start_week: Optional[int] = None, end_week: Optional[int] = None
+    ) -> np.ndarray:
+        """Return the points of every rostered week of the player between start_week and end_week (inclusive)."""
+        player_ndx = self.player_index.get(str(player_id))
+        if player_ndx is None:
+            return np.empty(0, dtype=np.float64)
+
+        week_slice = self._get_week_slice(start_week, end_week)
+        weekly_points = self.points[player_ndx, week_slice]
+        return weekly_points[self.rostered[player_ndx, week_slice]]
+
+    def get_player_weekly_projected_points(
+        self, player_id: str, start_week: Optional[int] = None, end_week: Optional[int] = None
+    ) -> np.ndarray:
+        """Return the projected points of every rostered week of the player between start_week and end_week."""
+        player_ndx = self.player_index.get(str(player_id))
+        if player_ndx is None:
+            return np.empty(0, dtype=np.float64)
+
+        week_slice = self._get_week_slice(start_week, end_week)
+        weekly_projected_points = self.projected_points[player_ndx, week_slice]
+        return weekly_projected_points[~np.isnan(weekly_projected_points)]
+
+    def get_player_season_points_index(self, week: int) -> Dict[str, Tuple[float, float]]:
+        """Return the points of the last rostered week (through the given week) of every player and their season
+        average points in the rostered weeks before it by player id, which is built once per week.
+        """
+        week = int(week)
+        player_season_points_index = self.player_season_points_index_by_week.get(week)
+        if player_season_points_index is None:
+            week_slice = self._get_week_slice(None, week)
+            rostered = self.rostered[:, week_slice]
+
+            player_season_points_index = {}
+            for player_ndx in np.flatnonzero(rostered.any(axis=1)):
+                player_season_weekly_points = self.points[player_ndx, week_slice][rostered[player_ndx]].tolist()
+                # handle the beginning of the season when a player has only played one game
+                if len(player_season_weekly_points) == 1:
+                    player_season_avg_points = player_season_weekly_points[0]
+                else:
+                    player_season_avg_points = mean(player_season_weekly_points[:-1])
+
+                player_season_points_index[self.player_ids[player_ndx]] = (
+                    player_season_weekly_points[-1],
+                    player_season_avg_points,
+                )
+
+            self.player_season_points_index_by_week[week] = player_season_points_index
+
+        return player_season_points_index
+
+    def get_week_points(self, week: int) -> np.ndarray:
+        """Return the points column of all players for the week (NaN for players not rostered that week)."""
+        return self.points[:, self.week_index[int(week)]]
+
+
+class SeasonRecordTotals(object):
+    """Cumulative record totals (wins, losses, ties, points, and streaks, overall and within divisions) of the teams in
+    a league season as of a given week, stored as arrays indexed by team.
+
+    Streak types are stored as integer codes into the streak_types list, with 0 for teams that do not have a streak.
+    """
+
+    streak_types: List[Optional[str]] = [None, "W", "L", "T"]
+
+    def __init__(self, team_ids: List[str]):
+        self.team_ids: List[str] = [str(team_id) for team_id in team_ids]
+        self.team_index: Dict[str, int] = {team_id: ndx for ndx, team_id in enumerate(self.team_ids)}
+
+        num_teams = len(self.team_ids)
+        self.wins: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+        self.ties: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+        self.losses: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+        self.points_for: np.ndarray = np.zeros(num_teams, dtype=np.float64)
+        self.points_against: np.ndarray = np.zeros(num_teams, dtype=np.float64)
+        self.streak_type_codes: np.ndarray = np.zeros(num_teams, dtype=np.int8)
+        self.streak_lengths: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+
+        self.division_wins: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+        self.division_ties: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+        self.division_losses: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+        self.division_points_for: np.ndarray = np.zeros(num_teams, dtype=np.float64)
+        self.division_points_against: np.ndarray = np.zeros(num_teams, dtype=np.float64)
+        self.division_streak_type_codes: np.ndarray = np.zeros(num_teams, dtype=np.int8)
+        self.division_streak_lengths: np.ndarray = np.zeros(num_teams, dtype=np.int64)
+
+    @classmethod
+    def from_records(cls, records: Dict[str, BaseRecord]) -> SeasonRecordTotals:
+        """Create the record totals from existing team records (keyed by team id)."""
+        totals = cls(list(records.keys()))
+
+        for ndx, record in enumerate(records.values()):
+            totals.wins[ndx] = record.get_wins()
+            totals.ties[ndx] = record.get_ties()
+            totals.losses[ndx] = record.get_losses()
+            totals.points_for[ndx] = record.get_points_for()
+            totals.points_against[ndx] = record.get_points_against()
+            totals.streak_type_codes[ndx] = cls.streak_types.index(record.get_streak_type())
+            totals.streak_lengths[ndx] = record.get_streak_length() or 0
+
+            totals.division_wins[ndx] = record.get_division_wins()
+            totals.division_ties[ndx] = record.get_division_ties()
+            totals.division_losses[ndx] = record.get_division_losses()
+            totals.division_points_for[ndx] = record.get_division_points_for()
+            totals.division_points_against[ndx] = record.get_division_points_against()
+            totals.division_streak_type_codes[ndx] = cls.streak_types.index(record.get_division_streak_type())
+            totals.division_streak_lengths[ndx] = record.get_division_streak_length() or 0
+
+        return totals
+
+    def copy(self) -> SeasonRecordTotals:
+        totals = copy(self)
+        for attribute, value in vars(self).items():
+            if isinstance(value, np.ndarray):
+                setattr(totals, attribute, value.copy())
+        return totals
+
+    def add_week_results(self, custom_weekly_matchups: List[Dict[str, Dict[str, Any]]]) -> np.ndarray:
+        """Add the results of the weekly matchups (in the format returned by BaseLeague.get_custom_weekly_matchups) to
+        the totals and return a boolean mask of the teams that had a result for the week.
+        """
+        num_teams = len(self.team_ids)
+        result_codes = np.zeros(num_teams, dtype=np.int8)
+        is_division = np.zeros(num_teams, dtype=bool)
+        points_for = np.zeros(num_teams, dtype=np.float64)
+        points_against = np.zeros(num_teams, dtype=np.float64)
+
+        for matchup in custom_weekly_matchups:
+            for team_id, matchup_result in matchup.items():
+                ndx = self.team_index.get(str(team_id))
+                if ndx is None:
+                    continue
+                outcome = matchup_result["result"]
+                # any result other than a win or a loss is counted as a tie
+                result_codes[ndx] = self.streak_types.index(outcome if outcome in ("W", "L") else "T")
+                is_division[ndx] = bool(matchup_result["division"])
+                points_for[ndx] = matchup_result["points_for"]
+                points_against[ndx] = matchup_result["points_against"]
+
+        has_result = result_codes > 0
+        is_division &= has_result
+
+        self.wins += result_codes == 1
+        self.losses += result_codes == 2
+        self.ties += result_codes == 3
+        self.points_for[has_result] += points_for[has_result]
+        self.points_against[has_result] += points_against[has_result]
+        self.streak_lengths[has_result] = np.where(
+            self.streak_type_codes[has_result] == result_codes[has_result], self.streak_lengths[has_result] + 1, 1
+        )
+        self.streak_type_codes[has_result] = result_codes[has_result]
+
+        self.division_wins += is_division & (result_codes == 1)
+        self.division_losses += is_division & (result_codes == 2)
+        self.division_ties += is_division & (result_codes == 3)
+        self.division_points_for[is_division] += points_for[is_division]
+        self.division_points_against[is_division] += points_against[is_division]
+        self.division_streak_lengths[is_division] = np.where(
+            self.division_streak_type_codes[is_division] == result_codes[is_division],
+            self.division_streak_lengths[is_division] + 1,
+            1,
+        )
+        self.division_streak_type_codes[is_division] = result_codes[is_division]
+
+        return has_result
@@ -3,19 +3,27 @@ __email__ = "uberfastman@uberfastman.dev"
 
 import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from pickle import PicklingError
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
 from ffmwr.calculate.coaching_efficiency import CoachingEfficiency
+from ffmwr.calculate.decision_quality import DecisionQuality
 from ffmwr.calculate.metrics import CalculateMetrics
+from ffmwr.calculate.optimal_manager import OptimalManagerBacktest
 from ffmwr.calculate.points_by_position import PointsByPosition
 from ffmwr.calculate.season_averages import SeasonAverageCalculator
+from ffmwr.calculate.tables import MetricValue
 from ffmwr.dao.platforms.base.platform import BasePlatform
 from ffmwr.models.base.model import BaseLeague, BaseTeam
+from ffmwr.report.cache import WeeklyReportDataCache
 from ffmwr.report.data import ReportData
+from ffmwr.report.export import MetricsDataExporter
 from ffmwr.report.pdf.generator import PdfGenerator
-from ffmwr.utilities.app import patch_http_connection_pool, platform_data_factory
+from ffmwr.utilities.app import get_inactive_players, patch_http_connection_pool, platform_data_factory
 from ffmwr.utilities.logger import get_logger
 from ffmwr.utilities.settings import AppSettings
 from ffmwr.utilities.utils import format_platform_display
@@ -23,6 +31,108 @@ from ffmwr.utilities.utils import format_platform_display
 logger = get_logger(__name__, propagate=False)
 
 
+class ReportDataCalculator(object):
+    """Calculator of the report data of any week of the season from the inputs shared by all weeks of the report, which
+    is everything the weekly report data worker processes need besides the league data and metrics of each week.
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        league_id: str,
+        season: int,
+        coaching_efficiency: CoachingEfficiency,
+        playoff_prob_sims: Optional[int],
+        playoff_probs,
+        bad_boy_stats,
+        beef_stats,
+        high_roller_stats,
+        break_ties: bool = False,
+        dq_ce: bool = False,
+        testing: bool = False,
+    ):
+        self.settings: AppSettings = settings
+        self.league_id: str = league_id
+        self.season: int = season
+        self.coaching_efficiency: CoachingEfficiency = coaching_efficiency
+        self.playoff_prob_sims: Optional[int] = playoff_prob_sims
+        self.playoff_probs = playoff_probs
+        self.bad_boy_stats = bad_boy_stats
+        self.beef_stats = beef_stats
+        self.high_roller_stats = high_roller_stats
+        self.break_ties: bool = break_ties
+        self.dq_ce: bool = dq_ce
+        self.testing: bool = testing
+
+    def get_report_data(
+        self,
+        league: BaseLeague,
+        week_counter: int,
+        luck_results: Optional[Dict[str, Dict[str, Any]]],
+        z_scores: Dict[str, Optional[float]],
+        inactive_players: Optional[FrozenSet[str]],
+    ) -> ReportData:
+        """Calculate the report data for the given week from the league (or a league with only the data of the week,
+        see BaseLeague.get_week_league), and the luck (calculated for the week when not given), z-scores, and inactive
+        players of the week. The records and standings of all weeks up to the week for the report must already be
+        calculated.
+
+        The report data of a week can be calculated any number of times, since it only updates the teams of the week
+        with values that are calculated from the same inputs each time.
+        """
+        metrics_calculator = CalculateMetrics(self.league_id, league.num_playoff_slots, self.playoff_prob_sims)
+
+        return ReportData(
+            settings=self.settings,
+            league=league,
+            week_counter=week_counter,
+            week_for_report=league.week_for_report,
+            season=self.season,
+            metrics_calculator=metrics_calculator,
+            metrics={
+                "coaching_efficiency": self.coaching_efficiency,
+                "luck": (
+                    luck_results
+                    or metrics_calculator.calculate_luck(
+                        week_counter, league, league.get_custom_weekly_matchups(week_counter)
+                    )
+                ),
+                "records": league.records_by_week[str(week_counter)],
+                "z_scores": z_scores,
+                "playoff_probs": self.playoff_probs,
+                "bad_boy_stats": self.bad_boy_stats,
+                "beef_stats": self.beef_stats,
+                "high_roller_stats": self.high_roller_stats,
+            },
+            break_ties=self.break_ties,
+            dq_ce=self.dq_ce,
+            testing=self.testing,
+            inactive_players=inactive_players,
+        )
+
+
+# league, week, luck results, z-scores, and inactive players of a week used to calculate its report data
+WeeklyReportDataInputs = Tuple[
+    BaseLeague, int, Optional[Dict[str, Dict[str, Any]]], Dict[str, Optional[float]], Optional[FrozenSet[str]]
+]
+
+# report data calculator used by the weekly report data worker processes (set once per process by the process pool
+# initializer)
+_worker_report_data_calculator: Optional[ReportDataCalculator] = None
+
+
+def _initialize_report_data_worker(report_data_calculator: ReportDataCalculator) -> None:
+    global _worker_report_data_calculator
+    _worker_report_data_calculator = report_data_calculator
+
+
+def _get_worker_weekly_summary(week_inputs: WeeklyReportDataInputs) -> Dict[str, Any]:
+    week_league, week, luck_results, z_scores, inactive_players = week_inputs
+    return _worker_report_data_calculator.get_report_data(
+        week_league, week, luck_results, z_scores, inactive_players
+    ).get_weekly_summary(week)
+
+
 class FantasyFootballReport(object):
     def __init__(
         self,
@@ -99,6 +209,9 @@ class FantasyFootballReport(object):
 
         self.league: BaseLeague = platform_data.league
 
+        # coaching efficiency built once from the roster settings of the league and used for every week of the report
+        self.coaching_efficiency: CoachingEfficiency = CoachingEfficiency(self.league)
+
         if self.league.num_playoff_slots > 0:
             self.playoff_probs = self.league.get_playoff_probs(
                 self.playoff_prob_sims, self.save_data, self.offline, recalculate=True
@@ -126,17 +239,116 @@ class FantasyFootballReport(object):
         else:
             self.high_roller_stats = None
 
+        # luck of all calculated weeks of the season, calculated at once when creating the report
+        self.season_luck_results: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        # z-scores of all weeks of the season, calculated in a single pass when creating the report
+        self.season_z_scores: Dict[int, Dict[str, Optional[float]]] = {}
+        # inactive players of all calculated weeks of the season, retrieved before calculating the weekly report data
+        self.inactive_players_by_week: Dict[int, FrozenSet[str]] = {}
+
         # output league info for verification
         logger.info(
             f"...setup complete for "
             f'"{self.league.name.upper()}" ({self.league_id}) week {self.league.week_for_report} report.'
         )
 
+    def _get_season_weekly_teams_results(self, end_week: int) -> List[Dict[str, BaseTeam]]:
+        return [
+            {team.team_id: team for team in self.league.teams_by_week.get(str(week)).values()}
+            for week in range(self.league.start_week, end_week + 1)
+        ]
+
+    def _get_report_data_calculator(self) -> ReportDataCalculator:
+        return ReportDataCalculator(
+            settings=self.settings,
+            league_id=self.league_id,
+            season=self.season,
+            coaching_efficiency=self.coaching_efficiency,
+            playoff_prob_sims=self.playoff_prob_sims,
+            playoff_probs=self.playoff_probs,
+            bad_boy_stats=self.bad_boy_stats,
+            beef_stats=self.beef_stats,
+            high_roller_stats=self.high_roller_stats,
+            break_ties=self.break_ties,
+            dq_ce=self.dq_ce,
+            testing=self.test,
+        )
+
+    def _get_week_inputs(self, week: int, league: BaseLeague) -> WeeklyReportDataInputs:
+        return (
+            league,
+            week,
+            self.season_luck_results.get(week),
+            self.season_z_scores[week],
+            self.inactive_players_by_week.get(week),
+        )
+
+    def calculate_season_z_scores(self) -> Dict[int, Dict[str, Optional[float]]]:
+        """Calculate the z-scores of every week of the season through the week for the report in a single pass."""
+        self.season_z_scores = dict(
+            zip(
+                range(self.league.start_week, self.league.week_for_report + 1),
+                CalculateMetrics.calculate_season_z_scores(
+                    self._get_season_weekly_teams_results(self.league.week_for_report)
+                ),
+            )
+        )
+        return self.season_z_scores
+
+    def get_report_data(self, week_counter: int) -> ReportData:
+        """Calculate the report data for the given week. The records and standings of all weeks up to the week for the
+        report must already be calculated.
+        """
+        if week_counter not in self.season_z_scores:
+            self.calculate_season_z_scores()
+
+        return self._get_report_data_calculator().get_report_data(*self._get_week_inputs(week_counter, self.league))
+
+    def _get_weekly_summaries(self, weeks: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Calculate the report data summaries of the given weeks across a process pool, falling back to calculating
+        them sequentially when there are not enough weeks or cores, or the report data inputs cannot be sent to worker
+        processes.
+
+        The inputs shared by all weeks are sent to each worker process once, and each week is sent with a copy of the
+        league that only holds the data of that week. Worker processes only return the weekly summaries, so any changes
+        they make to their copies of the league are discarded, and everything they need that is fetched from the web
+        (such as inactive players) must already be retrieved by the report.
+        """
+        report_data_calculator = self._get_report_data_calculator()
+
+        max_workers = min(len(weeks), os.cpu_count() or 1)
+        if max_workers > 1:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_initialize_report_data_worker,
+                    initargs=(report_data_calculator,),
+                ) as executor:
+                    return dict(
+                        zip(
+                            weeks,
+                            executor.map(
+                                _get_worker_weekly_summary,
+                                [self._get_week_inputs(week, self.league.get_week_league(week)) for week in weeks],
+                            ),
+                        )
+                    )
+            except (BrokenProcessPool, PicklingError) as e:
+                logger.warning(
+                    f"Unable to calculate weekly report data in parallel ({repr(e)}). Calculating it sequentially..."
+                )
+
+        return {
+            week: report_data_calculator.get_report_data(*self._get_week_inputs(week, self.league)).get_weekly_summary(
+                week
+            )
+            for week in weeks
+        }
+
     def create_pdf_report(self) -> Path:
         logger.debug("Creating fantasy football report PDF.")
 
-        report_data = None
-
+        week_for_report_ordered_team_ids = []
         week_for_report_ordered_team_names = []
         week_for_report_ordered_managers = []
 
@@ -152,68 +364,76 @@ class FantasyFootballReport(object):
         season_weekly_top_scorers = []
         season_weekly_low_scorers = []
         season_weekly_highest_ce = []
-        season_weekly_teams_results = []
 
-        week_counter = self.league.start_week
-        while week_counter <= self.league.week_for_report:
-            week_for_report = self.league.week_for_report
-            metrics_calculator = CalculateMetrics(self.league_id, self.league.num_playoff_slots, self.playoff_prob_sims)
+        week_for_report = self.league.week_for_report
+        weekly_report_data_cache = WeeklyReportDataCache(
+            self.league,
+            self.break_ties,
+            self.dq_ce,
+            self.settings.coaching_efficiency_disqualified_teams_list,
+            self.save_data,
+        )
 
+        # first pass: calculate the cumulative records and standings in week order, since each week depends on the
+        # previous weeks, retrieve the inactive players of every week (used to disqualify coaching efficiency), and load
+        # the saved summaries of previous weeks that have not changed since the last report
+        self.inactive_players_by_week = {}
+        custom_weekly_matchups_by_week = {}
+        week_input_hashes = {}
+        weekly_summaries = {}
+        week_input_hash = None
+        for week_counter in range(self.league.start_week, week_for_report + 1):
+            metrics_calculator = CalculateMetrics(self.league_id, self.league.num_playoff_slots, self.playoff_prob_sims)
             custom_weekly_matchups = self.league.get_custom_weekly_matchups(week_counter)
+            custom_weekly_matchups_by_week[week_counter] = custom_weekly_matchups
+
+            metrics_calculator.calculate_records(week_counter, self.league, custom_weekly_matchups)
+            self.league.update_standings(week_counter)
 
-            report_data = ReportData(
-                settings=self.settings,
-                league=self.league,
-                season_weekly_teams_results=season_weekly_teams_results,
-                week_counter=week_counter,
-                week_for_report=week_for_report,
-                season=self.season,
-                metrics_calculator=metrics_calculator,
-                metrics={
-                    "coaching_efficiency": CoachingEfficiency(self.league),
-                    "luck": metrics_calculator.calculate_luck(week_counter, self.league, custom_weekly_matchups),
-                    "records": metrics_calculator.calculate_records(week_counter, self.league, custom_weekly_matchups),
-                    "playoff_probs": self.playoff_probs,
-                    "bad_boy_stats": self.bad_boy_stats,
-                    "beef_stats": self.beef_stats,
-                    "high_roller_stats": self.high_roller_stats,
-                },
-                break_ties=self.break_ties,
-                dq_ce=self.dq_ce,
-                testing=self.test,
+            team: BaseTeam
+            for team in self.league.teams_by_week.get(str(week_counter)).values():
+                team.name = metrics_calculator.decode_byte_string(team.name)
+
+            if self.dq_ce:
+                self.inactive_players_by_week[week_counter] = get_inactive_players(week_counter, self.league)
+
+            week_input_hash = weekly_report_data_cache.get_week_input_hash(
+                week_counter, custom_weekly_matchups, self.inactive_players_by_week.get(week_counter), week_input_hash
             )
+            week_input_hashes[week_counter] = week_input_hash
 
-            for team_id, team_result in report_data.teams_results.items():
-                for weekly_team_points_by_position in report_data.data_for_weekly_points_by_position:
-                    if weekly_team_points_by_position[0] == team_id:
-                        season_avg_points_by_position[team_id].append(weekly_team_points_by_position[1])
-
-            top_scorer = {
-                "week": week_counter,
-                "team": report_data.data_for_scores[0][1],
-                "manager": report_data.data_for_scores[0][2],
-                "score": report_data.data_for_scores[0][3],
-            }
-            season_weekly_top_scorers.append(top_scorer)
-
-            low_scorer = {
-                "week": week_counter,
-                "team": report_data.data_for_scores[-1][1],
-                "manager": report_data.data_for_scores[-1][2],
-                "score": report_data.data_for_scores[-1][3],
-            }
-            season_weekly_low_scorers.append(low_scorer)
-
-            highest_ce = {
-                "week": week_counter,
-                "team": report_data.data_for_coaching_efficiency[0][1],
-                "manager": report_data.data_for_coaching_efficiency[0][2],
-                "ce": report_data.data_for_coaching_efficiency[0][3],
-            }
-            season_weekly_highest_ce.append(highest_ce)
-
-            season_weekly_teams_results.append(report_data.teams_results)
+            # the week for the report is always calculated
+            if week_counter < week_for_report:
+                weekly_summary = weekly_report_data_cache.load(week_counter, week_input_hash)
+                if weekly_summary:
+                    weekly_summaries[week_counter] = weekly_summary
 
+        # second pass: calculate the report data of the remaining previous weeks independently of each other
+        weeks_to_calculate = [
+            week for week in range(self.league.start_week, week_for_report) if week not in weekly_summaries
+        ]
+        self.calculate_season_z_scores()
+        self.season_luck_results = CalculateMetrics.calculate_season_luck(
+            self.league,
+            {week: custom_weekly_matchups_by_week[week] for week in weeks_to_calculate + [week_for_report]},
+        )
+        for week_counter, weekly_summary in self._get_weekly_summaries(weeks_to_calculate).items():
+            weekly_report_data_cache.save(week_counter, week_input_hashes[week_counter], weekly_summary)
+            weekly_summaries[week_counter] = weekly_summary
+
+        report_data = self.get_report_data(week_for_report)
+        weekly_summaries[week_for_report] = report_data.get_weekly_summary(week_for_report)
+
+        # merge the weekly summaries in week order
+        for week_counter, weekly_summary in sorted(weekly_summaries.items()):
+            for team_id, weekly_team_points_by_position in weekly_summary["weekly_points_by_position"]:
+                season_avg_points_by_position[team_id].append(weekly_team_points_by_position)
+
+            season_weekly_top_scorers.append(weekly_summary["top_scorer"])
+            season_weekly_low_scorers.append(weekly_summary["low_scorer"])
+            season_weekly_highest_ce.append(weekly_summary["highest_ce"])
+
+            ordered_team_ids = []
             ordered_team_names = []
             ordered_team_managers = []
             weekly_points_data = []
@@ -223,17 +443,19 @@ class FantasyFootballReport(object):
             weekly_z_score_data = []
             weekly_power_rank_data = []
 
-            team: List
-            for team in report_data.data_for_teams:
-                ordered_team_names.append(team[1])
-                ordered_team_managers.append(team[2])
-                weekly_points_data.append([week_counter, float(team[3])])
-                weekly_coaching_efficiency_data.append([week_counter, team[4]])
-                weekly_luck_data.append([week_counter, float(team[5])])
-                weekly_optimal_points_data.append([week_counter, team[1], float(team[6])])
-                weekly_z_score_data.append([week_counter, team[7]])
-                weekly_power_rank_data.append([week_counter, team[8]])
-
+            team_data: List
+            for team_data in weekly_summary["teams"]:
+                ordered_team_ids.append(team_data[0])
+                ordered_team_names.append(team_data[1])
+                ordered_team_managers.append(team_data[2])
+                weekly_points_data.append([week_counter, float(team_data[3])])
+                weekly_coaching_efficiency_data.append([week_counter, team_data[4]])
+                weekly_luck_data.append([week_counter, float(team_data[5])])
+                weekly_optimal_points_data.append([week_counter, team_data[0], float(team_data[6])])
+                weekly_z_score_data.append([week_counter, team_data[7]])
+                weekly_power_rank_data.append([week_counter, team_data[8]])
+
+            week_for_report_ordered_team_ids = ordered_team_ids
             week_for_report_ordered_team_names = ordered_team_names
             week_for_report_ordered_managers = ordered_team_managers
 
@@ -265,8 +487,6 @@ class FantasyFootballReport(object):
                 for index, team_power_rank in enumerate(weekly_power_rank_data):
                     time_series_power_rank_data[index].append(team_power_rank)
 
-            week_counter += 1
-
         report_data.data_for_season_avg_points_by_position = season_avg_points_by_position
         report_data.data_for_season_weekly_top_scorers = season_weekly_top_scorers
         report_data.data_for_season_weekly_low_scorers = season_weekly_low_scorers
@@ -274,7 +494,7 @@ class FantasyFootballReport(object):
 
         # calculate season average metrics and then add columns for them to their respective metric table data
         season_average_calculator = SeasonAverageCalculator(
-            week_for_report_ordered_team_names, report_data, self.break_ties
+            week_for_report_ordered_team_ids, report_data, self.break_ties
         )
 
         report_data.data_for_scores = season_average_calculator.get_average(
@@ -299,24 +519,27 @@ class FantasyFootballReport(object):
 
         # add weekly record to luck data
         for team_luck_data_entry in report_data.data_for_luck:
-            for team in self.league.teams_by_week[str(self.league.week_for_report)].values():
-                team: BaseTeam
-                if team_luck_data_entry[1] == team.name:
-                    team_luck_data_entry.append(team.weekly_overall_record.get_record_str())
+            team: BaseTeam
+            if team := self.league.teams_by_week.get(str(self.league.week_for_report), {}).get(
+                str(team_luck_data_entry.team_id)
+            ):
+                team_luck_data_entry.append(team.weekly_overall_record.get_record_str())
 
         # add season total optimal points to optimal points data
         sorted_season_total_optimal_points_data = dict(
             sorted(season_total_optimal_points_data.items(), key=lambda x: x[1], reverse=True)
         )
-        list_sorted_season_total_optimal_points_data = [
-            (i, k, v) for i, (k, v) in enumerate(sorted_season_total_optimal_points_data.items())
-        ]
+        season_total_optimal_points_ranked_by_team_id = {
+            team_id: MetricValue(round(season_total_optimal_points, 2), place=place)
+            for place, (team_id, season_total_optimal_points) in enumerate(
+                sorted_season_total_optimal_points_data.items(), start=1
+            )
+        }
         for team_optimal_points_data_entry in report_data.data_for_optimal_scores:
-            for team_index, team_name, season_total_optimal_points in list_sorted_season_total_optimal_points_data:
-                if team_optimal_points_data_entry[1] == team_name:
-                    place = team_index + 1
-                    total_optimal_points_ranked = f"{round(season_total_optimal_points, 2):.2f} ({place})"
-                    team_optimal_points_data_entry.append(total_optimal_points_ranked)
+            if team_optimal_points_data_entry.team_id in season_total_optimal_points_ranked_by_team_id:
+                team_optimal_points_data_entry.append(
+                    season_total_optimal_points_ranked_by_team_id[team_optimal_points_data_entry.team_id]
+                )
 
         report_data.data_for_power_rankings = season_average_calculator.get_average(
             time_series_power_rank_data, "data_for_power_rankings", reverse=False
@@ -339,6 +562,31 @@ class FantasyFootballReport(object):
             )
         )
 
+        if self.settings.report_settings.league_optimal_manager_rankings_bool:
+            # replay every matchup of the season with the optimal points of each team from the weekly summaries
+            report_data.data_for_optimal_manager = OptimalManagerBacktest(
+                week_for_report_ordered_team_ids, weekly_summaries, self.league
+            ).get_optimal_manager_data(report_data.teams_results)
+
+        if self.settings.report_settings.league_decision_quality_rankings_bool:
+            # find the optimal lineups by projected points of all teams for every week of the season in one pass
+            decision_quality = DecisionQuality(
+                week_for_report_ordered_team_ids,
+                self.coaching_efficiency.execute_season_decision_quality(
+                    {week: self.league.teams_by_week.get(str(week), {}) for week in sorted(weekly_summaries.keys())}
+                ),
+                weekly_summaries,
+            )
+            if decision_quality.has_projections:
+                report_data.data_for_decision_quality = decision_quality.get_decision_quality_data(
+                    report_data.teams_results
+                )
+            else:
+                logger.info(
+                    f"No player projected points available from {self.platform_display}. Skipping decision "
+                    f"quality rankings."
+                )
+
         filename = (
             self.league.name.replace(" ", "-")
             + "("
@@ -372,6 +620,14 @@ class FantasyFootballReport(object):
         else:
             filename_with_path = self.settings.output_dir_path / "test_report.pdf"
 
+        if self.settings.report_settings.metrics_data_export_bool:
+            # export the weekly and season metrics data alongside the pdf report
+            MetricsDataExporter(
+                report_data,
+                weekly_summaries,
+                filename_with_path.parent / "metrics_data" / f"week_{self.league.week_for_report}",
+            ).export()
+
         # instantiate pdf generator
         pdf_generator = PdfGenerator(
             settings=self.settings,
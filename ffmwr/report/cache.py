@@ -0,0 +1,136 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam
+from ffmwr.utilities.files import file_lock, write_json_file_atomically
+from ffmwr.utilities.logger import get_logger
+
+logger = get_logger(__name__, propagate=False)
+
+# version of the weekly report data summary format (increment when the summary contents or their calculation change)
+weekly_report_data_version: int = 3
+
+
+class WeeklyReportDataCache(object):
+    """Persisted per-week report data summaries keyed by a hash of the inputs used to calculate them, so weeks that
+    have not changed since the last report do not need to be recalculated.
+    """
+
+    def __init__(
+        self,
+        league: BaseLeague,
+        break_ties: bool,
+        dq_ce: bool,
+        coaching_efficiency_disqualified_teams: List[str],
+        save_data: bool,
+    ):
+        self.league: BaseLeague = league
+        self.break_ties: bool = break_ties
+        self.dq_ce: bool = dq_ce
+        self.coaching_efficiency_disqualified_teams: List[str] = coaching_efficiency_disqualified_teams
+        self.save_data: bool = save_data
+
+    def _get_summary_file_path(self, week: int) -> Path:
+        return self.league.data_dir / f"week_{week}" / "metrics_data" / "weekly_report_data_summary.json"
+
+    @staticmethod
+    def _get_player_inputs(player: BasePlayer) -> List[Any]:
+        return [
+            player.player_id,
+            player.full_name,
+            player.first_name,
+            player.last_name,
+            player.nfl_team_abbr,
+            player.primary_position,
+            sorted(player.eligible_positions),
+            player.selected_position,
+            player.points,
+            player.status,
+            player.bye_week,
+        ]
+
+    def _get_team_inputs(self, team: BaseTeam) -> List[Any]:
+        return [
+            team.team_id,
+            self._decode(team.name),
+            team.manager_str,
+            team.division,
+            team.points,
+            team.home_field_advantage_points,
+            [self._get_player_inputs(player) for player in team.roster],
+        ]
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def get_week_input_hash(
+        self,
+        week: int,
+        custom_weekly_matchups: List[Dict[str, Dict[str, Any]]],
+        inactive_players: Optional[FrozenSet[str]],
+        previous_week_input_hash: Optional[str],
+    ) -> str:
+        """Hash the league settings, matchups, team rosters, and coaching efficiency disqualification inputs (inactive
+        players and manually disqualified teams) for the given week. The hash of the previous week is chained into the
+        hash because records and z-scores depend on the results of all previous weeks.
+        """
+        week_inputs = {
+            "version": weekly_report_data_version,
+            "previous_week_input_hash": previous_week_input_hash,
+            "week": week,
+            "break_ties": self.break_ties,
+            "dq_ce": self.dq_ce,
+            "inactive_players": sorted(inactive_players) if inactive_players is not None else None,
+            "coaching_efficiency_disqualified_teams": self.coaching_efficiency_disqualified_teams,
+            "league": [
+                self.league.start_week,
+                dict(self.league.roster_position_counts),
+                self.league.roster_active_slots,
+                self.league.bench_positions,
+                self.league.get_flex_positions_dict(),
+                self.league.offensive_positions,
+                self.league.defensive_positions,
+            ],
+            "matchups": custom_weekly_matchups,
+            "teams": [self._get_team_inputs(team) for team in self.league.teams_by_week[str(week)].values()],
+        }
+        week_inputs_json = json.dumps(
+            week_inputs, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=self._decode
+        )
+        return hashlib.sha256(week_inputs_json.encode("utf-8")).hexdigest()
+
+    def load(self, week: int, week_input_hash: str) -> Optional[Dict[str, Any]]:
+        """Load the saved report data summary for the given week if it was calculated from the same inputs."""
+        summary_file_path = self._get_summary_file_path(week)
+        if not summary_file_path.is_file():
+            return None
+
+        try:
+            with open(summary_file_path, "r", encoding="utf-8") as summary_file_in:
+                saved_summary = json.load(summary_file_in)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Unable to load saved report data summary for week {week} from {summary_file_path}: {e}")
+            return None
+
+        if saved_summary.get("input_hash") != week_input_hash:
+            logger.debug(f"Saved report data summary for week {week} is out of date and will be recalculated.")
+            return None
+
+        logger.debug(f"Loaded saved report data summary for week {week} from {summary_file_path}.")
+        return saved_summary.get("summary")
+
+    def save(self, week: int, week_input_hash: str, summary: Dict[str, Any]) -> None:
+        """Save the report data summary for the given week when saving data is enabled."""
+        if not self.save_data:
+            return
+
+        summary_file_path = self._get_summary_file_path(week)
+        with file_lock(summary_file_path):
+            write_json_file_atomically(summary_file_path, {"input_hash": week_input_hash, "summary": summary})
+        logger.debug(f"Saved report data summary for week {week} to {summary_file_path}.")
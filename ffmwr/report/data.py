@@ -1,11 +1,14 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
-import itertools
-from typing import List
+from typing import Any, Dict, FrozenSet, List, Optional
 
+from ffmwr.calculate.coaching_efficiency import CoachingEfficiency
 from ffmwr.calculate.metrics import CalculateMetrics
 from ffmwr.calculate.points_by_position import PointsByPosition
+from ffmwr.calculate.power_rankings import PowerRankings
+from ffmwr.calculate.ranking import rank_metric
+from ffmwr.calculate.tables import MetricTableRow
 from ffmwr.models.base.model import BaseLeague, BaseMatchup, BaseTeam
 from ffmwr.utilities.app import add_report_team_stats, get_inactive_players
 from ffmwr.utilities.logger import get_logger
@@ -19,7 +22,6 @@ class ReportData(object):
         self,
         settings: AppSettings,
         league: BaseLeague,
-        season_weekly_teams_results,
         week_counter: int,
         week_for_report: int,
         season: int,
@@ -28,6 +30,7 @@ class ReportData(object):
         break_ties: bool = False,
         dq_ce: bool = False,
         testing: bool = False,
+        inactive_players: Optional[FrozenSet[str]] = None,
     ):
         logger.debug("Instantiating report data.")
 
@@ -40,28 +43,30 @@ class ReportData(object):
         self.has_waiver_priorities: bool = league.has_waiver_priorities
         self.is_faab: bool = league.is_faab
 
-        inactive_players = []
-        if dq_ce:
+        if not dq_ce:
+            inactive_players = frozenset()
+        elif inactive_players is None:
             inactive_players = get_inactive_players(week_counter, league)
 
         self.teams_results = {
-            team.team_id: add_report_team_stats(
-                settings, team, league, week_counter, metrics_calculator, metrics, dq_ce, inactive_players
-            )
+            team.team_id: add_report_team_stats(settings, team, league, metrics_calculator, metrics)
             for team in league.teams_by_week.get(str(week_counter)).values()
         }
 
+        # calculate coaching efficiency and optimal score of all teams
+        coaching_efficiency: CoachingEfficiency = metrics.get("coaching_efficiency")
+        coaching_efficiency_results = coaching_efficiency.execute_weekly_coaching_efficiency(
+            list(self.teams_results.values()), week_counter, inactive_players, dq_eligible=dq_ce
+        )
+        for team_id, (team_coaching_efficiency, team_optimal_points) in coaching_efficiency_results.items():
+            self.teams_results[team_id].coaching_efficiency = team_coaching_efficiency
+            self.teams_results[team_id].optimal_points = team_optimal_points
+
         records = {}
         for team_id, team in self.teams_results.items():
             records[team_id] = team.record
 
-        league.standings = sorted(
-            league.teams_by_week.get(str(week_counter)).values(),
-            key=lambda x: (
-                league.records_by_week[str(week_counter)][x.team_id].rank,
-                -league.records_by_week[str(week_counter)][x.team_id].get_points_for(),
-            ),
-        )
+        league.update_standings(week_counter)
 
         # option to disqualify team(s) manually entered in the .env file for current week of coaching efficiency
         self.coaching_efficiency_dqs = {}
@@ -88,8 +93,8 @@ class ReportData(object):
                         matchup_teams.append(team.team_id)
                     remaining_matchups[str(week)].append(tuple(matchup_teams))
 
-        # calculate z-scores (dependent on all previous weeks scores)
-        z_score_results = metrics_calculator.calculate_z_scores(season_weekly_teams_results + [self.teams_results])
+        # z-scores (dependent on all previous weeks scores)
+        z_score_results = metrics.get("z_scores")
 
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ REPORT DATA ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
@@ -101,6 +106,8 @@ class ReportData(object):
         self.data_for_season_weekly_top_scorers = None
         self.data_for_season_weekly_low_scorers = None
         self.data_for_season_weekly_highest_ce = None
+        self.data_for_optimal_manager = None
+        self.data_for_decision_quality = None
 
         # current standings data
         self.data_for_current_standings = metrics_calculator.get_standings_data(league)
@@ -123,6 +130,9 @@ class ReportData(object):
         else:
             self.data_for_playoff_probs = None
 
+        # unformatted playoff probabilities by team id (used for the metrics data export)
+        self.playoff_probs_by_team_id = self.data_for_playoff_probs
+
         if self.data_for_playoff_probs:
             self.data_for_playoff_probs = metrics_calculator.get_playoff_probs_data(
                 league.standings, self.data_for_playoff_probs
@@ -144,7 +154,8 @@ class ReportData(object):
             create_z_score_data = True
 
         if create_z_score_data:
-            for k_v in sorted(z_score_results.items(), key=lambda x: x[1], reverse=True):
+            z_score_items = list(z_score_results.items())
+            for k_v in rank_metric([z_score_val for _, z_score_val in z_score_items]).rank(z_score_items):
                 z_score = k_v[1]
                 if z_score:
                     z_score = round(float(z_score), 2)
@@ -178,45 +189,45 @@ class ReportData(object):
 
         self.data_for_teams.sort(key=lambda x: x[1])
 
+        teams_results = list(self.teams_results.values())
+
         # scores data
         self.data_for_scores = metrics_calculator.get_score_data(
-            sorted(self.teams_results.values(), key=lambda x: float(x.points), reverse=True)
+            rank_metric([float(team.points) for team in teams_results]).rank(teams_results)
         )
 
         # coaching efficiency data
         self.data_for_coaching_efficiency = metrics_calculator.get_coaching_efficiency_data(
-            sorted(
-                self.teams_results.values(),
-                key=lambda x: float(x.coaching_efficiency) if x.coaching_efficiency != "DQ" else 0,
-                reverse=True,
-            )
+            rank_metric(
+                [float(team.coaching_efficiency) if team.coaching_efficiency != "DQ" else 0 for team in teams_results]
+            ).rank(teams_results)
         )
         self.num_coaching_efficiency_dqs = metrics_calculator.coaching_efficiency_dq_count
         self.coaching_efficiency_dqs.update(metrics.get("coaching_efficiency").coaching_efficiency_dqs)
 
         # luck data
         self.data_for_luck = metrics_calculator.get_luck_data(
-            sorted(self.teams_results.values(), key=lambda x: float(x.luck), reverse=True)
+            rank_metric([float(team.luck) for team in teams_results]).rank(teams_results)
         )
 
         # optimal score data
         self.data_for_optimal_scores = metrics_calculator.get_optimal_score_data(
-            sorted(self.teams_results.values(), key=lambda x: float(x.optimal_points), reverse=True)
+            rank_metric([float(team.optimal_points) for team in teams_results]).rank(teams_results)
         )
 
         # bad boy data
         self.data_for_bad_boy_rankings = metrics_calculator.get_bad_boy_data(
-            sorted(self.teams_results.values(), key=lambda x: x.bad_boy_points, reverse=True)
+            rank_metric([team.bad_boy_points for team in teams_results]).rank(teams_results)
         )
 
         # beef rank data
         self.data_for_beef_rankings = metrics_calculator.get_beef_rank_data(
-            sorted(self.teams_results.values(), key=lambda x: x.tabbu, reverse=True)
+            rank_metric([team.tabbu for team in teams_results]).rank(teams_results)
         )
 
         # high roller data
         self.data_for_high_roller_rankings = metrics_calculator.get_high_roller_data(
-            sorted(self.teams_results.values(), key=lambda x: x.fines_total, reverse=True)
+            rank_metric([team.fines_total for team in teams_results]).rank(teams_results)
         )
 
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
@@ -225,76 +236,70 @@ class ReportData(object):
         logger.debug("Counting metric ties.")
 
         # get number of scores ties and ties for first
-        self.ties_for_scores = metrics_calculator.get_ties_count(self.data_for_scores, "score", self.break_ties)
-        self.num_first_place_for_score_before_resolution = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_scores, lambda x: x[3])][0]
+        score_ranking = metrics_calculator.get_table_ranking(self.data_for_scores, 3)
+        self.ties_for_scores = metrics_calculator.get_ties_count(
+            self.data_for_scores, "score", self.break_ties, score_ranking
         )
+        self.num_first_place_for_score_before_resolution = score_ranking.num_first_place
 
         # reorder score data based on bench points if there are ties and break_ties = True
         if self.ties_for_scores > 0:
             self.data_for_scores = metrics_calculator.resolve_score_ties(self.data_for_scores, self.break_ties)
             metrics_calculator.get_ties_count(self.data_for_scores, "score", self.break_ties)
-        self.num_first_place_for_score = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_scores, lambda x: x[3])][0]
-        )
+        self.num_first_place_for_score = metrics_calculator.get_table_ranking(self.data_for_scores, 3).num_first_place
 
         # get number of coaching efficiency ties and ties for first
         self.ties_for_coaching_efficiency = metrics_calculator.get_ties_count(
             self.data_for_coaching_efficiency, "coaching_efficiency", self.break_ties
         )
-        self.num_first_place_for_coaching_efficiency_before_resolution = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_coaching_efficiency, lambda x: x[0])][0]
-        )
+        self.num_first_place_for_coaching_efficiency_before_resolution = metrics_calculator.get_table_ranking(
+            self.data_for_coaching_efficiency, 0
+        ).num_first_place
 
         if self.ties_for_coaching_efficiency > 0:
             self.data_for_coaching_efficiency = metrics_calculator.resolve_coaching_efficiency_ties(
                 self.data_for_coaching_efficiency,
                 self.ties_for_coaching_efficiency,
                 league,
-                self.teams_results,
                 int(week_counter),
                 int(week_for_report),
                 self.break_ties,
             )
-        self.num_first_place_for_coaching_efficiency = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_coaching_efficiency, lambda x: x[0])][0]
-        )
+        self.num_first_place_for_coaching_efficiency = metrics_calculator.get_table_ranking(
+            self.data_for_coaching_efficiency, 0
+        ).num_first_place
 
         # get number of luck ties and ties for first
-        self.ties_for_luck = metrics_calculator.get_ties_count(self.data_for_luck, "luck", self.break_ties)
-        self.num_first_place_for_luck = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_luck, lambda x: x[3])][0]
+        luck_ranking = metrics_calculator.get_table_ranking(self.data_for_luck, 3)
+        self.ties_for_luck = metrics_calculator.get_ties_count(
+            self.data_for_luck, "luck", self.break_ties, luck_ranking
         )
+        self.num_first_place_for_luck = luck_ranking.num_first_place
 
         # get number of bad boy rankings ties and ties for first
+        bad_boy_ranking = metrics_calculator.get_table_ranking(self.data_for_bad_boy_rankings, 3)
         self.ties_for_bad_boy_rankings = metrics_calculator.get_ties_count(
-            self.data_for_bad_boy_rankings, "bad_boy", self.break_ties
-        )
-        self.num_first_place_for_bad_boy_rankings = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_bad_boy_rankings, lambda x: x[3])][0]
+            self.data_for_bad_boy_rankings, "bad_boy", self.break_ties, bad_boy_ranking
         )
+        self.num_first_place_for_bad_boy_rankings = bad_boy_ranking.num_first_place
         # filter out teams that have no bad boys in their starting lineup
-        self.data_for_bad_boy_rankings = [result for result in self.data_for_bad_boy_rankings if int(result[-1]) != 0]
+        self.data_for_bad_boy_rankings = [result for result in self.data_for_bad_boy_rankings if result[-1] != 0]
 
         # get number of beef rankings ties and ties for first
+        beef_ranking = metrics_calculator.get_table_ranking(self.data_for_beef_rankings, 3)
         self.ties_for_beef_rankings = metrics_calculator.get_ties_count(
-            self.data_for_beef_rankings, "beef", self.break_ties
-        )
-        self.num_first_place_for_beef_rankings = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_beef_rankings, lambda x: x[3])][0]
+            self.data_for_beef_rankings, "beef", self.break_ties, beef_ranking
         )
+        self.num_first_place_for_beef_rankings = beef_ranking.num_first_place
 
         # get number of high roller rankings ties and ties for first
+        high_roller_ranking = metrics_calculator.get_table_ranking(self.data_for_high_roller_rankings, 3)
         self.ties_for_high_roller_rankings = metrics_calculator.get_ties_count(
-            self.data_for_high_roller_rankings, "high_roller", self.break_ties
-        )
-        self.num_first_place_for_high_roller_rankings = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_high_roller_rankings, lambda x: x[3])][0]
+            self.data_for_high_roller_rankings, "high_roller", self.break_ties, high_roller_ranking
         )
+        self.num_first_place_for_high_roller_rankings = high_roller_ranking.num_first_place
         # filter out teams that have no high rollers in their starting lineup
-        self.data_for_high_roller_rankings = [
-            result for result in self.data_for_high_roller_rankings if float(result[3]) != 0.0
-        ]
+        self.data_for_high_roller_rankings = [result for result in self.data_for_high_roller_rankings if result[3] != 0]
 
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ CALCULATE POWER RANKING ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
@@ -302,31 +307,31 @@ class ReportData(object):
         logger.debug("Calculating power rankings.")
 
         # calculate power ranking last to account for metric rankings that have been reordered due to tiebreakers
-        power_ranking_results = metrics_calculator.calculate_power_rankings(
-            self.teams_results, self.data_for_scores, self.data_for_coaching_efficiency, self.data_for_luck
+        power_rankings = PowerRankings(
+            list(self.teams_results.keys()), self.data_for_scores, self.data_for_coaching_efficiency, self.data_for_luck
         )
 
         # update data_for_teams with power rankings
         for team in self.data_for_teams:
-            for team_id in power_ranking_results.keys():
-                if team[0] == team_id:
-                    team.append(power_ranking_results[team_id]["power_ranking"])
+            team.append(power_rankings.get_power_ranking(team[0]))
 
         # power rankings data
         self.data_for_power_rankings = []
-        for k_v in sorted(power_ranking_results.items(), key=lambda x: x[1]["power_ranking"]):
+        for team_ndx in power_rankings.order.tolist():
+            team = self.teams_results[power_rankings.team_ids[team_ndx]]
             # season avg calc does something where it _keys off the second value in the array
             self.data_for_power_rankings.append(
-                [k_v[1]["power_ranking"], power_ranking_results[k_v[0]]["name"], k_v[1]["manager_str"]]
+                MetricTableRow(
+                    team.team_id, [power_rankings.power_rankings[team_ndx].item(), team.name, team.manager_str]
+                )
             )
 
         # get number of power rankings ties and ties for first
+        power_ranking_ranking = metrics_calculator.get_table_ranking(self.data_for_power_rankings, 0)
         self.ties_for_power_rankings = metrics_calculator.get_ties_count(
-            self.data_for_power_rankings, "power_ranking", self.break_ties
-        )
-        self.ties_for_first_for_power_rankings = len(
-            [list(group) for key, group in itertools.groupby(self.data_for_power_rankings, lambda x: x[0])][0]
+            self.data_for_power_rankings, "power_ranking", self.break_ties, power_ranking_ranking
         )
+        self.ties_for_first_for_power_rankings = power_ranking_ranking.num_first_place
 
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
         # ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ LOGGER OUTPUT ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~ ~
@@ -363,3 +368,46 @@ class ReportData(object):
             f"{f' with the following coaching efficiency DQs: {ce_dq_str})' if ce_dq_str else ''}"
             f"."
         )
+
+    @staticmethod
+    def _get_summary_value(value: Any) -> Any:
+        return value if value is None or isinstance(value, str) else float(value)
+
+    def get_weekly_summary(self, week_counter: int) -> Dict[str, Any]:
+        """Get the compact subset of the weekly report data used to build the season time series and season averages.
+
+        Numeric values are plain floats (and text values such as "DQ" are kept as is), so summaries loaded from saved
+        data have the same types as summaries calculated from the report data.
+        """
+        return {
+            "weekly_points_by_position": [
+                [team_id, [[position, float(points)] for position, points in team_points_by_position]]
+                for team_id, team_points_by_position in self.data_for_weekly_points_by_position
+            ],
+            "top_scorer": {
+                "week": week_counter,
+                "team": self.data_for_scores[0][1],
+                "manager": self.data_for_scores[0][2],
+                "score": float(self.data_for_scores[0][3]),
+            },
+            "low_scorer": {
+                "week": week_counter,
+                "team": self.data_for_scores[-1][1],
+                "manager": self.data_for_scores[-1][2],
+                "score": float(self.data_for_scores[-1][3]),
+            },
+            "highest_ce": {
+                "week": week_counter,
+                "team": self.data_for_coaching_efficiency[0][1],
+                "manager": self.data_for_coaching_efficiency[0][2],
+                "ce": (
+                    float(self.data_for_coaching_efficiency[0][3])
+                    if self.data_for_coaching_efficiency[0][3] != "DQ"
+                    else "DQ"
+                ),
+            },
+            "teams": [
+                [team_id, name, manager, *(self._get_summary_value(value) for value in values)]
+                for team_id, name, manager, *values in self.data_for_teams
+            ],
+        }
@@ -0,0 +1,200 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+from importlib import import_module
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+from ffmwr.calculate.tables import MetricTableRow, MetricValue
+from ffmwr.report.data import ReportData
+from ffmwr.utilities.files import atomic_file_path, file_lock
+from ffmwr.utilities.logger import get_logger
+
+logger = get_logger(__name__, propagate=False)
+
+
+def get_polars() -> Optional[ModuleType]:
+    """Import the optional Polars DataFrame library used to write the metrics data export (installed with the "export"
+    extra of the project dependencies), or return None if it is not installed.
+    """
+    try:
+        return import_module("polars")
+    except ImportError:
+        return None
+
+
+class MetricsDataExporter(object):
+    """Export of the weekly and season report metrics as typed, columnar Parquet files alongside the PDF report."""
+
+    def __init__(self, report_data: ReportData, weekly_summaries: Dict[int, Dict[str, Any]], export_dir: Path):
+        self.report_data: ReportData = report_data
+        self.weekly_summaries: Dict[int, Dict[str, Any]] = weekly_summaries
+        self.export_dir: Path = export_dir
+
+    def get_weekly_team_metrics(self) -> Dict[str, List[Any]]:
+        """Get the score, coaching efficiency, luck, optimal points, z-score, and power ranking of every team in every
+        week of the season.
+        """
+        columns = {
+            "week": [],
+            "team_id": [],
+            "team_name": [],
+            "manager": [],
+            "points": [],
+            "coaching_efficiency": [],
+            "coaching_efficiency_disqualified": [],
+            "luck": [],
+            "optimal_points": [],
+            "z_score": [],
+            "power_ranking": [],
+        }
+        for week, weekly_summary in sorted(self.weekly_summaries.items()):
+            for team_data in weekly_summary["teams"]:
+                coaching_efficiency_disqualified = team_data[4] == "DQ"
+
+                columns["week"].append(int(week))
+                columns["team_id"].append(str(team_data[0]))
+                columns["team_name"].append(team_data[1])
+                columns["manager"].append(team_data[2])
+                columns["points"].append(float(team_data[3]))
+                columns["coaching_efficiency"].append(
+                    float(team_data[4]) if not coaching_efficiency_disqualified else None
+                )
+                columns["coaching_efficiency_disqualified"].append(coaching_efficiency_disqualified)
+                columns["luck"].append(float(team_data[5]))
+                columns["optimal_points"].append(float(team_data[6]))
+                columns["z_score"].append(float(team_data[7]) if team_data[7] is not None else None)
+                columns["power_ranking"].append(float(team_data[8]))
+
+        return columns
+
+    def get_weekly_points_by_position(self) -> Dict[str, List[Any]]:
+        """Get the starting lineup points of every team by position in every week of the season."""
+        columns = {"week": [], "team_id": [], "position": [], "points": []}
+        for week, weekly_summary in sorted(self.weekly_summaries.items()):
+            for team_id, weekly_team_points_by_position in weekly_summary["weekly_points_by_position"]:
+                for position, points in weekly_team_points_by_position:
+                    columns["week"].append(int(week))
+                    columns["team_id"].append(str(team_id))
+                    columns["position"].append(position)
+                    columns["points"].append(float(points))
+
+        return columns
+
+    @staticmethod
+    def _get_season_values_by_team_id(data_for_metric: Optional[List[MetricTableRow]]) -> Dict[str, MetricValue]:
+        """Get the ranked season value (season average or season total) of every team in a metric table."""
+        season_values_by_team_id = {}
+        for row in data_for_metric or []:
+            for cell in row:
+                if isinstance(cell, MetricValue) and cell.place is not None:
+                    season_values_by_team_id[str(row.team_id)] = cell
+                    break
+        return season_values_by_team_id
+
+    def get_season_team_metrics(self) -> Dict[str, List[Any]]:
+        """Get the season averages (and season total optimal points) of every team with their places."""
+        season_metric_tables = {
+            "season_avg_points": self.report_data.data_for_scores,
+            "season_avg_coaching_efficiency": self.report_data.data_for_coaching_efficiency,
+            "season_avg_luck": self.report_data.data_for_luck,
+            "season_total_optimal_points": self.report_data.data_for_optimal_scores,
+            "season_avg_power_ranking": self.report_data.data_for_power_rankings,
+        }
+
+        columns = {"team_id": [], "team_name": [], "manager": []}
+        for season_metric in season_metric_tables.keys():
+            columns[season_metric] = []
+            columns[f"{season_metric}_place"] = []
+
+        season_values_by_metric = {
+            season_metric: self._get_season_values_by_team_id(data_for_metric)
+            for season_metric, data_for_metric in season_metric_tables.items()
+        }
+        for team in self.report_data.teams_results.values():
+            columns["team_id"].append(str(team.team_id))
+            columns["team_name"].append(team.name)
+            columns["manager"].append(team.manager_str)
+            for season_metric, season_values_by_team_id in season_values_by_metric.items():
+                season_value = season_values_by_team_id.get(str(team.team_id))
+                columns[season_metric].append(float(season_value) if season_value is not None else None)
+                columns[f"{season_metric}_place"].append(season_value.place if season_value is not None else None)
+
+        return columns
+
+    def get_season_points_by_position(self) -> Dict[str, List[Any]]:
+        """Get the season average starting lineup points of every team by position."""
+        columns = {"team_id": [], "position": [], "season_avg_points": []}
+        for team_id, season_avg_points_by_position in (
+            self.report_data.data_for_season_avg_points_by_position or {}
+        ).items():
+            for position, season_avg_points in season_avg_points_by_position:
+                columns["team_id"].append(str(team_id))
+                columns["position"].append(position)
+                columns["season_avg_points"].append(float(season_avg_points))
+
+        return columns
+
+    def get_playoff_probabilities(self) -> Dict[str, List[Any]]:
+        """Get the playoff probabilities of every team, including the chance of finishing in each playoff place."""
+        columns = {
+            "team_id": [],
+            "team_name": [],
+            "playoff_chance": [],
+            "needed_wins": [],
+            "predicted_division_leader": [],
+            "predicted_division_qualifier": [],
+        }
+
+        playoff_probs_by_team_id = self.report_data.playoff_probs_by_team_id or {}
+        num_playoff_places = max(
+            (len(team_playoff_probs[2]) for team_playoff_probs in playoff_probs_by_team_id.values()), default=0
+        )
+        for place in range(1, num_playoff_places + 1):
+            columns[f"place_{place}_chance"] = []
+
+        for team_id, team_playoff_probs in playoff_probs_by_team_id.items():
+            team = self.report_data.teams_results.get(team_id)
+            columns["team_id"].append(str(team_id))
+            columns["team_name"].append(team.name if team else team_playoff_probs[0])
+            columns["playoff_chance"].append(float(team_playoff_probs[1]))
+            columns["needed_wins"].append(int(team_playoff_probs[3]))
+            columns["predicted_division_leader"].append(bool(team_playoff_probs[4]))
+            columns["predicted_division_qualifier"].append(bool(team_playoff_probs[5]))
+            for place in range(1, num_playoff_places + 1):
+                columns[f"place_{place}_chance"].append(
+                    float(team_playoff_probs[2][place - 1]) if place <= len(team_playoff_probs[2]) else None
+                )
+
+        return columns
+
+    def export(self) -> List[Path]:
+        """Write every metrics data set to its own Parquet file and return the paths of the written files."""
+        polars = get_polars()
+        if not polars:
+            logger.warning(
+                'Unable to export metrics data because Polars is not installed. Install the optional "export" '
+                "dependencies to enable the metrics data export."
+            )
+            return []
+
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+
+        metrics_data = {
+            "weekly_team_metrics": self.get_weekly_team_metrics(),
+            "weekly_points_by_position": self.get_weekly_points_by_position(),
+            "season_team_metrics": self.get_season_team_metrics(),
+            "season_points_by_position": self.get_season_points_by_position(),
+            "playoff_probabilities": self.get_playoff_probabilities(),
+        }
+
+        exported_file_paths = []
+        for metrics_data_name, columns in metrics_data.items():
+            export_file_path = self.export_dir / f"{metrics_data_name}.parquet"
+            with file_lock(export_file_path), atomic_file_path(export_file_path) as temp_export_file_path:
+                polars.DataFrame(columns).write_parquet(temp_export_file_path)
+            exported_file_paths.append(export_file_path)
+
+        logger.info(f"Exported metrics data to {self.export_dir}")
+        return exported_file_paths
@@ -3,7 +3,6 @@ __email__ = "uberfastman@uberfastman.dev"
 
 import json
 import logging
-import os
 import sys
 import urllib.request
 from copy import deepcopy
@@ -26,11 +25,13 @@ from reportlab.pdfgen.canvas import Canvas
 from reportlab.platypus import Flowable, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 from reportlab.platypus.flowables import Image as ReportLabImage, KeepTogether
 
+from ffmwr.calculate.tables import MetricValue, format_metric_table_row
 from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam
 from ffmwr.report.data import ReportData
 from ffmwr.report.pdf.charts.bar import HorizontalBarChart3DGenerator
 from ffmwr.report.pdf.charts.line import LineChartGenerator
 from ffmwr.report.pdf.charts.pie import BreakdownPieDrawing
+from ffmwr.utilities.files import atomic_file_path, file_lock
 from ffmwr.utilities.logger import get_logger
 from ffmwr.utilities.settings import AppSettings
 from ffmwr.utilities.utils import truncate_cell_for_display
@@ -53,8 +54,7 @@ def get_player_image(
 ):
     headshots_dir = Path(data_dir) / f"week_{week}" / "player_headshots"
 
-    if not Path(headshots_dir).exists():
-        os.makedirs(headshots_dir)
+    Path(headshots_dir).mkdir(parents=True, exist_ok=True)
 
     if url:
         img_name = url.split("/")[-1]
@@ -62,37 +62,42 @@ def get_player_image(
         local_img_jpg_path = Path(headshots_dir) / f"{img_name.split('.')[0]}.jpg"
 
         if not Path(local_img_jpg_path).exists():
-            if not Path(local_img_path).exists():
-                if not offline:
-                    logger.debug(f'Retrieving player headshot for "{player_name}"')
-                    try:
-                        urllib.request.urlretrieve(url, local_img_path)
-                    except URLError:
-                        logger.error(
-                            f"Unable to retrieve player "
-                            f"headshot{f' for player {player_name}' if player_name else ''} at url {url}"
-                        )
-                        local_img_path = Path("resources") / "images" / "photo-not-available.png"
-                else:
-                    logger.error(
-                        f"FILE {local_img_jpg_path} DOES NOT EXIST. CANNOT LOAD DATA LOCALLY WITHOUT HAVING PREVIOUSLY "
-                        f"SAVED DATA!"
-                    )
-                    sys.exit(1)
-
-            img = Image.open(local_img_path)
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-
-            # Create a white rgba background
-            background = Image.new("RGB", img.size, "WHITE")
-            background.paste(img, (0, 0), img)
-            img = background
-            img = img.convert("RGB")
-            local_img_path = local_img_jpg_path
-            img.save(local_img_path, quality=image_quality, optimize=True)
-        else:
-            local_img_path = local_img_jpg_path
+            # lock the headshot so concurrent report processes sharing the data directory download and convert it once
+            with file_lock(local_img_jpg_path):
+                # another report process may have saved the headshot while waiting for the lock
+                if not Path(local_img_jpg_path).exists():
+                    if not Path(local_img_path).exists():
+                        if not offline:
+                            logger.debug(f'Retrieving player headshot for "{player_name}"')
+                            try:
+                                with atomic_file_path(local_img_path) as temp_img_path:
+                                    urllib.request.urlretrieve(url, temp_img_path)
+                            except URLError:
+                                logger.error(
+                                    f"Unable to retrieve player "
+                                    f"headshot{f' for player {player_name}' if player_name else ''} at url {url}"
+                                )
+                                local_img_path = Path("resources") / "images" / "photo-not-available.png"
+                        else:
+                            logger.error(
+                                f"FILE {local_img_jpg_path} DOES NOT EXIST. CANNOT LOAD DATA LOCALLY WITHOUT HAVING "
+                                f"PREVIOUSLY SAVED DATA!"
+                            )
+                            sys.exit(1)
+
+                    img = Image.open(local_img_path)
+                    if img.mode != "RGBA":
+                        img = img.convert("RGBA")
+
+                    # Create a white rgba background
+                    background = Image.new("RGB", img.size, "WHITE")
+                    background.paste(img, (0, 0), img)
+                    img = background
+                    img = img.convert("RGB")
+                    with atomic_file_path(local_img_jpg_path) as temp_img_jpg_path:
+                        img.save(temp_img_jpg_path, quality=image_quality, optimize=True)
+
+        local_img_path = local_img_jpg_path
 
     else:
         logger.error(f"No available URL for player{f' {player_name}' if player_name else ''}.")
@@ -571,6 +576,12 @@ class PdfGenerator(object):
         self.efficiency_headers = [["Place", "Team", "Manager", "Coaching Efficiency (%)", "Season Avg. (Place)"]]
         self.luck_headers = [["Place", "Team", "Manager", "Luck", "Season Avg. (Place)", "Weekly Record (W-L)"]]
         self.optimal_scores_headers = [["Place", "Team", "Manager", "Optimal Points", "Season Total (Place)"]]
+        self.optimal_manager_headers = [
+            ["Place", "Team", "Manager", "Record", "Optimal Record", "Wins Gained", "Pts Left"]
+        ]
+        self.decision_quality_headers = [
+            ["Place", "Team", "Manager", "Decision Quality", "Proj. Lineup Pts", "Points", "Optimal Pts"]
+        ]
         self.bad_boy_headers = [["Place", "Team", "Manager", "Bad Boy Pts", "Worst Offense", "# Offenders"]]
         self.beef_headers = [["Place", "Team", "Manager", "TABBU(s)"]]
         self.high_roller_headers = [["Place", "Team", "Manager", "Fines Total ($)", "Worst Violation", "Fine ($)"]]
@@ -643,6 +654,8 @@ class PdfGenerator(object):
         self.data_for_coaching_efficiency = report_data.data_for_coaching_efficiency
         self.data_for_luck = report_data.data_for_luck
         self.data_for_optimal_scores = report_data.data_for_optimal_scores
+        self.data_for_optimal_manager = report_data.data_for_optimal_manager
+        self.data_for_decision_quality = report_data.data_for_decision_quality
         self.data_for_power_rankings = report_data.data_for_power_rankings
         self.data_for_z_scores = report_data.data_for_z_scores
         self.data_for_bad_boy_rankings = report_data.data_for_bad_boy_rankings
@@ -887,7 +900,7 @@ class PdfGenerator(object):
             temp_data = []
             wk: Dict
             for wk in data:
-                entry = [wk["week"], wk["team"], wk["manager"], wk["score"]]
+                entry = [wk["week"], wk["team"], wk["manager"], MetricValue(wk["score"])]
                 temp_data.append(entry)
                 data = temp_data
 
@@ -895,7 +908,7 @@ class PdfGenerator(object):
             temp_data = []
             wk: Dict
             for wk in data:
-                entry = [wk["week"], wk["team"], wk["manager"], wk["score"]]
+                entry = [wk["week"], wk["team"], wk["manager"], MetricValue(wk["score"])]
                 temp_data.append(entry)
                 data = temp_data
 
@@ -904,7 +917,12 @@ class PdfGenerator(object):
             wk: Dict
             for wk in data:
                 # noinspection PyTypeChecker
-                entry = [wk["week"], wk["team"], wk["manager"], wk["ce"]]
+                entry = [
+                    wk["week"],
+                    wk["team"],
+                    wk["manager"],
+                    MetricValue(wk["ce"], "{:.2f}%") if wk["ce"] != "DQ" else wk["ce"],
+                ]
                 temp_data.append(entry)
                 data = temp_data
 
@@ -914,8 +932,8 @@ class PdfGenerator(object):
             half_beef_icon = self.get_img(Path("resources") / "images" / "beef-half.png", width=0.10 * inch)
 
             for team in data:
-                num_cows = int(float(team[3]) // 5)
-                num_beefs = int(float(team[3]) / 0.5) - (num_cows * 10)
+                num_cows = int(team[3] // 5)
+                num_beefs = int(team[3] / 0.5) - (num_cows * 10)
 
                 if num_cows > 0:
                     num_beefs += 10
@@ -954,13 +972,6 @@ class PdfGenerator(object):
                     font_reduction += 1
             table_style.add("FONTSIZE", (0, 0), (-1, -1), (self.font_size - 2) - font_reduction)
 
-            temp_data = []
-            row: List[Any]
-            for row in data:
-                entry = [row[0], row[1], row[2], f"${float(row[3]):,.0f}", row[4], f"${float(row[5]):,.0f}"]
-                temp_data.append(entry)
-            data = temp_data
-
         data_table = self.create_data_table(
             metric_type,
             headers,
@@ -1106,7 +1117,8 @@ class PdfGenerator(object):
 
         for row in data:
             display_row = []
-            for cell_ndx, cell in enumerate(row):
+            # metric values are only formatted for display when the table is rendered
+            for cell_ndx, cell in enumerate(format_metric_table_row(row)):
                 if isinstance(cell, str):
                     if cell_ndx not in sesqui_max_chars_col_ndxs:
                         # truncate data cell contents to specified max characters and half of specified max characters
@@ -2034,6 +2046,42 @@ class PdfGenerator(object):
                 )
             )
             elements.append(self.spacer_twentieth_inch)
+
+        if self.settings.report_settings.league_optimal_manager_rankings_bool:
+            # optimal manager records
+            elements.append(
+                self.create_section(
+                    "Team Optimal Manager Rankings",
+                    "metrics",
+                    self.optimal_manager_headers,
+                    self.data_for_optimal_manager,
+                    self.style,
+                    self.style,
+                    self.widths_07_cols_no_2,
+                )
+            )
+            elements.append(self.spacer_twentieth_inch)
+
+        if self.settings.report_settings.league_decision_quality_rankings_bool and self.data_for_decision_quality:
+            # lineup decision quality by projected points
+            elements.append(
+                self.create_section(
+                    "Team Decision Quality Rankings",
+                    "metrics",
+                    self.decision_quality_headers,
+                    self.data_for_decision_quality,
+                    self.style,
+                    self.style,
+                    self.widths_07_cols_no_2,
+                )
+            )
+            elements.append(self.spacer_twentieth_inch)
+
+        if (
+            self.settings.report_settings.league_optimal_score_rankings_bool
+            or self.settings.report_settings.league_optimal_manager_rankings_bool
+            or self.settings.report_settings.league_decision_quality_rankings_bool
+        ):
             elements.append(self.add_page_break())
 
         if self.settings.report_settings.league_bad_boy_rankings_bool:
@@ -2324,6 +2372,8 @@ class TableOfContents(object):
                 "league_coaching_efficiency_rankings_bool",
                 "league_luck_rankings_bool",
                 "league_optimal_score_rankings_bool",
+                "league_optimal_manager_rankings_bool",
+                "league_decision_quality_rankings_bool",
                 "league_bad_boy_rankings_bool",
                 "league_beef_rankings_bool",
                 "league_high_roller_rankings_bool",
@@ -1,14 +1,13 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
-import os
 import re
 import socket
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional
 
 import colorama
 import requests
@@ -17,7 +16,6 @@ from colorama import Fore, Style
 from git import Repo, TagReference, cmd
 from urllib3 import connectionpool, poolmanager
 
-from ffmwr.calculate.coaching_efficiency import CoachingEfficiency
 from ffmwr.calculate.metrics import CalculateMetrics
 from ffmwr.dao.platforms.base.platform import BasePlatform
 from ffmwr.dao.platforms.cbs import CBSPlatform
@@ -30,9 +28,11 @@ from ffmwr.features.beef import BeefFeature
 from ffmwr.features.high_roller import HighRollerFeature
 from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam
 from ffmwr.utilities.constants import nfl_team_names_to_abbreviations, prohibited_statuses
+from ffmwr.utilities.files import file_lock, write_file_atomically
 from ffmwr.utilities.logger import get_logger
+from ffmwr.utilities.normalization import generate_normalized_player_keys
 from ffmwr.utilities.settings import AppSettings, get_app_settings_from_env_file
-from ffmwr.utilities.utils import format_platform_display, generate_normalized_player_key, get_data_from_web
+from ffmwr.utilities.utils import format_platform_display, get_data_from_web
 
 logger = get_logger(__name__, propagate=False)
 
@@ -284,11 +284,8 @@ def add_report_team_stats(
     settings: AppSettings,
     team: BaseTeam,
     league: BaseLeague,
-    week_counter: int,
     metrics_calculator: CalculateMetrics,
     metrics: Dict[str, Any],
-    dq_ce: bool,
-    inactive_players: List[str],
 ) -> BaseTeam:
     team.name = metrics_calculator.decode_byte_string(team.name)
     bench_positions = league.bench_positions
@@ -331,6 +328,10 @@ def add_report_team_stats(
         team.tabbu = sum([p.beef_tabbu for p in team.roster if p.selected_position not in bench_positions])
 
     if settings.report_settings.league_high_roller_rankings_bool:
+        team.fines_total = 0.0
+        team.worst_violation = None
+        team.worst_violation_fine = 0.0
+        team.num_violators = 0
         p: BasePlayer
         for p in team.roster:
             if p.selected_position not in bench_positions:
@@ -348,18 +349,6 @@ def add_report_team_stats(
         p.selected_position for p in team.roster if p.selected_position not in bench_positions
     ]
 
-    # calculate coaching efficiency and optimal score
-    coaching_efficiency: CoachingEfficiency = metrics.get("coaching_efficiency")
-    team.coaching_efficiency, team.optimal_points = coaching_efficiency.execute_coaching_efficiency(
-        team.name,
-        team.roster,
-        team.points,
-        team.positions_filled_active,
-        int(week_counter),
-        inactive_players,
-        dq_eligible=dq_ce,
-    )
-
     # # retrieve luck and record
     team.luck = metrics.get("luck").get(team.team_id).get("luck")
     team.weekly_overall_record = metrics.get("luck").get(team.team_id).get("luck_record")
@@ -399,7 +388,10 @@ class InjuryReportPlayer(object):
         self.jersey_number = jersey_number
 
 
-def get_inactive_players(week: int, league: BaseLeague) -> List[str]:
+def get_inactive_players(week: int, league: BaseLeague) -> FrozenSet[str]:
+    """Get the normalized player keys of all players inactive in the given week from the injury report as a frozen set
+    for constant time lookups of league players.
+    """
     injured_players_url = "https://www.footballdb.com/transactions/injuries.html"
 
     data_dir = league.data_dir / f"week_{week}" / "players_status_data"
@@ -442,11 +434,8 @@ def get_inactive_players(week: int, league: BaseLeague) -> List[str]:
             sys.exit(1)
 
     if league.save_data:
-        if not Path(data_dir).exists():
-            os.makedirs(data_dir)
-
-        with open(data_file_path, "w", encoding="utf-8") as data_out:
-            data_out.write(html_soup.prettify())
+        with file_lock(data_file_path):
+            write_file_atomically(data_file_path, html_soup.prettify())
 
     injured_players: Dict[str, InjuryReportPlayer] = {}
     injury_report_players_to_check: Dict[str, InjuryReportPlayer] = {}
@@ -535,24 +524,19 @@ def get_inactive_players(week: int, league: BaseLeague) -> List[str]:
                         injured_players[player_url] = injury_report_player
 
     if league.save_data:
-        if not Path(player_data_dir).exists():
-            os.makedirs(player_data_dir)
-
         for player_url, player_page_html in player_pages.items():
-            with open(
-                injury_report_players_to_check[player_url].player_data_file_path, "w", encoding="utf-8"
-            ) as player_html_out:
-                player_html_out.write(player_page_html)
+            player_data_file_path = injury_report_players_to_check[player_url].player_data_file_path
+            with file_lock(player_data_file_path):
+                write_file_atomically(player_data_file_path, player_page_html)
 
     logger.info(
         f"...{'retrieved' if data_retrieved_from_web else 'loaded'} {len(injured_players)} injured players from the "
         f"week {week} injury report in {datetime.now() - start}."
     )
 
-    return [
-        generate_normalized_player_key(player.full_name, player.nfl_team_abbr)
-        for player in sorted(injured_players.values(), key=lambda x: x.full_name)
-    ]
+    return frozenset(
+        generate_normalized_player_keys((player.full_name, player.nfl_team_abbr) for player in injured_players.values())
+    )
 
 
 # function taken from https://stackoverflow.com/a/33117579 (written by 7h3rAm)
@@ -773,4 +757,4 @@ if __name__ == "__main__":
     )
 
     local_inactive_players = get_inactive_players(local_settings.current_nfl_week, local_league)
-    logger.info(f"Local inactive players: {local_inactive_players}")
+    logger.info(f"Local inactive players: {sorted(local_inactive_players)}")
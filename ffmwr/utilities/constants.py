@@ -139,3 +139,6 @@ prohibited_statuses: Dict[str, str] = {
 player_name_punctuation: List[str] = [".", "'"]
 
 player_name_suffixes: List[str] = ["Jr", "Sr", "V", "IV", "III", "II", "I"]  # ordered for str.removesuffix support
+
+# version of the saved data snapshot format written by FFMWRPythonObjectJson.save_to_json_file
+snapshot_schema_version: int = 1
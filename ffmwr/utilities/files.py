@@ -0,0 +1,138 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def get_lock_file_path(file_path: Path) -> Path:
+    """Return the path of the hidden sidecar lock file used to guard writes to the given file."""
+    file_path = Path(file_path)
+    return file_path.parent / f".{file_path.name}.lock"
+
+
+def _lock_file(lock_file: BinaryIO) -> None:
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        lock_file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                # msvcrt.LK_LOCK gives up after 10 attempts, so keep waiting for the lock
+                time.sleep(0.1)
+
+
+def _unlock_file(lock_file: BinaryIO) -> None:
+    if fcntl:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(file_path: Path) -> Iterator[None]:
+    """Hold an exclusive inter-process lock for the given file path for the duration of the context.
+
+    The lock is taken on a sidecar lock file next to the target file, so multiple report processes sharing the same
+    data directory serialize their writes (and downloads) of the same file. The lock file is created when the lock is
+    taken and removed when it is released.
+    """
+    lock_file_path = get_lock_file_path(file_path)
+    lock_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    while True:
+        lock_file = open(lock_file_path, "a+b")
+        _lock_file(lock_file)
+        try:
+            # the lock file may have been removed by the process that held the lock while waiting for it, in which case
+            # the lock is taken again on the lock file path
+            if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(lock_file_path)):
+                break
+        except FileNotFoundError:
+            pass
+        _unlock_file(lock_file)
+        lock_file.close()
+
+    try:
+        yield
+    finally:
+        if fcntl:
+            # remove the lock file while holding the lock, so processes waiting for it take the lock again on a new file
+            lock_file_path.unlink(missing_ok=True)
+            _unlock_file(lock_file)
+            lock_file.close()
+        else:
+            # open files cannot be removed on Windows, so the lock file is only removed if no other process has opened
+            # it to wait for the lock
+            _unlock_file(lock_file)
+            lock_file.close()
+            try:
+                lock_file_path.unlink(missing_ok=True)
+            except PermissionError:
+                pass
+
+
+@contextmanager
+def atomic_file_path(file_path: Path) -> Iterator[Path]:
+    """Provide a temporary file path in the target directory to write to, and atomically replace the target file with
+    the temporary file when the context exits without error. The temporary file keeps the target file extension so
+    writers that infer the file format from the extension (such as image libraries) work as expected.
+    """
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # create the temporary file with the default file permissions (from the umask of the process when it is created)
+    while True:
+        temp_file_path = file_path.parent / f".{file_path.stem}.{uuid.uuid4().hex[:8]}.tmp{file_path.suffix}"
+        try:
+            os.close(os.open(temp_file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+            break
+        except FileExistsError:
+            continue
+
+    try:
+        yield temp_file_path
+        # keep the permissions of the existing target file
+        try:
+            os.chmod(temp_file_path, file_path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_file_path, file_path)
+    except BaseException:
+        temp_file_path.unlink(missing_ok=True)
+        raise
+
+
+def write_file_atomically(file_path: Path, content: str | bytes, encoding: str = "utf-8") -> None:
+    """Write text or binary content to a file so that readers only ever see the previous or the complete new file."""
+    with atomic_file_path(file_path) as temp_file_path:
+        if isinstance(content, bytes):
+            with open(temp_file_path, "wb") as file_out:
+                file_out.write(content)
+                file_out.flush()
+                os.fsync(file_out.fileno())
+        else:
+            with open(temp_file_path, "w", encoding=encoding) as file_out:
+                file_out.write(content)
+                file_out.flush()
+                os.fsync(file_out.fileno())
+
+
+def write_json_file_atomically(json_file_path: Path, data: Any) -> None:
+    """Write JSON data to a file so that readers only ever see the previous or the complete new file."""
+    write_file_atomically(json_file_path, json.dumps(data, ensure_ascii=False, indent=2))
@@ -0,0 +1,41 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from ffmwr.utilities.constants import player_name_punctuation, player_name_suffixes
+
+# maximum number of distinct (player name, NFL team abbreviation) pairs kept in the normalized player key memo, which
+# comfortably holds the full NFL player catalog retrieved for the feature data
+normalized_player_key_cache_size: int = 32768
+
+regex_all_whitespace = re.compile(r"\s+")
+player_name_punctuation_translation_table = str.maketrans("", "", "".join(player_name_punctuation))
+
+
+@lru_cache(maxsize=normalized_player_key_cache_size)
+def generate_normalized_player_key(player_full_name: str, player_nfl_team_abbr: str) -> str:
+    """Remove all punctuation and name suffixes from player names, combine whitespace, covert them to snake case, and
+    append player NFL team abbreviation.
+    """
+    normalized_player_name: str = (
+        regex_all_whitespace.sub(" ", player_full_name).strip().translate(player_name_punctuation_translation_table)
+    )
+
+    for suffix in player_name_suffixes:
+        normalized_player_name = normalized_player_name.removesuffix(suffix)
+
+    return f"{regex_all_whitespace.sub('_', normalized_player_name.strip().lower())}-{player_nfl_team_abbr.lower()}"
+
+
+def generate_normalized_player_keys(players: Iterable[Tuple[str, str]]) -> List[str]:
+    """Generate normalized player keys for a whole roster or player catalog of (player full name, player NFL team
+    abbreviation) pairs in one pass, normalizing each distinct pair only once.
+    """
+    players = list(players)
+    normalized_player_keys = {
+        player: generate_normalized_player_key(*player) for player in dict.fromkeys(players).keys()
+    }
+    return [normalized_player_keys[player] for player in players]
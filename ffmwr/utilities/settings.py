@@ -204,6 +204,8 @@ class ReportSettings(CustomSettings):
     league_coaching_efficiency_rankings_bool: bool = Field(True, title=__qualname__)
     league_luck_rankings_bool: bool = Field(True, title=__qualname__)
     league_optimal_score_rankings_bool: bool = Field(True, title=__qualname__)
+    league_optimal_manager_rankings_bool: bool = Field(False, title=__qualname__)
+    league_decision_quality_rankings_bool: bool = Field(False, title=__qualname__)
     league_bad_boy_rankings_bool: bool = Field(True, title=__qualname__)
     league_beef_rankings_bool: bool = Field(True, title=__qualname__)
     league_high_roller_rankings_bool: bool = Field(True, title=__qualname__)
@@ -216,6 +218,14 @@ class ReportSettings(CustomSettings):
     team_beef_stats_bool: bool = Field(True, title=__qualname__)
     team_high_roller_stats_bool: bool = Field(True, title=__qualname__)
     team_boom_or_bust_bool: bool = Field(True, title=__qualname__)
+    metrics_data_export_bool: bool = Field(
+        False,
+        title=__qualname__,
+        description=(
+            "export the weekly and season metrics as Parquet files alongside the PDF report (requires the optional "
+            '"export" dependencies)'
+        ),
+    )
 
     font: str = Field("helvetica", title=__qualname__, description="set font for report (defaults to Helvetica)")
     supported_fonts_list: List[str] = Field(
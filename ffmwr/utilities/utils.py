@@ -1,15 +1,20 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
+import hashlib
+import json
 import re
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from pyobjson import PythonObjectJson
+from pyobjson.utils import derive_custom_object_key
 from tornado.gen import WaitIterator, coroutine
 from tornado.httpclient import AsyncHTTPClient, HTTPRequest, HTTPResponse
 from tornado.ioloop import IOLoop
 
-from ffmwr.utilities.constants import player_name_punctuation, player_name_suffixes
+from ffmwr.utilities.constants import snapshot_schema_version
+from ffmwr.utilities.files import write_json_file_atomically
 from ffmwr.utilities.logger import get_logger
 
 logger = get_logger(__name__, propagate=False)
@@ -41,6 +46,90 @@ class FFMWRPythonObjectJson(PythonObjectJson):
             ]
         )
 
+    @staticmethod
+    def _get_snapshot_checksum(serialized_data: Dict[str, Any]) -> str:
+        # compact JSON text of the saved data (without whitespace so the checksum does not depend on file formatting),
+        # which is the same before saving and after loading since JSON keeps key order and converts all keys to strings
+        compact_json = json.dumps(serialized_data, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(compact_json.encode("utf-8")).hexdigest()
+
+    def _validate_snapshot_data(self, serialized_data: Any, json_file_path: Path) -> None:
+        """Check that saved data has the structure of a serialized instance of this class and only references known
+        custom classes.
+        """
+        class_key = derive_custom_object_key(self.__class__)
+        if not (
+            isinstance(serialized_data, dict)
+            and list(serialized_data.keys()) == [class_key]
+            and isinstance(serialized_data[class_key], dict)
+        ):
+            raise ValueError(f"Saved data in {json_file_path} is not a serialized {self.__class__.__name__} instance.")
+
+        known_class_keys = set(self._base_subclasses().keys())
+        nodes = [serialized_data[class_key]]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if key.startswith("ffmwr.") and key not in known_class_keys:
+                        raise ValueError(f'Saved data in {json_file_path} contains unknown class "{key}".')
+                    nodes.append(value)
+            elif isinstance(node, list):
+                nodes.extend(node)
+
+    def save_to_json_file(self, json_file_path: Path) -> None:
+        """Save the class instance to a JSON snapshot stamped with the snapshot schema version and a checksum of its
+        contents. The snapshot is written to a temporary file and renamed into place so readers never see a partially
+        written file.
+        """
+        serialized_data = self.serialize()
+        snapshot = {
+            "ffmwr_snapshot": {
+                "schema_version": snapshot_schema_version,
+                "checksum": self._get_snapshot_checksum(serialized_data),
+            },
+            "data": serialized_data,
+        }
+        write_json_file_atomically(json_file_path, snapshot)
+
+    def load_from_json_file(self, json_file_path: Path) -> None:
+        """Load the class instance from a JSON snapshot. Snapshots with a mismatched checksum cannot be loaded, while
+        legacy saved data without snapshot metadata is validated first.
+        """
+        if not json_file_path.exists():
+            raise FileNotFoundError(f"File {json_file_path} does not exist. Unable to load saved data.")
+
+        try:
+            with open(json_file_path, "r", encoding="utf-8") as json_file_in:
+                saved_data = json.load(json_file_in)
+        except json.JSONDecodeError as e:
+            raise ValueError(
+                f"Saved data in {json_file_path} is corrupted and cannot be loaded. Delete the file and regenerate it."
+            ) from e
+
+        if isinstance(saved_data, dict) and "ffmwr_snapshot" in saved_data:
+            snapshot_metadata = saved_data["ffmwr_snapshot"]
+            serialized_data = saved_data.get("data")
+
+            if snapshot_metadata.get("schema_version") != snapshot_schema_version:
+                raise ValueError(
+                    f"Saved data in {json_file_path} has unsupported snapshot schema version "
+                    f"{snapshot_metadata.get('schema_version')} (supported version: {snapshot_schema_version}). "
+                    f"Delete the file and regenerate it."
+                )
+
+            if snapshot_metadata.get("checksum") != self._get_snapshot_checksum(serialized_data):
+                raise ValueError(
+                    f"Saved data in {json_file_path} does not match its checksum and cannot be loaded. Delete the file "
+                    f"and regenerate it."
+                )
+        else:
+            logger.debug(f"Saved data in {json_file_path} has no snapshot metadata. Validating saved data...")
+            serialized_data = saved_data
+            self._validate_snapshot_data(serialized_data, json_file_path)
+
+        self.deserialize(serialized_data)
+
 
 def normalize_dependency_package_name(package_name: str) -> str:
     # normalize Python package name (see https://packaging.python.org/en/latest/specifications/name-normalization/)
@@ -77,27 +166,6 @@ def truncate_cell_for_display(
         return cell_text
 
 
-def generate_normalized_player_key(player_full_name: str, player_nfl_team_abbr: str) -> str:
-    """Remove all punctuation and name suffixes from player names, combine whitespace, covert them to snake case, and
-    append player NFL team abbreviation.
-    """
-    regex_all_whitespace = re.compile(r"\s+")
-    normalized_player_name: str = regex_all_whitespace.sub(" ", player_full_name).strip()
-
-    if any(punc in player_full_name for punc in player_name_punctuation) or any(
-        suffix in player_full_name for suffix in player_name_suffixes
-    ):
-        for punc in player_name_punctuation:
-            normalized_player_name = normalized_player_name.replace(punc, "")
-
-        for suffix in player_name_suffixes:
-            normalized_player_name = normalized_player_name.removesuffix(suffix)
-
-    return (
-        f"{regex_all_whitespace.sub('_', normalized_player_name.strip().lower())}-{player_nfl_team_abbr.lower()}"
-    )
-
-
 def get_data_from_web(
     urls: List[str],
     method: str,
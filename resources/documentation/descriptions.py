@@ -76,6 +76,24 @@ team_luck_rankings = (
 
 team_optimal_score_rankings = "Teams ranked by highest optimal score."
 
+team_optimal_manager_rankings = (
+    "Teams ranked by the record they would have had if their manager had started their optimal lineup every week of "
+    "the season. Every matchup of every completed week is replayed with each team's optimal points against their "
+    "opponent's actual points, and teams with the same optimal lineup record are ranked by the fewest total points "
+    "left on the bench (optimal points minus actual points) on the season."
+)
+
+team_decision_quality_rankings = (
+    "Teams ranked by lineup decision quality, which judges managers on player projected points instead of on the "
+    "points players actually scored. Every week of the season, the optimal lineup of each team is found by projected "
+    "points, and decision quality is the percentage of the season total projected points of those projected optimal "
+    "lineups that the starting lineups of the team were projected to score. Proj. Lineup Pts is the season total of "
+    "the points the projected optimal lineups actually scored, which can be compared to the season total points of "
+    "the starting lineups and of the optimal lineups. Note: player projected points are the ones the league platform "
+    "reports when the report is generated, not a snapshot taken at lineup lock, so they may include projection "
+    "updates made after lineups were set."
+)
+
 bad_boy_rankings = (
     "The Bad Boy ranking is a \"just-for-fun\" metric that pulls NFL player arrest history from the "
     "<a href=\"https://www.usatoday.com/sports/nfl/arrests/\" color=blue><u>USA Today NFL player arrest "
@@ -0,0 +1,75 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.metrics import CalculateMetrics  # noqa: E402
+from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseRecord, BaseTeam  # noqa: E402
+from ffmwr.utilities.app import add_report_team_stats  # noqa: E402
+from ffmwr.utilities.settings import AppSettings  # noqa: E402
+
+
+class FakeHighRollerStats(object):
+    """High roller feature stats with a fixed fine for every player."""
+
+    @staticmethod
+    def get_player_worst_violation(*args) -> str:
+        return "Unsportsmanlike Conduct"
+
+    @staticmethod
+    def get_player_worst_violation_fine(*args) -> float:
+        return 10000.0
+
+    @staticmethod
+    def get_player_fines_total(*args) -> float:
+        return 15000.0
+
+    @staticmethod
+    def get_player_num_violators(*args) -> int:
+        return 1
+
+
+@pytest.mark.unit
+def test_report_team_stats_are_the_same_when_added_again(tmp_path):
+    settings = AppSettings()
+    settings.report_settings.league_bad_boy_rankings_bool = False
+    settings.report_settings.league_beef_rankings_bool = False
+    settings.report_settings.league_high_roller_rankings_bool = True
+
+    league = BaseLeague(settings, "test", "1", 2023, 1, root_dir, tmp_path)
+    league.bench_positions = ["BN", "IR"]
+
+    team = BaseTeam()
+    team.team_id = "1"
+    team.name = "Team 1"
+    team.points = 30.0
+    for player_id, selected_position, points in [("10", "QB", 20.0), ("20", "WR", 10.0), ("30", "BN", 5.0)]:
+        player = BasePlayer()
+        player.player_id = player_id
+        player.selected_position = selected_position
+        player.points = points
+        team.roster.append(player)
+
+    record = BaseRecord(1, wins=1, points_for=30.0, points_against=20.0, team_id="1")
+    metrics = {
+        "high_roller_stats": FakeHighRollerStats(),
+        "luck": {"1": {"luck": 50.0, "luck_record": BaseRecord(1, wins=1)}},
+        "records": {"1": record},
+    }
+
+    # the report data of a week can be calculated more than once, so the team stats must not accumulate
+    for _ in range(2):
+        add_report_team_stats(settings, team, league, CalculateMetrics("1", 0, None), metrics)
+
+        assert team.fines_total == 30000.0
+        assert team.num_violators == 2
+        assert team.worst_violation_fine == 10000.0
+        assert team.bench_points == 5.0
+        assert team.luck == 50.0
+        assert team.record is record
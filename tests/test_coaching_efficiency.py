@@ -0,0 +1,119 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Set
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.coaching_efficiency import CoachingEfficiency  # noqa: E402
+from ffmwr.models.base.model import BaseLeague, BasePlayer  # noqa: E402
+
+
+def get_test_league(roster_position_counts: Dict[str, int], tmp_path: Path) -> BaseLeague:
+    league = BaseLeague(None, "test", "1", 2023, 1, root_dir, tmp_path)
+    league.roster_position_counts.update(roster_position_counts)
+    league.bench_positions = ["BN", "IR"]
+    league.roster_active_slots = [
+        pos for pos, count in roster_position_counts.items() if pos not in league.bench_positions for _ in range(count)
+    ]
+    league.flex_positions_rb_te_wr = ["RB", "TE", "WR"]
+    league.flex_positions_idp = ["DB", "DL", "LB"]
+    return league
+
+
+def get_test_player(
+    full_name: str, points: float, eligible_positions: Set[str], selected_position: str = "BN"
+) -> BasePlayer:
+    player = BasePlayer()
+    player.player_id = full_name
+    player.full_name = full_name
+    player.points = points
+    player.eligible_positions = eligible_positions
+    player.selected_position = selected_position
+    return player
+
+
+def get_optimal_lineup_names(optimal_lineup: Dict[str, List[BasePlayer]]) -> Dict[str, List[str]]:
+    return {pos: [player.full_name for player in players] for pos, players in optimal_lineup.items()}
+
+
+@pytest.mark.unit
+def test_optimal_lineup_matches_greedy_lineup_for_single_position_players(tmp_path):
+    league = get_test_league({"QB": 1, "RB": 2, "WR": 2, "TE": 1, "FLEX": 1, "BN": 4, "IR": 1}, tmp_path)
+    team_roster = [
+        get_test_player("QB1", 22.5, {"QB"}),
+        get_test_player("QB2", 18.0, {"QB"}),
+        get_test_player("RB1", 15.0, {"RB", "FLEX"}),
+        get_test_player("RB2", 11.0, {"RB", "FLEX"}),
+        get_test_player("RB3", 9.5, {"RB", "FLEX"}),
+        get_test_player("WR1", 20.0, {"WR", "FLEX"}),
+        get_test_player("WR2", 8.0, {"WR", "FLEX"}),
+        get_test_player("WR3", 7.0, {"WR", "FLEX"}),
+        get_test_player("TE1", 6.0, {"TE", "FLEX"}),
+        get_test_player("TE2", 10.0, {"TE", "FLEX"}),
+    ]
+
+    coaching_efficiency = CoachingEfficiency(league)
+    optimal_lineup = coaching_efficiency.get_optimal_lineup(team_roster)
+
+    # filling each position with its highest-scoring players and the flex with the best remaining player is optimal
+    assert get_optimal_lineup_names(optimal_lineup) == {
+        "QB": ["QB1"],
+        "RB": ["RB1", "RB2"],
+        "WR": ["WR1", "WR2"],
+        "TE": ["TE2"],
+        "FLEX": ["RB3"],
+    }
+    assert coaching_efficiency.execute_coaching_efficiency("team", team_roster, 76.0, [], 1, frozenset()) == (
+        pytest.approx(76.0 / 96.0 * 100),
+        96.0,
+    )
+
+
+@pytest.mark.unit
+def test_optimal_lineup_moves_players_across_multiple_idp_positions(tmp_path):
+    league = get_test_league({"DL": 2, "LB": 2, "DB": 2, "FLEX_IDP": 1, "BN": 4, "IR": 1}, tmp_path)
+    team_roster = [
+        get_test_player("DB/DL", 20.0, {"DB", "DL", "FLEX_IDP"}),
+        get_test_player("LB1", 13.0, {"LB", "FLEX_IDP"}),
+        get_test_player("DB1", 9.0, {"DB", "FLEX_IDP"}),
+        get_test_player("DB2", 7.0, {"DB", "FLEX_IDP"}),
+        get_test_player("DB/LB", 6.0, {"DB", "LB", "FLEX_IDP"}),
+        get_test_player("LB2", 5.0, {"LB", "FLEX_IDP"}),
+        get_test_player("LB3", 4.0, {"LB", "FLEX_IDP"}),
+    ]
+
+    optimal_lineup = CoachingEfficiency(league).get_optimal_lineup(team_roster)
+
+    # the DB/DL player is the only player who can fill a DL slot, so the DB players must move down the DB and flex
+    # slots to make room for them (assigning players to their first open position leaves the DL slots empty and scores
+    # 55.0 points)
+    assert sorted(player.full_name for player in optimal_lineup["DL"]) == ["DB/DL"]
+    assert sum(player.points for players in optimal_lineup.values() for player in players) == 60.0
+    assert "LB3" not in [player.full_name for players in optimal_lineup.values() for player in players]
+
+
+@pytest.mark.unit
+def test_optimal_lineup_leaves_slots_without_eligible_players_empty(tmp_path):
+    league = get_test_league({"QB": 1, "RB": 2, "K": 1, "DEF": 1, "BN": 2, "IR": 1}, tmp_path)
+    team_roster = [
+        get_test_player("QB1", 12.0, {"QB"}),
+        get_test_player("RB1", 8.0, {"RB"}),
+        get_test_player("RB2", 30.0, {"RB"}, selected_position="IR"),
+        get_test_player("DEF1", 4.0, {"DEF"}),
+    ]
+
+    coaching_efficiency = CoachingEfficiency(league)
+    optimal_lineup = coaching_efficiency.get_optimal_lineup(team_roster)
+
+    # players on IR are never part of the optimal lineup
+    assert get_optimal_lineup_names(optimal_lineup) == {"QB": ["QB1"], "RB": ["RB1"], "K": [], "DEF": ["DEF1"]}
+    assert coaching_efficiency.execute_coaching_efficiency("team", team_roster, 24.0, [], 1, frozenset()) == (
+        100.0,
+        24.0,
+    )
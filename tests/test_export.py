@@ -0,0 +1,118 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.tables import MetricTableRow, MetricValue  # noqa: E402
+from ffmwr.models.base.model import BaseTeam  # noqa: E402
+from ffmwr.report.export import MetricsDataExporter  # noqa: E402
+
+team_ids = ["1", "2"]
+
+
+def get_test_team(team_id: str) -> BaseTeam:
+    team = BaseTeam()
+    team.team_id = team_id
+    team.name = f"Team {team_id}"
+    team.manager_str = f"Manager {team_id}"
+    return team
+
+
+def get_test_weekly_summaries() -> Dict[int, Dict[str, Any]]:
+    # weekly summary team data is [team id, name, manager, points, coaching efficiency, luck, optimal points, z-score,
+    # power ranking]
+    return {
+        1: {
+            "teams": [
+                ["1", "Team 1", "Manager 1", 100.0, 90.91, 0.0, 110.0, None, 1.0],
+                ["2", "Team 2", "Manager 2", 90.0, "DQ", 100.0, 95.0, None, 2.0],
+            ],
+            "weekly_points_by_position": [["1", [["QB", 20.0], ["WR", 30.5]]], ["2", [["QB", 15.0], ["WR", 25.0]]]],
+        },
+        2: {
+            "teams": [
+                ["1", "Team 1", "Manager 1", 80.0, 88.89, -100.0, 90.0, -1.0, 2.0],
+                ["2", "Team 2", "Manager 2", 120.0, 100.0, 0.0, 120.0, 1.0, 1.0],
+            ],
+            "weekly_points_by_position": [["1", [["QB", 10.0], ["WR", 20.0]]], ["2", [["QB", 25.0], ["WR", 35.0]]]],
+        },
+    }
+
+
+def get_test_season_table(season_values: Dict[str, MetricValue]) -> list:
+    return [
+        MetricTableRow(team_id, [place, f"Team {team_id}", f"Manager {team_id}", season_value])
+        for place, (team_id, season_value) in enumerate(season_values.items(), start=1)
+    ]
+
+
+def get_test_report_data() -> SimpleNamespace:
+    return SimpleNamespace(
+        teams_results={team_id: get_test_team(team_id) for team_id in team_ids},
+        data_for_scores=get_test_season_table({"2": MetricValue(105.0, place=1), "1": MetricValue(90.0, place=2)}),
+        data_for_coaching_efficiency=get_test_season_table(
+            {"2": MetricValue(100.0, place=1), "1": MetricValue(89.9, place=2)}
+        ),
+        data_for_luck=get_test_season_table({"2": MetricValue(50.0, place=1), "1": MetricValue(-50.0, place=2)}),
+        data_for_optimal_scores=get_test_season_table(
+            {"2": MetricValue(215.0, place=1), "1": MetricValue(200.0, place=2)}
+        ),
+        # season power rankings are not available without a previous week
+        data_for_power_rankings=None,
+        data_for_season_avg_points_by_position={"1": [["QB", 15.0], ["WR", 25.25]], "2": [["QB", 20.0], ["WR", 30.0]]},
+        playoff_probs_by_team_id={
+            "1": ["Team 1", 60.0, [40.0, 20.0], 3, True, False],
+            "2": ["Team 2", 40.0, [20.0, 20.0], 4, False, True],
+        },
+    )
+
+
+@pytest.mark.unit
+def test_metrics_data_export_writes_parquet_files_that_read_back_as_the_metrics_data(tmp_path):
+    polars = pytest.importorskip("polars")
+
+    exporter = MetricsDataExporter(get_test_report_data(), get_test_weekly_summaries(), tmp_path / "export")
+    exported_file_paths = exporter.export()
+
+    assert [exported_file_path.name for exported_file_path in exported_file_paths] == [
+        "weekly_team_metrics.parquet",
+        "weekly_points_by_position.parquet",
+        "season_team_metrics.parquet",
+        "season_points_by_position.parquet",
+        "playoff_probabilities.parquet",
+    ]
+    assert sorted(path.name for path in (tmp_path / "export").iterdir()) == sorted(
+        exported_file_path.name for exported_file_path in exported_file_paths
+    )
+
+    metrics_data = {
+        exported_file_path.stem: polars.read_parquet(exported_file_path) for exported_file_path in exported_file_paths
+    }
+    assert metrics_data["weekly_team_metrics"].to_dict(as_series=False) == exporter.get_weekly_team_metrics()
+    assert (
+        metrics_data["weekly_points_by_position"].to_dict(as_series=False) == exporter.get_weekly_points_by_position()
+    )
+    assert metrics_data["season_team_metrics"].to_dict(as_series=False) == exporter.get_season_team_metrics()
+    assert (
+        metrics_data["season_points_by_position"].to_dict(as_series=False) == exporter.get_season_points_by_position()
+    )
+    assert metrics_data["playoff_probabilities"].to_dict(as_series=False) == exporter.get_playoff_probabilities()
+
+    # disqualified coaching efficiencies and missing z-scores and season values are typed nulls
+    weekly_team_metrics = metrics_data["weekly_team_metrics"]
+    assert weekly_team_metrics.schema["coaching_efficiency"] == polars.Float64
+    assert weekly_team_metrics.schema["coaching_efficiency_disqualified"] == polars.Boolean
+    assert weekly_team_metrics["coaching_efficiency"].to_list() == [90.91, None, 88.89, 100.0]
+    assert weekly_team_metrics["z_score"].to_list() == [None, None, -1.0, 1.0]
+    season_team_metrics = metrics_data["season_team_metrics"]
+    assert season_team_metrics["season_avg_points_place"].to_list() == [2, 1]
+    assert season_team_metrics["season_avg_power_ranking"].to_list() == [None, None]
+    assert metrics_data["playoff_probabilities"]["place_2_chance"].to_list() == [20.0, 20.0]
@@ -1,10 +1,16 @@
 __author__ = "Wren J. R. (uberfastman)"
 __email__ = "uberfastman@uberfastman.dev"
 
+import json
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Set, Tuple
+from urllib.parse import parse_qs
 
 import pytest
+import requests
+from requests.exceptions import ConnectTimeout
 
 root_dir = Path(__file__).parent.parent
 sys.path.append(str(root_dir))
@@ -54,6 +60,158 @@ def test_bad_boy_init():
     assert bad_boy_feature.feature_data is not None
 
 
+class FakeUsaTodayNflArrestsDatabase(object):
+    """Fake USA Today NFL arrests database web server, which records the requested pages of arrests of each team."""
+
+    def __init__(self):
+        self.arrests_by_team: Dict[str, List[Dict[str, Any]]] = {}
+        self.requested_pages: List[Tuple[str, int]] = []
+        self.failed_pages: Set[Tuple[str, int]] = set()
+
+    @staticmethod
+    def get_arrest(team: str, case_number: int) -> Dict[str, Any]:
+        return {
+            "First_name": "Player",
+            "Last_name": f"Number{case_number}",
+            "Team": team,
+            "Date": f"2020-01-{case_number % 28 + 1:02d}",
+            "Position": "WR",
+            "Case_1": f"case {case_number}",
+            "Category": "alcohol",
+            "Description": "description",
+            "Outcome": "outcome",
+        }
+
+    def get(self, url: str, *args, **kwargs) -> SimpleNamespace:
+        return SimpleNamespace(
+            text='<script>/* <![CDATA[ */ var sitedata = {"ajax_nonce": "nonce"}; /* ]]> */</script>'
+        )
+
+    def post(self, url: str, data: str = None, headers: Dict[str, str] = None) -> SimpleNamespace:
+        query = {key: values[0] for key, values in parse_qs(data).items()}
+        team = json.loads(query["searches"])["Team"]
+        page = int(query["page"])
+
+        self.requested_pages.append((team, page))
+        if (team, page) in self.failed_pages:
+            raise ConnectTimeout("Connection timed out.")
+
+        team_arrests = self.arrests_by_team.get(team, [])
+        response_json = {
+            "data": {"Result": team_arrests[(page - 1) * 20 : page * 20], "totalResults": len(team_arrests)}
+        }
+        return SimpleNamespace(json=lambda: response_json)
+
+    def get_requested_pages(self, team: str) -> List[int]:
+        return [page for requested_team, page in self.requested_pages if requested_team == team]
+
+
+@pytest.fixture
+def usa_today_nfl_arrests_database(monkeypatch) -> FakeUsaTodayNflArrestsDatabase:
+    arrests_database = FakeUsaTodayNflArrestsDatabase()
+    arrests_database.arrests_by_team["SEA"] = [arrests_database.get_arrest("SEA", case) for case in range(45, 0, -1)]
+    monkeypatch.setattr(requests, "get", arrests_database.get)
+    monkeypatch.setattr(requests, "post", arrests_database.post)
+    return arrests_database
+
+
+def get_bad_boy_feature(data_dir: Path, save_data: bool = True) -> BadBoyFeature:
+    return BadBoyFeature(
+        week_for_report=week_for_report,
+        root_dir=root_dir,
+        data_dir=data_dir,
+        refresh=True,
+        save_data=save_data,
+        offline=False,
+    )
+
+
+def load_arrests_data(data_dir: Path) -> Dict[str, Any]:
+    with open(data_dir / "feature_data" / "bad_boy_arrests.json", "r", encoding="utf-8") as arrests_data_in:
+        return json.load(arrests_data_in)
+
+
+@pytest.mark.unit
+def test_bad_boy_arrests_sync_stops_at_known_arrests(tmp_path, usa_today_nfl_arrests_database):
+    get_bad_boy_feature(tmp_path)
+    assert usa_today_nfl_arrests_database.get_requested_pages("SEA") == [1, 2, 3]
+
+    new_arrests = [usa_today_nfl_arrests_database.get_arrest("SEA", case) for case in (47, 46)]
+    usa_today_nfl_arrests_database.arrests_by_team["SEA"] = (
+        new_arrests + usa_today_nfl_arrests_database.arrests_by_team["SEA"]
+    )
+    usa_today_nfl_arrests_database.requested_pages.clear()
+    get_bad_boy_feature(tmp_path)
+
+    # the new arrests and the first known arrest are all on the first page
+    assert usa_today_nfl_arrests_database.get_requested_pages("SEA") == [1]
+    assert load_arrests_data(tmp_path)["arrests"]["SEA"] == usa_today_nfl_arrests_database.arrests_by_team["SEA"]
+
+
+@pytest.mark.unit
+def test_bad_boy_feature_data_is_updated_with_new_arrests(tmp_path, usa_today_nfl_arrests_database):
+    get_bad_boy_feature(tmp_path / "synced")
+
+    new_arrests = [
+        usa_today_nfl_arrests_database.get_arrest("SEA", 47),
+        {**usa_today_nfl_arrests_database.get_arrest("SEA", 46), "Position": "LB", "Category": "assault"},
+    ]
+    usa_today_nfl_arrests_database.arrests_by_team["SEA"] = (
+        new_arrests + usa_today_nfl_arrests_database.arrests_by_team["SEA"]
+    )
+    usa_today_nfl_arrests_database.requested_pages.clear()
+    synced_bad_boy_feature = get_bad_boy_feature(tmp_path / "synced")
+
+    # only the new arrests are added to the feature data of the known arrests, which matches the feature data of all
+    # arrests retrieved at once
+    assert usa_today_nfl_arrests_database.get_requested_pages("SEA") == [1]
+    assert synced_bad_boy_feature.feature_data["SEA"]["offenders"] == ["Player Number46"]
+    assert synced_bad_boy_feature.feature_data["SEA"]["worst_offense"] == "ASSAULT"
+    assert synced_bad_boy_feature.feature_data == get_bad_boy_feature(tmp_path / "retrieved").feature_data
+
+
+@pytest.mark.unit
+def test_bad_boy_arrests_sync_retrieves_all_arrests_when_known_arrests_are_removed(
+    tmp_path, usa_today_nfl_arrests_database
+):
+    get_bad_boy_feature(tmp_path)
+
+    del usa_today_nfl_arrests_database.arrests_by_team["SEA"][10]
+    usa_today_nfl_arrests_database.requested_pages.clear()
+    get_bad_boy_feature(tmp_path)
+
+    # the synced arrests do not match the total number of arrests, so all pages of arrests are retrieved again
+    assert usa_today_nfl_arrests_database.get_requested_pages("SEA") == [1, 2, 3]
+    assert load_arrests_data(tmp_path)["arrests"]["SEA"] == usa_today_nfl_arrests_database.arrests_by_team["SEA"]
+
+
+@pytest.mark.unit
+def test_bad_boy_arrests_sync_keeps_known_arrests_when_arrests_cannot_be_retrieved(
+    tmp_path, usa_today_nfl_arrests_database
+):
+    get_bad_boy_feature(tmp_path)
+    known_arrests = list(usa_today_nfl_arrests_database.arrests_by_team["SEA"])
+
+    usa_today_nfl_arrests_database.arrests_by_team["SEA"].insert(
+        0, usa_today_nfl_arrests_database.get_arrest("SEA", 46)
+    )
+    usa_today_nfl_arrests_database.failed_pages.add(("SEA", 1))
+    usa_today_nfl_arrests_database.requested_pages.clear()
+    bad_boy_feature = get_bad_boy_feature(tmp_path)
+
+    # every attempt to retrieve the first page fails, so the known arrests are used
+    assert usa_today_nfl_arrests_database.get_requested_pages("SEA") == [1, 1, 1]
+    assert load_arrests_data(tmp_path)["arrests"]["SEA"] == known_arrests
+    assert len(bad_boy_feature.raw_feature_data) > 0
+
+
+@pytest.mark.unit
+def test_bad_boy_arrests_are_not_saved_without_save_data(tmp_path, usa_today_nfl_arrests_database):
+    get_bad_boy_feature(tmp_path, save_data=False)
+
+    assert not (tmp_path / "feature_data" / "bad_boy_arrests.json").exists()
+
+
 @pytest.mark.integration
 def test_beef_init():
     beef_feature = BeefFeature(
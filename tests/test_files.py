@@ -0,0 +1,59 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import os
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.utilities.files import file_lock, get_lock_file_path, write_file_atomically  # noqa: E402
+
+
+def increment_counter_file(counter_file_path: Path, increments: int = 50) -> None:
+    for _ in range(increments):
+        with file_lock(counter_file_path):
+            count = int(counter_file_path.read_text()) if counter_file_path.exists() else 0
+            write_file_atomically(counter_file_path, str(count + 1))
+
+
+@pytest.mark.unit
+def test_file_lock_removes_lock_file_on_release(tmp_path):
+    file_path = tmp_path / "data.json"
+
+    with file_lock(file_path):
+        assert get_lock_file_path(file_path).exists()
+
+    assert not get_lock_file_path(file_path).exists()
+
+
+@pytest.mark.unit
+def test_file_lock_serializes_writes_of_processes(tmp_path):
+    counter_file_path = tmp_path / "counter.txt"
+
+    with Pool(4) as pool:
+        pool.map(increment_counter_file, [counter_file_path] * 4)
+
+    assert counter_file_path.read_text() == "200"
+    assert os.listdir(tmp_path) == ["counter.txt"]
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(os.name == "nt", reason="file permissions are not set from the umask on Windows")
+def test_write_file_atomically_uses_umask_when_writing_and_keeps_existing_permissions(tmp_path):
+    file_path = tmp_path / "data.json"
+
+    process_umask = os.umask(0o077)
+    try:
+        write_file_atomically(file_path, "{}")
+    finally:
+        os.umask(process_umask)
+    assert file_path.stat().st_mode & 0o777 == 0o600
+
+    os.chmod(file_path, 0o644)
+    write_file_atomically(file_path, "{}")
+    assert file_path.stat().st_mode & 0o777 == 0o644
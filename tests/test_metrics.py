@@ -0,0 +1,153 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.metrics import CalculateMetrics  # noqa: E402
+from ffmwr.calculate.tables import MetricTableRow, MetricValue  # noqa: E402
+from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam  # noqa: E402
+
+
+def get_test_teams(points_by_team_id: Dict[str, float]) -> Dict[str, BaseTeam]:
+    teams = {}
+    for team_id, points in points_by_team_id.items():
+        team = BaseTeam()
+        team.team_id = team_id
+        team.name = f"Team {team_id}"
+        team.points = points
+        teams[team_id] = team
+    return teams
+
+
+def get_test_league(points_by_team_id_by_week: Dict[int, Dict[str, float]], tmp_path: Path) -> BaseLeague:
+    league = BaseLeague(None, "test", "1", 2023, max(points_by_team_id_by_week), root_dir, tmp_path)
+    league.teams_by_week = {
+        str(week): get_test_teams(points_by_team_id) for week, points_by_team_id in points_by_team_id_by_week.items()
+    }
+    return league
+
+
+def get_test_matchups(results_by_team_id: Dict[str, str]) -> List[Dict[str, Dict[str, str]]]:
+    # only the matchup results of teams are used to calculate luck
+    return [{team_id: {"result": result}} for team_id, result in results_by_team_id.items()]
+
+
+@pytest.mark.unit
+def test_luck_is_calculated_from_all_play_records(tmp_path):
+    league = get_test_league({1: {"A": 100.0, "B": 95.0, "C": 90.0, "D": 80.0}}, tmp_path)
+
+    luck_results = CalculateMetrics.calculate_luck(
+        1, league, get_test_matchups({"A": "W", "B": "W", "C": "L", "D": "L"})
+    )
+
+    assert {team_id: team_luck["luck"] for team_id, team_luck in luck_results.items()} == pytest.approx(
+        {"A": 0.0, "B": 100 / 3, "C": -100 / 3, "D": 0.0}
+    )
+    luck_record = luck_results["B"]["luck_record"]
+    assert (luck_record.get_wins(), luck_record.get_losses(), luck_record.get_ties()) == (2, 1, 0)
+
+
+@pytest.mark.unit
+def test_luck_counts_tied_scores_as_all_play_ties(tmp_path):
+    league = get_test_league({1: {"A": 90.0, "B": 90.0, "C": 85.0, "D": 100.0}}, tmp_path)
+
+    luck_results = CalculateMetrics.calculate_luck(
+        1, league, get_test_matchups({"A": "T", "B": "T", "C": "L", "D": "W"})
+    )
+
+    luck_record = luck_results["B"]["luck_record"]
+    assert (luck_record.get_wins(), luck_record.get_losses(), luck_record.get_ties()) == (1, 1, 1)
+    assert luck_results["B"]["luck"] == pytest.approx(200 / 3)
+
+
+@pytest.mark.unit
+def test_season_luck_matches_weekly_luck(tmp_path):
+    league = get_test_league(
+        {
+            1: {"A": 100.0, "B": 95.0, "C": 90.0, "D": 80.0},
+            2: {"A": 90.0, "B": 90.0, "C": 85.0, "D": 100.0},
+            # weeks with different teams are calculated individually
+            3: {"A": 70.0, "B": 120.0, "C": 110.0},
+        },
+        tmp_path,
+    )
+    matchups_by_week = {
+        1: get_test_matchups({"A": "W", "B": "W", "C": "L", "D": "L"}),
+        2: get_test_matchups({"A": "T", "B": "T", "C": "L", "D": "W"}),
+        3: get_test_matchups({"A": "L", "B": "W", "C": "W"}),
+    }
+
+    season_luck_results = CalculateMetrics.calculate_season_luck(league, matchups_by_week)
+
+    assert list(season_luck_results.keys()) == [1, 2, 3]
+    for week, matchups in matchups_by_week.items():
+        luck_results = CalculateMetrics.calculate_luck(week, league, matchups)
+        assert season_luck_results[week].keys() == luck_results.keys()
+        for team_id, team_luck in luck_results.items():
+            season_team_luck = season_luck_results[week][team_id]
+            assert season_team_luck["luck"] == team_luck["luck"]
+            assert season_team_luck["luck_record"].get_wins() == team_luck["luck_record"].get_wins()
+            assert season_team_luck["luck_record"].get_losses() == team_luck["luck_record"].get_losses()
+            assert season_team_luck["luck_record"].get_ties() == team_luck["luck_record"].get_ties()
+
+
+@pytest.mark.unit
+def test_season_z_scores_compare_scores_to_previous_weeks():
+    weekly_points = [
+        {"A": 100.0, "B": 80.0},
+        {"A": 120.0, "B": 80.0},
+        {"A": 90.0, "B": 80.0},
+        {"A": 130.0, "B": 95.0},
+    ]
+    weekly_teams_results = [get_test_teams(points_by_team_id) for points_by_team_id in weekly_points]
+
+    season_z_scores = CalculateMetrics.calculate_season_z_scores(weekly_teams_results)
+
+    # z-scores require at least two previous weeks
+    assert season_z_scores[:2] == [{"A": None, "B": None}, {"A": None, "B": None}]
+    for week_ndx in range(2, len(weekly_points)):
+        previous_scores = np.array([[week["A"], week["B"]] for week in weekly_points[:week_ndx]])
+        expected_a = (weekly_points[week_ndx]["A"] - previous_scores[:, 0].mean()) / previous_scores[:, 0].std()
+        assert season_z_scores[week_ndx]["A"] == pytest.approx(expected_a)
+        # teams without any variation in their previous scores have a z-score of zero
+        assert season_z_scores[week_ndx]["B"] == 0
+
+
+@pytest.mark.unit
+def test_coaching_efficiency_ties_are_resolved_with_the_rosters_of_the_tied_teams(tmp_path):
+    # both teams have the same name, so the rosters of the tied teams must be found by team id
+    league = get_test_league({1: {"1": 10.0, "2": 10.0}, 2: {"1": 20.0, "2": 5.0}}, tmp_path)
+    league.bench_positions = ["BN", "IR"]
+    for week, teams in league.teams_by_week.items():
+        league.players_by_week[week] = {}
+        for team_id, team in teams.items():
+            team.name = "Same Name"
+            player = BasePlayer()
+            player.player_id = f"{team_id}0"
+            player.selected_position = "QB"
+            player.points = team.points
+            team.roster.append(player)
+            league.players_by_week[week][player.player_id] = player
+
+    data_for_coaching_efficiency = [
+        MetricTableRow(team_id, ["1*", "Same Name", f"Manager {team_id}", MetricValue(95.0, "{:.2f}%")])
+        for team_id in ["2", "1"]
+    ]
+
+    resolved_data_for_coaching_efficiency = CalculateMetrics.resolve_coaching_efficiency_ties(
+        data_for_coaching_efficiency, 1, league, 2, 2, True
+    )
+
+    # the starter of team 1 exceeded their season average by 100%, while the starter of team 2 did not exceed theirs
+    assert [(row.team_id, row[0], row[-2], row[-1]) for row in resolved_data_for_coaching_efficiency] == [
+        ("1", 1, 1, 100.0),
+        ("2", 2, 0, 0),
+    ]
@@ -0,0 +1,95 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.optimal_manager import OptimalManagerBacktest  # noqa: E402
+from ffmwr.models.base.model import BaseLeague, BaseMatchup, BaseRecord, BaseTeam  # noqa: E402
+
+team_ids = ["1", "2", "3", "4"]
+
+# points and optimal points of every team and the matchups of every week
+weekly_points = {
+    1: {"1": (100.0, 110.0), "2": (105.0, 105.0), "3": (90.0, 120.0), "4": (95.0, 100.0)},
+    2: {"1": (80.0, 95.0), "2": (100.0, 100.0), "3": (95.0, 100.0), "4": (100.0, 110.0)},
+    3: {"1": (90.0, 90.0), "2": (80.0, 85.0), "3": (70.0, 70.0), "4": (60.0, 60.0)},
+}
+weekly_matchups = {
+    1: [("1", "2"), ("3", "4")],
+    2: [("1", "3"), ("2", "4")],
+    # teams 3 and 4 do not have a matchup in week 3
+    3: [("1", "2")],
+}
+
+
+def get_test_team(team_id: str) -> BaseTeam:
+    team = BaseTeam()
+    team.team_id = team_id
+    team.name = f"Team {team_id}"
+    team.manager_str = f"Manager {team_id}"
+    return team
+
+
+def get_test_league(tmp_path: Path) -> BaseLeague:
+    league = BaseLeague(None, "test", "1", 2023, 3, root_dir, tmp_path)
+    for week, matchup_team_ids in weekly_matchups.items():
+        league.teams_by_week[str(week)] = {team_id: get_test_team(team_id) for team_id in team_ids}
+        league.matchups_by_week[str(week)] = []
+        for matchup_team_id_pair in matchup_team_ids:
+            matchup = BaseMatchup()
+            matchup.week = week
+            matchup.teams = [league.teams_by_week[str(week)][team_id] for team_id in matchup_team_id_pair]
+            league.matchups_by_week[str(week)].append(matchup)
+    return league
+
+
+def get_test_weekly_summaries() -> Dict[int, Dict[str, List[List[Any]]]]:
+    # weekly summary team data is [team id, name, manager, points, coaching efficiency, luck, optimal points, z-score]
+    return {
+        week: {
+            "teams": [
+                [team_id, f"Team {team_id}", f"Manager {team_id}", points, 100.0, 0.0, optimal_points, None]
+                for team_id, (points, optimal_points) in week_points.items()
+            ]
+        }
+        for week, week_points in weekly_points.items()
+    }
+
+
+@pytest.mark.unit
+def test_optimal_manager_replays_matchups_with_optimal_points(tmp_path):
+    backtest = OptimalManagerBacktest(team_ids, get_test_weekly_summaries(), get_test_league(tmp_path))
+
+    assert backtest.opponent_indices.tolist() == [[1, 0, 3, 2], [2, 3, 0, 1], [1, 0, -1, -1]]
+    # optimal points are compared with the actual points of the opponent
+    assert list(
+        zip(backtest.optimal_wins.tolist(), backtest.optimal_losses.tolist(), backtest.optimal_ties.tolist())
+    ) == [(2, 0, 1), (1, 1, 1), (2, 0, 0), (2, 0, 0)]
+    assert backtest.points_left_on_bench.tolist() == [25.0, 5.0, 35.0, 15.0]
+
+
+@pytest.mark.unit
+def test_optimal_manager_data_is_ranked_by_optimal_record_and_points_left_on_bench(tmp_path):
+    backtest = OptimalManagerBacktest(team_ids, get_test_weekly_summaries(), get_test_league(tmp_path))
+    teams_results = {team_id: get_test_team(team_id) for team_id in team_ids}
+    # the actual records come from the league results, in which team 2 won the week 2 tie on decimal points
+    for team_id, (wins, losses, ties) in {"1": (1, 2, 0), "2": (2, 1, 0), "3": (1, 1, 0), "4": (1, 0, 1)}.items():
+        teams_results[team_id].record = BaseRecord(3, wins=wins, losses=losses, ties=ties, team_id=team_id)
+
+    optimal_manager_data = backtest.get_optimal_manager_data(teams_results)
+
+    # teams 3 and 4 have the same optimal record, so team 4 with fewer points left on the bench ranks higher
+    assert [row.team_id for row in optimal_manager_data] == ["1", "4", "3", "2"]
+    assert [[str(value) for value in row] for row in optimal_manager_data] == [
+        ["1", "Team 1", "Manager 1", "1-2", "2-0-1", "+1", "25.00"],
+        ["2", "Team 4", "Manager 4", "1-0-1", "2-0", "+1", "15.00"],
+        ["3", "Team 3", "Manager 3", "1-1", "2-0", "+1", "35.00"],
+        ["4", "Team 2", "Manager 2", "2-1", "1-1-1", "-1", "5.00"],
+    ]
@@ -0,0 +1,82 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.points_by_position import PointsByPosition  # noqa: E402
+from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseTeam  # noqa: E402
+
+
+def get_test_league(tmp_path: Path) -> BaseLeague:
+    league = BaseLeague(None, "test", "1", 2023, 1, root_dir, tmp_path)
+    league.roster_position_counts.update({"QB": 1, "RB": 2, "WR": 2, "FLEX": 1, "K": 0, "BN": 3, "IR": 1})
+    league.bench_positions = ["BN", "IR"]
+    league.flex_positions_rb_te_wr = ["RB", "TE", "WR"]
+    return league
+
+
+def get_test_team(team_id: str, players: List[Tuple[str, str, float]]) -> BaseTeam:
+    team = BaseTeam()
+    team.team_id = team_id
+    team.name = f"Team {team_id}"
+    for primary_position, selected_position, points in players:
+        player = BasePlayer()
+        player.primary_position = primary_position
+        player.selected_position = selected_position
+        player.points = points
+        team.roster.append(player)
+    return team
+
+
+@pytest.mark.unit
+def test_weekly_points_by_position_counts_flex_starters_toward_their_positions(tmp_path):
+    points_by_position = PointsByPosition(get_test_league(tmp_path), 1)
+
+    # flex points count toward the flex positions (including TE without any roster slots), and positions without
+    # roster slots (such as K) are not included
+    assert points_by_position.positions == ["QB", "RB", "TE", "WR"]
+
+    teams_results = {
+        "1": get_test_team(
+            "1",
+            [
+                ("QB", "QB", 20.0),
+                ("RB", "RB", 10.0),
+                ("RB", "RB", 5.5),
+                ("WR", "WR", 12.0),
+                ("WR", "WR", 8.0),
+                ("TE", "FLEX", 7.0),
+                ("RB", "BN", 30.0),
+                ("WR", "IR", 15.0),
+            ],
+        ),
+        "2": get_test_team("2", [("QB", "QB", 15.0), ("WR", "FLEX", 9.0), ("RB", "BN", 6.0)]),
+    }
+
+    assert points_by_position.get_weekly_points_by_position(teams_results) == [
+        ["1", [["QB", 20.0], ["RB", 15.5], ["TE", 7.0], ["WR", 20.0]]],
+        ["2", [["QB", 15.0], ["RB", 0.0], ["TE", 0.0], ["WR", 9.0]]],
+    ]
+
+
+@pytest.mark.unit
+def test_points_by_position_season_averages_count_missing_positions_as_zero():
+    season_average_points_by_position = PointsByPosition.calculate_points_by_position_season_averages(
+        {
+            "1": [[["QB", 20.0], ["RB", 10.0]], [["QB", 10.0]], [["QB", 15.0], ["RB", 5.0]]],
+            # teams with fewer weeks are averaged over their own weeks
+            "2": [[["QB", 12.0], ["WR", 8.0]]],
+        }
+    )
+
+    assert season_average_points_by_position == {
+        "1": [["QB", pytest.approx(15.0)], ["RB", pytest.approx(5.0)]],
+        "2": [["QB", pytest.approx(12.0)], ["WR", pytest.approx(8.0)]],
+    }
@@ -0,0 +1,77 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.calculate.ranking import rank_metric  # noqa: E402
+
+
+@pytest.mark.unit
+def test_rank_metric_groups_ties_and_counts_tied_pairs():
+    ranking = rank_metric([90.0, 110.0, 90.0, 100.0, 90.0, 110.0])
+
+    assert ranking.order == [1, 5, 3, 0, 2, 4]
+    assert ranking.tie_groups == [[1, 5], [3], [0, 2, 4]]
+    assert ranking.dense_ranks == [1, 1, 2, 3, 3, 3]
+    # one tied pair in first place and three tied pairs in third place
+    assert ranking.num_ties == 4
+    assert ranking.num_first_place == 2
+    assert ranking.rank(["a", "b", "c", "d", "e", "f"]) == ["b", "f", "d", "a", "c", "e"]
+
+
+@pytest.mark.unit
+def test_rank_metric_detects_ties_with_tie_values_and_orders_them_with_tiebreakers():
+    values = [100.004, 100.001, 95.0]
+    ranking = rank_metric(values, tie_values=[round(value, 2) for value in values], tiebreakers=[[1, 3, 2]])
+
+    # the displayed (rounded) values are tied, and the tiebreaker orders the tied entries
+    assert ranking.tie_groups == [[1, 0], [2]]
+    assert ranking.num_ties == 1
+    assert ranking.num_first_place == 2
+
+
+@pytest.mark.unit
+def test_rank_metric_ranks_from_lowest_value_when_not_reversed():
+    ranking = rank_metric([3, 1, 2], reverse=False)
+
+    assert ranking.order == [1, 2, 0]
+    assert ranking.num_ties == 0
+    assert ranking.num_first_place == 1
+
+
+@pytest.mark.unit
+def test_rank_metric_does_not_count_untied_values_as_ties():
+    coaching_efficiencies = ["DQ", 95.5, "DQ", 99.0]
+    ranking = rank_metric(
+        [0 if value == "DQ" else value for value in coaching_efficiencies],
+        tie_values=coaching_efficiencies,
+        untied_values={"DQ"},
+    )
+
+    assert ranking.tie_groups == [[3], [1], [0, 2]]
+    assert ranking.group_has_ties == [False, False, False]
+    assert ranking.num_ties == 0
+
+
+@pytest.mark.unit
+def test_rank_metric_keeps_input_order_without_values():
+    ranking = rank_metric(tie_values=[5, 5, 3])
+
+    assert ranking.order == [0, 1, 2]
+    assert ranking.tie_groups == [[0, 1], [2]]
+    assert ranking.num_ties == 1
+
+
+@pytest.mark.unit
+def test_rank_metric_of_empty_metric():
+    ranking = rank_metric([])
+
+    assert ranking.order == []
+    assert ranking.num_ties == 0
+    assert ranking.num_first_place == 0
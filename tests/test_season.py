@@ -0,0 +1,194 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.models.base.model import BaseLeague, BasePlayer, BaseRecord, BaseTeam  # noqa: E402
+from ffmwr.models.base.season import SeasonPlayerStore, SeasonRecordTotals  # noqa: E402
+
+# team id, selected position, points, and projected points of every rostered player by week and player id
+weekly_players: Dict[int, Dict[str, Tuple[str, str, float, Optional[float]]]] = {
+    1: {"10": ("1", "WR", 10.0, 12.0), "20": ("2", "RB", 5.0, 6.0)},
+    # player 20 is not on a fantasy roster in week 2
+    2: {"10": ("1", "BN", 20.0, None)},
+    3: {"10": ("1", "WR", 30.0, 25.0), "20": ("2", "RB", 15.0, 10.0), "30": ("2", "BN", 8.0, 9.0)},
+}
+
+
+def get_test_league(tmp_path: Path) -> BaseLeague:
+    league = BaseLeague(None, "test", "1", 2023, 3, root_dir, tmp_path)
+    for week, players in weekly_players.items():
+        league.teams_by_week[str(week)] = {}
+        league.players_by_week[str(week)] = {}
+        for team_id in ["1", "2"]:
+            team = BaseTeam()
+            team.team_id = team_id
+            league.teams_by_week[str(week)][team_id] = team
+
+        for player_id, (team_id, selected_position, points, projected_points) in players.items():
+            player = BasePlayer()
+            player.player_id = player_id
+            player.selected_position = selected_position
+            player.points = points
+            player.projected_points = projected_points
+            league.teams_by_week[str(week)][team_id].roster.append(player)
+            league.players_by_week[str(week)][player_id] = player
+    return league
+
+
+@pytest.mark.unit
+def test_player_store_looks_up_weekly_player_data(tmp_path):
+    league = get_test_league(tmp_path)
+    player_store = league.build_season_player_store()
+
+    assert league.season_player_store is player_store
+    assert player_store.player_ids == ["10", "20", "30"]
+    assert player_store.weeks == [1, 2, 3]
+
+    assert player_store.get_player_weekly_points("10").tolist() == [10.0, 20.0, 30.0]
+    assert player_store.get_player_weekly_points("10", start_week=2, end_week=2).tolist() == [20.0]
+    # weeks in which the player was not on a fantasy roster are skipped
+    assert player_store.get_player_weekly_points("20").tolist() == [5.0, 15.0]
+    assert player_store.get_player_weekly_projected_points("10").tolist() == [12.0, 25.0]
+    assert player_store.get_player_weekly_points("99").tolist() == []
+    assert player_store.get_player_weekly_projected_points("99").tolist() == []
+
+    player_20_ndx = player_store.player_index["20"]
+    assert player_store.teams[player_20_ndx].tolist() == [
+        player_store.team_index["2"],
+        -1,
+        player_store.team_index["2"],
+    ]
+    assert player_store.rostered[player_20_ndx].tolist() == [True, False, True]
+    assert [player_store.positions[code] for code in player_store.selected_positions[:, 2]] == ["WR", "RB", "BN"]
+    np.testing.assert_array_equal(player_store.get_week_points(2), [20.0, np.nan, np.nan])
+
+
+@pytest.mark.unit
+def test_player_store_season_points_index_for_coaching_efficiency_tiebreaks(tmp_path):
+    player_store = SeasonPlayerStore.from_league(get_test_league(tmp_path))
+
+    # the points of the last rostered week and the average points of the rostered weeks before it, with players that
+    # have only played one game using the points of that game as their average
+    week_2_player_season_points_index = player_store.get_player_season_points_index(2)
+    assert week_2_player_season_points_index == {"10": (20.0, 10.0), "20": (5.0, 5.0)}
+    assert player_store.get_player_season_points_index(3) == {
+        "10": (30.0, 15.0),
+        "20": (15.0, 5.0),
+        "30": (8.0, 8.0),
+    }
+
+    # players that have not played any games through the week default to (0, 0) when breaking ties
+    assert week_2_player_season_points_index.get("30", (0, 0)) == (0, 0)
+    # the index is built once per week
+    assert player_store.get_player_season_points_index(2) is week_2_player_season_points_index
+
+
+def get_test_matchup(
+    team_id: str, team_result: str, team_points: float, opponent_id: str, opponent_points: float, division: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    opponent_result = {"W": "L", "L": "W"}.get(team_result, team_result)
+    return {
+        team_id: {
+            "result": team_result,
+            "points_for": team_points,
+            "points_against": opponent_points,
+            "division": division,
+        },
+        opponent_id: {
+            "result": opponent_result,
+            "points_for": opponent_points,
+            "points_against": team_points,
+            "division": division,
+        },
+    }
+
+
+def get_test_weeks() -> List[List[Dict[str, Dict[str, Any]]]]:
+    return [
+        [get_test_matchup("1", "W", 100.0, "2", 90.0, division=True), get_test_matchup("3", "W", 80.0, "4", 70.0)],
+        [get_test_matchup("1", "W", 110.0, "3", 105.0), get_test_matchup("2", "T", 95.0, "4", 95.0, division=True)],
+        [get_test_matchup("1", "L", 85.0, "4", 120.0), get_test_matchup("2", "W", 100.0, "3", 99.5)],
+    ]
+
+
+@pytest.mark.unit
+def test_record_totals_accumulate_weekly_results():
+    record_totals = SeasonRecordTotals(["1", "2", "3", "4"])
+    for week_matchups in get_test_weeks():
+        assert record_totals.add_week_results(week_matchups).tolist() == [True, True, True, True]
+
+    assert record_totals.wins.tolist() == [2, 1, 1, 1]
+    assert record_totals.losses.tolist() == [1, 1, 2, 1]
+    assert record_totals.ties.tolist() == [0, 1, 0, 1]
+    assert record_totals.points_for.tolist() == [295.0, 285.0, 284.5, 285.0]
+    assert record_totals.points_against.tolist() == [315.0, 294.5, 280.0, 260.0]
+    assert [SeasonRecordTotals.streak_types[code] for code in record_totals.streak_type_codes.tolist()] == [
+        "L",
+        "W",
+        "L",
+        "W",
+    ]
+    assert record_totals.streak_lengths.tolist() == [1, 1, 2, 1]
+
+    # only division matchups count toward division records
+    assert record_totals.division_wins.tolist() == [1, 0, 0, 0]
+    assert record_totals.division_losses.tolist() == [0, 1, 0, 0]
+    assert record_totals.division_ties.tolist() == [0, 1, 0, 1]
+    assert record_totals.division_points_for.tolist() == [100.0, 185.0, 0.0, 95.0]
+    assert [SeasonRecordTotals.streak_types[code] for code in record_totals.division_streak_type_codes.tolist()] == [
+        "W",
+        "T",
+        None,
+        "T",
+    ]
+    assert record_totals.division_streak_lengths.tolist() == [1, 1, 0, 1]
+
+
+@pytest.mark.unit
+def test_record_totals_only_update_teams_with_results():
+    record_totals = SeasonRecordTotals(["1", "2", "3"])
+    has_result = record_totals.add_week_results(
+        [get_test_matchup("1", "W", 100.0, "2", 90.0), get_test_matchup("5", "W", 80.0, "6", 70.0)]
+    )
+
+    # teams without a matchup (and teams outside of the league) are skipped
+    assert has_result.tolist() == [True, True, False]
+    assert record_totals.wins.tolist() == [1, 0, 0]
+    assert record_totals.streak_type_codes.tolist() == [1, 2, 0]
+
+
+@pytest.mark.unit
+def test_record_totals_copy_is_independent():
+    record_totals = SeasonRecordTotals(["1", "2", "3", "4"])
+    record_totals.add_week_results(get_test_weeks()[0])
+
+    record_totals_copy = record_totals.copy()
+    record_totals_copy.add_week_results(get_test_weeks()[1])
+
+    assert record_totals.wins.tolist() == [1, 0, 1, 0]
+    assert record_totals_copy.wins.tolist() == [2, 0, 1, 0]
+
+
+@pytest.mark.unit
+def test_record_totals_from_records_continue_streaks():
+    records = {
+        "1": BaseRecord(1, wins=1, points_for=100.0, points_against=90.0, streak_type="W", streak_len=1),
+        "2": BaseRecord(1, losses=1, points_for=90.0, points_against=100.0, streak_type="L", streak_len=1),
+    }
+
+    record_totals = SeasonRecordTotals.from_records(records)
+    record_totals.add_week_results([get_test_matchup("1", "W", 120.0, "2", 100.0)])
+
+    assert record_totals.wins.tolist() == [2, 0]
+    assert record_totals.losses.tolist() == [0, 2]
+    assert record_totals.points_for.tolist() == [220.0, 190.0]
+    assert record_totals.streak_lengths.tolist() == [2, 2]
@@ -0,0 +1,68 @@
+__author__ = "Wren J. R. (uberfastman)"
+__email__ = "uberfastman@uberfastman.dev"
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root_dir = Path(__file__).parent.parent
+sys.path.append(str(root_dir))
+
+from ffmwr.utilities.utils import FFMWRPythonObjectJson  # noqa: E402
+
+
+class SnapshotTestObject(FFMWRPythonObjectJson):
+    def __init__(self):
+        super().__init__()
+
+        self.name: str = "snapshot"
+        self.players: dict = {}
+
+
+@pytest.mark.unit
+def test_snapshot_round_trip_with_int_keys(tmp_path):
+    snapshot_object = SnapshotTestObject()
+    snapshot_object.players = {2: "two", 10: "ten", 1: "one"}
+
+    json_file_path = tmp_path / "snapshot.json"
+    snapshot_object.save_to_json_file(json_file_path)
+
+    loaded_snapshot_object = SnapshotTestObject()
+    loaded_snapshot_object.load_from_json_file(json_file_path)
+
+    assert loaded_snapshot_object.name == "snapshot"
+    assert loaded_snapshot_object.players == {"2": "two", "10": "ten", "1": "one"}
+
+
+@pytest.mark.unit
+def test_snapshot_round_trip_with_mixed_keys(tmp_path):
+    snapshot_object = SnapshotTestObject()
+    snapshot_object.players = {2: "two", "QB": "quarterback", 1.5: "one and a half"}
+
+    json_file_path = tmp_path / "snapshot.json"
+    snapshot_object.save_to_json_file(json_file_path)
+
+    loaded_snapshot_object = SnapshotTestObject()
+    loaded_snapshot_object.load_from_json_file(json_file_path)
+
+    assert loaded_snapshot_object.players == {"2": "two", "QB": "quarterback", "1.5": "one and a half"}
+
+
+@pytest.mark.unit
+def test_snapshot_checksum_mismatch_fails_to_load(tmp_path):
+    snapshot_object = SnapshotTestObject()
+    snapshot_object.players = {1: "one"}
+
+    json_file_path = tmp_path / "snapshot.json"
+    snapshot_object.save_to_json_file(json_file_path)
+
+    with open(json_file_path, "r", encoding="utf-8") as json_file_in:
+        snapshot = json.load(json_file_in)
+    snapshot["data"] = json.loads(json.dumps(snapshot["data"]).replace("one", "two"))
+    with open(json_file_path, "w", encoding="utf-8") as json_file_out:
+        json.dump(snapshot, json_file_out)
+
+    with pytest.raises(ValueError, match="checksum"):
+        SnapshotTestObject().load_from_json_file(json_file_path)